@@ -1,53 +1,139 @@
-from fastapi import APIRouter, Depends, File, Form, UploadFile, status
+from datetime import datetime
+
+from fastapi import (
+    APIRouter,
+    Depends,
+    File,
+    Form,
+    Header,
+    Query,
+    Response,
+    UploadFile,
+    status,
+)
+from fastapi.responses import StreamingResponse
 from pydantic import EmailStr
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.dependencies import get_current_user
 from app.core.database import get_db
-from app.schemas.lead import LeadCreateResponse, LeadDetailResponse, LeadUpdateStateRequest
+from app.schemas.lead import (
+    LeadClaimRequest,
+    LeadCreateResponse,
+    LeadDetailResponse,
+    LeadResourceResponse,
+    LeadUpdateStateRequest,
+)
+from app.services.claim_service import claim_leads
+from app.services.dedupe_service import get_duplicate_ids
 from app.services.email_service import EmailService, get_email_service
-from app.services.lead_service import create_lead, get_lead, list_leads, update_lead_state
+from app.services.idempotency_service import request_fingerprint, run_once
+from app.services.lead_service import (
+    create_lead,
+    get_lead,
+    list_leads,
+    update_lead_state,
+)
+from app.services.resume_storage import iter_resume
+from app.services.resume_storage_service import get_resume_download
+from app.services.resume_text_service import get_resume_text_status
 
 router = APIRouter(prefix="/leads", tags=["leads"])
 
 
 @router.post("", status_code=status.HTTP_201_CREATED, response_model=LeadCreateResponse)
 async def submit_lead(
+    response: Response,
     first_name: str = Form(...),
     last_name: str = Form(...),
     email: EmailStr = Form(...),
     resume: UploadFile = File(...),
+    idempotency_key: str | None = Header(
+        None,
+        alias="Idempotency-Key",
+        max_length=255,
+        description="Retries with the same key replay the first response instead of creating another lead",
+    ),
     db: AsyncSession = Depends(get_db),
     email_service: EmailService = Depends(get_email_service),
 ) -> LeadCreateResponse:
-    lead = await create_lead(
-        db=db,
-        email_service=email_service,
-        first_name=first_name,
-        last_name=last_name,
-        email=email,
-        resume=resume,
+    async def submit() -> LeadCreateResponse:
+        lead = await create_lead(
+            db=db,
+            email_service=email_service,
+            first_name=first_name,
+            last_name=last_name,
+            email=email,
+            resume=resume,
+        )
+        return LeadCreateResponse.model_validate(lead)
+
+    if idempotency_key is None:
+        return await submit()
+
+    fingerprint = await request_fingerprint(
+        {"first_name": first_name, "last_name": last_name, "email": email}, resume
     )
-    return LeadCreateResponse.model_validate(lead)
+    body, replayed = await run_once(db, idempotency_key, submit, fingerprint)
+    if replayed:
+        response.headers["Idempotent-Replayed"] = "true"
+    return LeadCreateResponse.model_validate(body)
 
 
 @router.get("", response_model=list[LeadDetailResponse])
 async def get_leads(
+    updated_since: datetime | None = Query(
+        None, description="Only return leads created or modified at or after this time"
+    ),
+    include_archived: bool = Query(False, description="Also return archived leads"),
     _user: str = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ) -> list[LeadDetailResponse]:
-    leads = await list_leads(db)
+    leads = await list_leads(db, updated_since=updated_since, include_archived=include_archived)
+    return [LeadDetailResponse.model_validate(lead) for lead in leads]
+
+
+@router.post("/claim", response_model=list[LeadDetailResponse])
+async def claim_next_leads(
+    body: LeadClaimRequest | None = None,
+    user: str = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+) -> list[LeadDetailResponse]:
+    """Lease the oldest unclaimed PENDING leads; an empty list when none are left."""
+    body = body or LeadClaimRequest()
+    leads = await claim_leads(db, body.claimant or user, body.count)
     return [LeadDetailResponse.model_validate(lead) for lead in leads]
 
 
-@router.get("/{lead_id}", response_model=LeadDetailResponse)
+@router.get("/{lead_id}", response_model=LeadResourceResponse)
 async def get_lead_by_id(
     lead_id: str,
     _user: str = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
-) -> LeadDetailResponse:
+) -> LeadResourceResponse:
     lead = await get_lead(db, lead_id)
-    return LeadDetailResponse.model_validate(lead)
+    response = LeadResourceResponse.model_validate(lead)
+    response.duplicate_ids = await get_duplicate_ids(db, lead)
+    response.resume_text_status = await get_resume_text_status(db, lead.id)
+    return response
+
+
+@router.get("/{lead_id}/resume", response_class=StreamingResponse)
+async def download_resume(
+    lead_id: str,
+    _user: str = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+) -> StreamingResponse:
+    download = await get_resume_download(db, lead_id)
+    # A sync iterator: Starlette reads (and decompresses) it in a thread.
+    return StreamingResponse(
+        iter_resume(download.path),
+        media_type=download.media_type,
+        headers={
+            "Content-Disposition": f'attachment; filename="{download.filename}"',
+            "Content-Length": str(download.size),
+        },
+    )
 
 
 @router.patch("/{lead_id}", response_model=LeadDetailResponse)
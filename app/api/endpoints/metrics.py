@@ -0,0 +1,12 @@
+from fastapi import APIRouter, Depends
+
+from app.api.dependencies import get_current_user
+from app.core.admission import admission
+
+router = APIRouter(prefix="/metrics", tags=["metrics"])
+
+
+@router.get("")
+async def get_metrics(_user: str = Depends(get_current_user)) -> dict:
+    """Counters for this worker process."""
+    return {"admission": admission.stats()}
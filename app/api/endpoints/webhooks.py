@@ -0,0 +1,30 @@
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.dependencies import get_current_user
+from app.core.database import get_db
+from app.schemas.webhook import WebhookDeliveryResponse
+from app.services.webhook_service import list_dead_letters, retry_dead_letter
+
+router = APIRouter(prefix="/webhooks", tags=["webhooks"])
+
+
+@router.get("/dead-letters", response_model=list[WebhookDeliveryResponse])
+async def get_dead_letters(
+    subscriber: str | None = Query(None, description="Only show deliveries for this subscriber"),
+    limit: int = Query(100, ge=1, le=1000),
+    _user: str = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+) -> list[WebhookDeliveryResponse]:
+    deliveries = await list_dead_letters(db, subscriber=subscriber, limit=limit)
+    return [WebhookDeliveryResponse.model_validate(d) for d in deliveries]
+
+
+@router.post("/dead-letters/{delivery_id}/retry", response_model=WebhookDeliveryResponse)
+async def retry_dead_letter_by_id(
+    delivery_id: str,
+    _user: str = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+) -> WebhookDeliveryResponse:
+    delivery = await retry_dead_letter(db, delivery_id)
+    return WebhookDeliveryResponse.model_validate(delivery)
@@ -2,7 +2,11 @@ from fastapi import APIRouter
 
 from app.api.endpoints.auth import router as auth_router
 from app.api.endpoints.leads import router as leads_router
+from app.api.endpoints.metrics import router as metrics_router
+from app.api.endpoints.webhooks import router as webhooks_router
 
 api_router = APIRouter(prefix="/api")
 api_router.include_router(auth_router)
 api_router.include_router(leads_router)
+api_router.include_router(webhooks_router)
+api_router.include_router(metrics_router)
@@ -0,0 +1,34 @@
+"""Move old REACHED_OUT leads from ``leads`` into ``leads_archive``.
+
+Usage: python -m app.archive [--older-than-days N] [--batch-size B]
+"""
+
+import argparse
+import asyncio
+import time
+from datetime import timedelta
+
+from app.core.config import settings
+from app.core.database import async_session, ensure_schema
+from app.services.archive_service import archive_leads
+
+
+async def run(older_than: timedelta, batch_size: int) -> int:
+    await ensure_schema()
+    async with async_session() as session:
+        return await archive_leads(session, older_than, batch_size)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(prog="python -m app.archive")
+    parser.add_argument("--older-than-days", type=int, default=settings.ARCHIVE_AFTER_DAYS)
+    parser.add_argument("--batch-size", type=int, default=settings.ARCHIVE_BATCH_SIZE)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    archived = asyncio.run(run(timedelta(days=args.older_than_days), args.batch_size))
+    print(f"Archived {archived} lead(s) in {time.perf_counter() - start:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
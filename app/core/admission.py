@@ -0,0 +1,206 @@
+"""Admission control: shed load before a request body is read.
+
+Public lead submissions are unauthenticated and carry up to 10 MB each, so
+they are checked in an ASGI middleware, ahead of multipart parsing:
+
+- ``Content-Length`` must be present and within the upload limit (411/413);
+- each client IP has a token bucket (429);
+- public submissions may only use the shared slots, never the ones
+  reserved for staff routes, and have their own in-flight cap (503);
+- ``UPLOAD_DIR`` must keep ``ADMISSION_MIN_FREE_DISK_MB`` free after the
+  upload (503).
+
+Rejections are answered immediately with ``Retry-After`` instead of queueing,
+and counted per reason for ``GET /api/metrics``.
+"""
+
+import json
+import math
+import os
+import shutil
+import time
+from collections import Counter, OrderedDict
+from dataclasses import dataclass
+
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.core.config import settings
+from app.services.file_service import MAX_FILE_SIZE
+
+# Room for the form fields and multipart boundaries around the resume.
+MULTIPART_OVERHEAD = 64 * 1024
+# Per-IP buckets kept before the least recently seen are dropped.
+MAX_TRACKED_CLIENTS = 100_000
+
+
+def _free_disk(path: str) -> int:
+    """Free bytes on the filesystem that holds (or will hold) ``path``."""
+    path = os.path.abspath(path)
+    while True:
+        try:
+            return shutil.disk_usage(path).free
+        except FileNotFoundError:
+            # Not created yet (it is made at startup); measure where it will go.
+            parent = os.path.dirname(path)
+            if parent == path:
+                raise
+            path = parent
+
+
+@dataclass
+class Rejection:
+    status: int
+    reason: str
+    detail: str
+    retry_after: int | None = None
+
+
+class _TokenBucket:
+    __slots__ = ("tokens", "updated")
+
+    def __init__(self, tokens: float, now: float):
+        self.tokens = tokens
+        self.updated = now
+
+
+class AdmissionController:
+    """In-process admission state for one worker."""
+
+    def __init__(
+        self,
+        max_in_flight: int | None = None,
+        staff_reserved: int | None = None,
+        max_uploads: int | None = None,
+        rate_per_minute: float | None = None,
+        burst: int | None = None,
+        min_free_disk_mb: int | None = None,
+    ):
+        self.max_in_flight = settings.ADMISSION_MAX_IN_FLIGHT if max_in_flight is None else max_in_flight
+        self.staff_reserved = settings.ADMISSION_STAFF_RESERVED if staff_reserved is None else staff_reserved
+        self.max_uploads = settings.ADMISSION_MAX_UPLOADS if max_uploads is None else max_uploads
+        self.rate_per_minute = settings.ADMISSION_RATE_PER_MINUTE if rate_per_minute is None else rate_per_minute
+        self.burst = settings.ADMISSION_BURST if burst is None else burst
+        self.min_free_disk_mb = settings.ADMISSION_MIN_FREE_DISK_MB if min_free_disk_mb is None else min_free_disk_mb
+        self.in_flight = 0
+        self.uploads_in_flight = 0
+        self.admitted: Counter[str] = Counter()
+        self.shed: Counter[str] = Counter()
+        self._buckets: OrderedDict[str, _TokenBucket] = OrderedDict()
+
+    def _take_token(self, client: str) -> int | None:
+        """Spend one of ``client``'s tokens; return seconds to wait if none is left."""
+        if self.rate_per_minute <= 0:
+            return None
+        now = time.monotonic()
+        bucket = self._buckets.pop(client, None) or _TokenBucket(self.burst, now)
+        self._buckets[client] = bucket
+        if len(self._buckets) > MAX_TRACKED_CLIENTS:
+            self._buckets.popitem(last=False)
+        per_second = self.rate_per_minute / 60
+        bucket.tokens = min(self.burst, bucket.tokens + (now - bucket.updated) * per_second)
+        bucket.updated = now
+        if bucket.tokens < 1:
+            return max(1, math.ceil((1 - bucket.tokens) / per_second))
+        bucket.tokens -= 1
+        return None
+
+    def _check_upload(self, client: str, content_length: int | None) -> Rejection | None:
+        if content_length is None:
+            return Rejection(411, "length_required", "Content-Length is required")
+        if content_length > MAX_FILE_SIZE + MULTIPART_OVERHEAD:
+            return Rejection(413, "too_large", f"Request exceeds {MAX_FILE_SIZE // (1024 * 1024)} MB")
+        # Server-side checks first, so a client's token is only spent on a
+        # request that is otherwise admitted.
+        if (
+            self.uploads_in_flight >= self.max_uploads
+            or self.in_flight >= self.max_in_flight - self.staff_reserved
+        ):
+            return Rejection(503, "overloaded", "Server busy; try again shortly", 1)
+        if _free_disk(settings.UPLOAD_DIR) - content_length < self.min_free_disk_mb * 1024 * 1024:
+            return Rejection(503, "disk_full", "Uploads are temporarily unavailable", 60)
+        wait = self._take_token(client)
+        if wait is not None:
+            return Rejection(429, "rate_limited", "Too many submissions; slow down", wait)
+        return None
+
+    def admit(self, upload: bool, client: str, content_length: int | None) -> Rejection | None:
+        """Reserve a slot for the request, or return why it is shed."""
+        if upload:
+            rejection = self._check_upload(client, content_length)
+        elif self.in_flight >= self.max_in_flight:
+            rejection = Rejection(503, "overloaded", "Server busy; try again shortly", 1)
+        else:
+            rejection = None
+        kind = "upload" if upload else "other"
+        if rejection is not None:
+            self.shed[rejection.reason] += 1
+            return rejection
+        self.admitted[kind] += 1
+        self.in_flight += 1
+        self.uploads_in_flight += upload
+        return None
+
+    def release(self, upload: bool) -> None:
+        self.in_flight -= 1
+        self.uploads_in_flight -= upload
+
+    def stats(self) -> dict:
+        return {
+            "in_flight": self.in_flight,
+            "uploads_in_flight": self.uploads_in_flight,
+            "max_in_flight": self.max_in_flight,
+            "staff_reserved": self.staff_reserved,
+            "max_uploads": self.max_uploads,
+            "admitted": dict(self.admitted),
+            "shed": dict(self.shed),
+            "shed_total": sum(self.shed.values()),
+        }
+
+
+admission = AdmissionController()
+
+
+def _is_public_submission(scope: Scope) -> bool:
+    return scope["method"] == "POST" and scope["path"].rstrip("/") == "/api/leads"
+
+
+class AdmissionMiddleware:
+    def __init__(self, app: ASGIApp, controller: AdmissionController = admission):
+        self.app = app
+        self.controller = controller
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        upload = _is_public_submission(scope)
+        content_length = None
+        for name, value in scope["headers"]:
+            if name == b"content-length":
+                content_length = int(value) if value.isdigit() else None
+                break
+        client = scope["client"][0] if scope.get("client") else "unknown"
+
+        rejection = self.controller.admit(upload, client, content_length)
+        if rejection is not None:
+            await self._reject(rejection, send)
+            return
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.controller.release(upload)
+
+    @staticmethod
+    async def _reject(rejection: Rejection, send: Send) -> None:
+        body = json.dumps({"detail": rejection.detail}).encode()
+        headers = [
+            (b"content-type", b"application/json"),
+            (b"content-length", str(len(body)).encode()),
+            # The body is never read, so the connection cannot be reused.
+            (b"connection", b"close"),
+        ]
+        if rejection.retry_after is not None:
+            headers.append((b"retry-after", str(rejection.retry_after).encode()))
+        await send({"type": "http.response.start", "status": rejection.status, "headers": headers})
+        await send({"type": "http.response.body", "body": body})
@@ -0,0 +1,224 @@
+"""Response compression negotiated from ``Accept-Encoding``.
+
+gzip is always available; ``zstd`` and ``br`` are offered when the optional
+``zstandard`` / ``brotli`` packages are installed. Only textual content types
+are compressed, so resume downloads (PDF, Word) and anything already carrying
+a ``Content-Encoding`` pass through untouched, as do bodies smaller than
+``COMPRESSION_MIN_SIZE``. Streamed bodies are compressed chunk by chunk, and
+chunks of at least ``COMPRESSION_THREAD_MIN_SIZE`` bytes are compressed in a
+worker thread so a large listing does not stall the event loop.
+"""
+
+import asyncio
+import zlib
+from abc import ABC, abstractmethod
+from collections.abc import Callable
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+
+COMPRESSIBLE_TYPES = (
+    "text/",
+    "application/json",
+    "application/javascript",
+    "application/xml",
+    "application/problem+json",
+    "image/svg+xml",
+)
+
+
+class _Compressor(ABC):
+    """Streaming compressor with ``compress(chunk)`` and ``finish()``."""
+
+    @abstractmethod
+    def compress(self, data: bytes) -> bytes: ...
+
+    @abstractmethod
+    def finish(self) -> bytes: ...
+
+
+class _Gzip(_Compressor):
+    def __init__(self):
+        self._obj = zlib.compressobj(settings.COMPRESSION_GZIP_LEVEL, zlib.DEFLATED, 31)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._obj.compress(data)
+
+    def finish(self) -> bytes:
+        return self._obj.flush()
+
+
+class _Brotli(_Compressor):
+    def __init__(self):
+        import brotli
+
+        self._obj = brotli.Compressor(quality=settings.COMPRESSION_BROTLI_QUALITY)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._obj.process(data)
+
+    def finish(self) -> bytes:
+        return self._obj.finish()
+
+
+class _Zstd(_Compressor):
+    def __init__(self):
+        import zstandard
+
+        self._obj = zstandard.ZstdCompressor(level=settings.COMPRESSION_ZSTD_LEVEL).compressobj()
+
+    def compress(self, data: bytes) -> bytes:
+        return self._obj.compress(data)
+
+    def finish(self) -> bytes:
+        return self._obj.flush()
+
+
+def _importable(module: str) -> bool:
+    try:
+        __import__(module)
+    except ImportError:
+        return False
+    return True
+
+
+def available_encodings() -> dict[str, Callable[[], _Compressor]]:
+    """Compressor factories for the encodings this install can produce."""
+    encodings: dict[str, Callable[[], _Compressor]] = {"gzip": _Gzip}
+    if _importable("zstandard"):
+        encodings["zstd"] = _Zstd
+    if _importable("brotli"):
+        encodings["br"] = _Brotli
+    return encodings
+
+
+def choose_encoding(accept_encoding: str, preference: list[str]) -> str | None:
+    """Pick the client's highest-q encoding from ``preference``; ties go to the earlier one."""
+    weights: dict[str, float] = {}
+    for item in accept_encoding.split(","):
+        name, _, params = item.strip().partition(";")
+        name = name.strip().lower()
+        if not name:
+            continue
+        q = 1.0
+        for param in params.split(";"):
+            key, _, value = param.strip().partition("=")
+            if key == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        weights[name] = q
+
+    best, best_q = None, 0.0
+    for encoding in preference:
+        q = weights.get(encoding, weights.get("*", 0.0))
+        if q > best_q:
+            best, best_q = encoding, q
+    return best
+
+
+def _compressible(headers: Headers) -> bool:
+    if "content-encoding" in headers or "content-range" in headers:
+        return False
+    content_type = headers.get("content-type", "").lower()
+    return content_type.startswith(COMPRESSIBLE_TYPES)
+
+
+class CompressionMiddleware:
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int | None = None,
+        thread_min_size: int | None = None,
+        encodings: list[str] | None = None,
+    ):
+        self.app = app
+        self.minimum_size = settings.COMPRESSION_MIN_SIZE if minimum_size is None else minimum_size
+        self.thread_min_size = (
+            settings.COMPRESSION_THREAD_MIN_SIZE if thread_min_size is None else thread_min_size
+        )
+        self.factories = available_encodings()
+        preference = encodings or settings.COMPRESSION_ENCODINGS
+        self.preference = [e for e in preference if e in self.factories]
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        # HEAD responses carry the GET response's headers but no body to
+        # compress; rewriting them would advertise a bogus encoded length.
+        if scope["type"] != "http" or scope["method"] == "HEAD":
+            await self.app(scope, receive, send)
+            return
+        encoding = choose_encoding(Headers(scope=scope).get("accept-encoding", ""), self.preference)
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+        await _CompressedResponse(self, encoding, send).run(scope, receive)
+
+
+class _CompressedResponse:
+    """Send wrapper for one response; decides on compression at the first body chunk."""
+
+    def __init__(self, middleware: CompressionMiddleware, encoding: str, send: Send):
+        self.middleware = middleware
+        self.encoding = encoding
+        self.send = send
+        self.start: Message | None = None
+        self.compressor: _Compressor | None = None
+        self.passthrough = False
+
+    async def run(self, scope: Scope, receive: Receive) -> None:
+        await self.middleware.app(scope, receive, self.wrapped_send)
+
+    async def _compress(self, data: bytes) -> bytes:
+        if len(data) >= self.middleware.thread_min_size:
+            return await asyncio.to_thread(self.compressor.compress, data)
+        return self.compressor.compress(data)
+
+    async def wrapped_send(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            headers = Headers(raw=message["headers"])
+            if _compressible(headers) and message["status"] not in (204, 304):
+                self.start = message
+                MutableHeaders(scope=message).add_vary_header("Accept-Encoding")
+            else:
+                self.passthrough = True
+                await self.send(message)
+            return
+        if message["type"] != "http.response.body" or self.passthrough:
+            await self.send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+        if self.start is not None:
+            start, self.start = self.start, None
+            headers = MutableHeaders(scope=start)
+            declared = headers.get("content-length")
+            # A streamed body of unknown length is always compressed.
+            size = int(declared) if declared else (None if more_body else len(body))
+            if (size is not None and size < self.middleware.minimum_size) or not (body or more_body):
+                self.passthrough = True
+                await self.send(start)
+                await self.send(message)
+                return
+            self.compressor = self.middleware.factories[self.encoding]()
+            headers["Content-Encoding"] = self.encoding
+            if "content-length" in headers:
+                del headers["content-length"]
+            if not more_body:
+                # Whole body known up front: send it with an exact length.
+                compressed = await self._compress(body) + self.compressor.finish()
+                headers["Content-Length"] = str(len(compressed))
+                await self.send(start)
+                await self.send({"type": "http.response.body", "body": compressed})
+                return
+            await self.send(start)
+
+        chunk = await self._compress(body) if body else b""
+        if not more_body:
+            chunk += self.compressor.finish()
+        elif not chunk:
+            return  # the compressor is still buffering
+        await self.send({"type": "http.response.body", "body": chunk, "more_body": more_body})
@@ -1,10 +1,21 @@
 from pathlib import Path
+from typing import Literal
 
+from pydantic import BaseModel
 from pydantic_settings import BaseSettings
 
 PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
 
 
+class WebhookSubscriber(BaseModel):
+    """An external system that receives signed lead events."""
+
+    name: str
+    url: str
+    secret: str
+    max_concurrency: int = 4
+
+
 class Settings(BaseSettings):
     model_config = {
         "env_file": str(PROJECT_ROOT / ".env"),
@@ -12,7 +23,15 @@ class Settings(BaseSettings):
     }
 
     DATABASE_URL: str = "sqlite+aiosqlite:///./alma.db"
+    # Spread leads over this many SQLite files by a hash of their id (1 = off).
+    # Change it only together with `python -m app.reshard`.
+    DATABASE_SHARDS: int = 1
     UPLOAD_DIR: str = "uploads"
+    # Compress stored resumes: "zstd" (falls back to gzip when the zstandard
+    # package is missing), "gzip", or "none". Files that shrink by less than
+    # RESUME_COMPRESSION_MIN_SAVING are stored raw.
+    RESUME_COMPRESSION: Literal["none", "gzip", "zstd"] = "none"
+    RESUME_COMPRESSION_MIN_SAVING: float = 0.1
 
     JWT_SECRET_KEY: str = "change-me-in-production"
     JWT_ALGORITHM: str = "HS256"
@@ -23,5 +42,76 @@ class Settings(BaseSettings):
 
     ATTORNEY_EMAILS: list[str] = ["attorney@example.com"]
 
+    # `python -m app.serve` (pre-forking production server).
+    SERVER_HOST: str = "127.0.0.1"
+    SERVER_PORT: int = 8000
+    SERVER_WORKERS: int = 0  # 0 = one per available CPU
+    SERVER_BACKLOG: int = 2048
+    SERVER_KEEP_ALIVE_SECONDS: int = 5
+    # Per-worker connection cap answered with 503 by uvicorn; 0 = no cap
+    # (admission control below still sheds load inside the app).
+    SERVER_LIMIT_CONCURRENCY: int = 0
+    SERVER_GRACEFUL_TIMEOUT_SECONDS: int = 30
+    # Run the resume extraction pool, webhook dispatcher and upload sweeper in
+    # this process. app.serve turns it off in all workers but one; set it to
+    # false on all but one process when running several by other means.
+    BACKGROUND_TASKS: bool = True
+
+    # Admission control (per worker). Public submissions may use at most
+    # ADMISSION_MAX_IN_FLIGHT - ADMISSION_STAFF_RESERVED request slots.
+    ADMISSION_MAX_IN_FLIGHT: int = 64
+    ADMISSION_STAFF_RESERVED: int = 16
+    ADMISSION_MAX_UPLOADS: int = 16
+    # Per-IP token bucket for public submissions; 0 disables it.
+    ADMISSION_RATE_PER_MINUTE: float = 30.0
+    ADMISSION_BURST: int = 10
+    ADMISSION_MIN_FREE_DISK_MB: int = 512
+
+    # Response compression. Encodings are tried in this order; zstd and br
+    # need the optional zstandard / brotli packages and are skipped without them.
+    COMPRESSION_ENCODINGS: list[str] = ["zstd", "br", "gzip"]
+    COMPRESSION_MIN_SIZE: int = 1024  # bytes; smaller bodies are sent as-is
+    COMPRESSION_THREAD_MIN_SIZE: int = 256 * 1024  # compress off the event loop from here
+    COMPRESSION_GZIP_LEVEL: int = 6
+    COMPRESSION_BROTLI_QUALITY: int = 5
+    COMPRESSION_ZSTD_LEVEL: int = 3
+
+    # Orphaned-upload sweeper: files no lead references, older than the
+    # grace period, are moved to UPLOAD_DIR/.quarantine (or deleted).
+    UPLOAD_SWEEP_INTERVAL_MINUTES: int = 60  # 0 disables the background sweep
+    UPLOAD_SWEEP_GRACE_MINUTES: int = 60
+    UPLOAD_SWEEP_ACTION: Literal["quarantine", "delete"] = "quarantine"
+    UPLOAD_SWEEP_MAX_FILES: int = 100_000  # per background run
+
+    # Background resume text extraction (process pool + bounded queue).
+    RESUME_EXTRACT_WORKERS: int = 2
+    RESUME_EXTRACT_QUEUE_SIZE: int = 1000
+    RESUME_EXTRACT_TIMEOUT_SECONDS: float = 30.0
+    # How often PENDING extractions queued by other processes are picked up.
+    RESUME_EXTRACT_POLL_SECONDS: float = 5.0
+
+    # Outbound webhooks, e.g. WEBHOOK_SUBSCRIBERS='[{"name": "crm", "url": "...", "secret": "..."}]'.
+    WEBHOOK_SUBSCRIBERS: list[WebhookSubscriber] = []
+    WEBHOOK_BATCH_SIZE: int = 50
+    WEBHOOK_MAX_ATTEMPTS: int = 8
+    WEBHOOK_BACKOFF_BASE_SECONDS: float = 2.0
+    WEBHOOK_BACKOFF_MAX_SECONDS: float = 3600.0
+    WEBHOOK_TIMEOUT_SECONDS: float = 10.0
+    WEBHOOK_POLL_SECONDS: float = 5.0
+    # DELIVERED rows are deleted this long after delivery; 0 keeps them forever.
+    WEBHOOK_RETENTION_DAYS: int = 7
+
+    # How long a stored Idempotency-Key response is replayed for.
+    IDEMPOTENCY_TTL_HOURS: int = 24
+
+    # POST /api/leads/claim: how long a claimed lead stays leased to the
+    # claimer, and the most leads one call may claim.
+    LEAD_CLAIM_TTL_MINUTES: int = 30
+    LEAD_CLAIM_MAX_BATCH: int = 50
+
+    # REACHED_OUT leads untouched for this long are moved to leads_archive.
+    ARCHIVE_AFTER_DAYS: int = 90
+    ARCHIVE_BATCH_SIZE: int = 1000
+
 
 settings = Settings()
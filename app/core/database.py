@@ -1,11 +1,313 @@
-from collections.abc import AsyncGenerator
+import asyncio
+import hashlib
+import heapq
+import os
+import uuid
+import zlib
+from collections.abc import AsyncGenerator, Awaitable, Callable, Iterable
+from typing import Any, TypeVar
 
-from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy import (
+    DDL,
+    Column,
+    MetaData,
+    String,
+    Table,
+    delete,
+    event,
+    insert,
+    inspect,
+    select,
+)
+from sqlalchemy.engine import Dialect, make_url
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
+from sqlalchemy.ext.horizontal_shard import ShardedSession
+from sqlalchemy.schema import CreateColumn, CreateIndex, CreateTable
+from sqlalchemy.sql import operators
+from sqlalchemy.sql.elements import BinaryExpression, BindParameter, BooleanClauseList
+from sqlalchemy.sql.util import find_tables
 
 from app.core.config import settings
 
-engine = create_async_engine(settings.DATABASE_URL, echo=False)
-async_session = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+T = TypeVar("T")
+
+# Tables whose rows belong to one lead and live on that lead's shard. Every
+# other table (idempotency keys, webhook deliveries, ...) stays on shard 0,
+# which is the DATABASE_URL file itself.
+LEAD_TABLES = frozenset({"leads", "leads_archive", "lead_resume_text"})
+# The column holding the owning lead's id in each lead table.
+_SHARD_KEYS = {"leads": "id", "leads_archive": "id", "lead_resume_text": "lead_id"}
+
+
+def shard_urls(database_url: str, count: int) -> list[str]:
+    """URLs of the ``count`` lead shards; shard 0 is ``database_url`` itself.
+
+    ``sqlite+aiosqlite:///./alma.db`` with three shards gives ``alma.db``,
+    ``alma.shard1.db`` and ``alma.shard2.db``.
+    """
+    if count <= 1:
+        return [database_url]
+    url = make_url(database_url)
+    if url.get_backend_name() != "sqlite" or url.database in (None, "", ":memory:"):
+        raise ValueError(
+            "DATABASE_SHARDS > 1 requires a file-backed SQLite DATABASE_URL"
+        )
+    stem, ext = os.path.splitext(url.database)
+    urls = [database_url]
+    for i in range(1, count):
+        urls.append(
+            url.set(database=f"{stem}.shard{i}{ext}").render_as_string(
+                hide_password=False
+            )
+        )
+    return urls
+
+
+def shard_for(lead_id: str, count: int) -> int:
+    """Shard index owning ``lead_id``; stable across processes and restarts."""
+    return zlib.crc32(lead_id.encode()) % count if count > 1 else 0
+
+
+def _lead_key(mapper, instance) -> str | None:
+    if mapper.local_table.name not in LEAD_TABLES:
+        return None
+    if mapper.local_table.name == "lead_resume_text":
+        return instance.lead_id
+    if instance.id is None:
+        # The column default only runs at INSERT time, after the shard has
+        # been chosen, so assign the id here.
+        instance.id = str(uuid.uuid4())
+    return instance.id
+
+
+def _routed_lead_ids(orm_context) -> set[str] | None:
+    """Lead ids a statement is restricted to, or None if it may touch any row.
+
+    Recognises ``<shard key> = value`` and ``<shard key> IN (values)`` among
+    the top-level AND terms of the WHERE clause, which covers ``get()`` and
+    by-id reads and updates. Anything else (OR, subqueries, executemany)
+    returns None and is run on every shard.
+    """
+    whereclause = getattr(orm_context.statement, "whereclause", None)
+    params = orm_context.parameters
+    if whereclause is None or not (params is None or isinstance(params, dict)):
+        return None
+    params = params or {}
+    terms = (
+        whereclause.clauses
+        if isinstance(whereclause, BooleanClauseList)
+        and whereclause.operator is operators.and_
+        else [whereclause]
+    )
+    for term in terms:
+        if not isinstance(term, BinaryExpression) or not isinstance(
+            term.right, BindParameter
+        ):
+            continue
+        column = term.left
+        table = getattr(column, "table", None)
+        if table is None or _SHARD_KEYS.get(table.name) != getattr(
+            column, "name", None
+        ):
+            continue
+        value = params.get(term.right.key, term.right.value)
+        if term.operator is operators.eq and isinstance(value, str):
+            return {value}
+        if term.operator is operators.in_op and isinstance(value, (list, tuple)):
+            return set(value)
+    return None
+
+
+def make_sessionmaker(engines: list[AsyncEngine]) -> async_sessionmaker[AsyncSession]:
+    """Session factory over one engine per shard (a plain one for a single engine).
+
+    Sharded sessions route lead rows by ``shard_for`` on flush, and route
+    statements restricted to given lead ids (``get()``, ``WHERE id = ...``,
+    ``WHERE id IN (...)``) to the shards owning those ids. Statements on the
+    global tables go to shard 0; any other statement touching a lead table
+    runs on every shard, concatenating the results. Per-shard ORDER BY/LIMIT
+    is therefore not global: callers that need a global order use
+    ``scatter``. Commits are per shard, not atomic across shards.
+    """
+    if len(engines) == 1:
+        return async_sessionmaker(
+            engines[0], class_=AsyncSession, expire_on_commit=False
+        )
+    count = len(engines)
+
+    def shard_chooser(mapper, instance, **kw):
+        if instance is None:
+            return 0
+        key = _lead_key(mapper, instance)
+        return 0 if key is None else shard_for(key, count)
+
+    def identity_chooser(mapper, primary_key, **kw):
+        if mapper.local_table.name in LEAD_TABLES:
+            return [shard_for(primary_key[0], count)]
+        return [0]
+
+    def execute_chooser(orm_context):
+        tables = find_tables(
+            orm_context.statement, check_columns=True, include_crud=True
+        )
+        if any(table.name in LEAD_TABLES for table in tables):
+            lead_ids = _routed_lead_ids(orm_context)
+            if lead_ids is not None:
+                shards = sorted({shard_for(lead_id, count) for lead_id in lead_ids})
+                return shards or [0]
+            return list(range(count))
+        return [0]
+
+    return async_sessionmaker(
+        class_=AsyncSession,
+        sync_session_class=ShardedSession,
+        expire_on_commit=False,
+        shards={i: e.sync_engine for i, e in enumerate(engines)},
+        shard_chooser=shard_chooser,
+        identity_chooser=identity_chooser,
+        execute_chooser=execute_chooser,
+        info={"lead_shards": engines},
+    )
+
+
+engines = [
+    create_async_engine(url, echo=False)
+    for url in shard_urls(settings.DATABASE_URL, settings.DATABASE_SHARDS)
+]
+engine = engines[0]
+async_session = make_sessionmaker(engines)
+
+
+async def scatter(
+    db: AsyncSession, fn: Callable[[AsyncSession], Awaitable[T]]
+) -> list[T]:
+    """Run ``fn`` once per lead shard, concurrently, and return the results.
+
+    Each shard gets its own short-lived session; unsharded, ``fn`` runs once
+    on ``db`` itself. Use for reads whose results the caller merges.
+    """
+    shard_engines = db.sync_session.info.get("lead_shards")
+    if not shard_engines:
+        return [await fn(db)]
+
+    async def run(shard_engine: AsyncEngine) -> T:
+        async with AsyncSession(shard_engine, expire_on_commit=False) as session:
+            return await fn(session)
+
+    return list(await asyncio.gather(*(run(e) for e in shard_engines)))
+
+
+def first_page(rows: Iterable[T], key: Callable[[T], Any], limit: int) -> list[T]:
+    """The first ``limit`` of ``rows`` ordered by ``key``.
+
+    For keyset pagination over a lead table: a sharded session returns one
+    ``ORDER BY … LIMIT`` page per shard, and only the smallest ``limit`` rows
+    across them form the global page.
+    """
+    return heapq.nsmallest(limit, rows, key=key)
+
+
+def on_commit(db: AsyncSession, callback: Callable[[], None]) -> None:
+    """Call ``callback`` once ``db`` next commits.
+
+    A rollback first discards it, so work queued for rows that were never
+    committed is not run.
+    """
+    session = db.sync_session
+
+    def committed(_session) -> None:
+        event.remove(session, "after_soft_rollback", rolled_back)
+        callback()
+
+    def rolled_back(_session, _previous_transaction) -> None:
+        event.remove(session, "after_commit", committed)
+
+    event.listen(session, "after_commit", committed, once=True)
+    event.listen(session, "after_soft_rollback", rolled_back, once=True)
+
+
+# Kept outside Base.metadata so it is not part of the fingerprint it stores.
+schema_fingerprint_table = Table(
+    "schema_fingerprint", MetaData(), Column("fingerprint", String, primary_key=True)
+)
+
+
+def schema_fingerprint(metadata: MetaData, dialect: Dialect) -> str:
+    """SHA-256 of the DDL ``create_all`` would emit for ``metadata``."""
+    ddl = []
+    for table in metadata.sorted_tables:
+        ddl.append(str(CreateTable(table).compile(dialect=dialect)))
+        for index in sorted(table.indexes, key=lambda i: i.name):
+            ddl.append(str(CreateIndex(index).compile(dialect=dialect)))
+    return hashlib.sha256("\n".join(ddl).encode()).hexdigest()
+
+
+def _add_missing_columns(conn, metadata: MetaData) -> None:
+    # create_all leaves existing tables alone. Nullable columns added to a
+    # model since can be appended in place; anything else needs a migration.
+    inspector = inspect(conn)
+    for table in metadata.sorted_tables:
+        existing = {column["name"] for column in inspector.get_columns(table.name)}
+        for column in table.columns:
+            if (
+                column.name not in existing
+                and column.nullable
+                and column.server_default is None
+            ):
+                name = conn.dialect.identifier_preparer.format_table(table)
+                ddl = CreateColumn(column).compile(dialect=conn.dialect)
+                conn.execute(DDL(f"ALTER TABLE {name} ADD COLUMN {ddl}"))
+
+
+def _create_missing_indexes(conn, metadata: MetaData) -> None:
+    # create_all skips tables that already exist, including any index added
+    # to their model since; create those individually.
+    for table in metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(conn, checkfirst=True)
+
+
+async def ensure_schema(db_engine: AsyncEngine | None = None) -> bool:
+    """Create missing tables and indexes unless the schema is already current.
+
+    A fingerprint of the models' DDL is stored in the database, so a worker
+    booting against an up-to-date schema does one SELECT instead of
+    ``create_all``'s table-by-table inspection. New nullable columns are
+    added to existing tables; other column changes are not migrated. Without
+    ``db_engine`` every shard is checked. Returns True if DDL ran.
+    """
+    if db_engine is None:
+        return any([await ensure_schema(e) for e in engines])
+
+    from app.models import Base
+
+    fingerprint = schema_fingerprint(Base.metadata, db_engine.dialect)
+    async with db_engine.connect() as conn:
+        try:
+            stored = (
+                await conn.execute(select(schema_fingerprint_table.c.fingerprint))
+            ).scalar()
+        except DBAPIError:
+            stored = None  # first boot: the table does not exist yet
+    if stored == fingerprint:
+        return False
+
+    async with db_engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+        await conn.run_sync(_add_missing_columns, Base.metadata)
+        await conn.run_sync(_create_missing_indexes, Base.metadata)
+        await conn.run_sync(schema_fingerprint_table.metadata.create_all)
+        await conn.execute(delete(schema_fingerprint_table))
+        await conn.execute(
+            insert(schema_fingerprint_table).values(fingerprint=fingerprint)
+        )
+    return True
 
 
 async def get_db() -> AsyncGenerator[AsyncSession]:
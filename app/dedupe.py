@@ -0,0 +1,31 @@
+"""Backfill duplicate-detection keys and regroup existing leads into duplicate sets.
+
+Usage: python -m app.dedupe [--batch-size B]
+"""
+
+import argparse
+import asyncio
+import time
+
+from app.core.database import async_session, ensure_schema
+from app.services.dedupe_service import BATCH_SIZE, dedupe_existing
+
+
+async def run(batch_size: int) -> int:
+    await ensure_schema()
+    async with async_session() as session:
+        return await dedupe_existing(session, batch_size)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(prog="python -m app.dedupe")
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    changed = asyncio.run(run(args.batch_size))
+    print(f"Relinked {changed} lead(s) in {time.perf_counter() - start:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
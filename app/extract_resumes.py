@@ -0,0 +1,30 @@
+"""Extract plain text for resumes that have none yet (e.g. uploads from before the pipeline).
+
+Usage: python -m app.extract_resumes [--retry-failed]
+"""
+
+import argparse
+import asyncio
+import time
+
+from app.core.database import ensure_schema
+from app.services.resume_text_service import backfill
+
+
+async def run(retry_failed: bool) -> int:
+    await ensure_schema()
+    return await backfill(retry_failed=retry_failed)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(prog="python -m app.extract_resumes")
+    parser.add_argument("--retry-failed", action="store_true", help="also retry FAILED extractions")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    processed = asyncio.run(run(args.retry_failed))
+    print(f"Processed {processed} resume(s) in {time.perf_counter() - start:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -3,20 +3,33 @@ from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
 
+from app.core.admission import AdmissionMiddleware
+from app.core.compression import CompressionMiddleware
 from app.core.config import settings
-from app.core.database import engine
-from app.models.base import Base
+from app.core.database import ensure_schema
+from app.services.resume_text_service import pipeline as resume_text_pipeline
+from app.services.upload_sweep_service import sweeper as upload_sweeper
+from app.services.webhook_service import dispatcher as webhook_dispatcher
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.create_all)
+    await ensure_schema()
     os.makedirs(settings.UPLOAD_DIR, exist_ok=True)
+    if settings.BACKGROUND_TASKS:
+        await resume_text_pipeline.start()
+        if settings.WEBHOOK_SUBSCRIBERS:
+            await webhook_dispatcher.start()
+        await upload_sweeper.start()
     yield
+    await upload_sweeper.stop()
+    await webhook_dispatcher.stop()
+    await resume_text_pipeline.stop()
 
 
 app = FastAPI(title="Alma Lead Management API", lifespan=lifespan)
+app.add_middleware(AdmissionMiddleware)
+app.add_middleware(CompressionMiddleware)
 
 from app.api.router import api_router  # noqa: E402
 
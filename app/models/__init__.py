@@ -0,0 +1,4 @@
+"""Importing this package registers every model on ``Base.metadata``."""
+
+from app.models import idempotency, lead, resume_text, webhook  # noqa: F401
+from app.models.base import Base  # noqa: F401
@@ -1,5 +1,12 @@
+from datetime import UTC, datetime
+
 from sqlalchemy.orm import DeclarativeBase
 
 
 class Base(DeclarativeBase):
     pass
+
+
+def utcnow() -> datetime:
+    """The current time as stored in the database: naive UTC."""
+    return datetime.now(UTC).replace(tzinfo=None)
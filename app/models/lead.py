@@ -2,7 +2,7 @@ import enum
 import uuid
 from datetime import datetime
 
-from sqlalchemy import DateTime, Enum, String, func
+from sqlalchemy import DateTime, Enum, Index, Integer, String, func, text
 from sqlalchemy.orm import Mapped, mapped_column
 
 from app.models.base import Base
@@ -22,7 +22,12 @@ class Lead(Base):
     first_name: Mapped[str] = mapped_column(String, nullable=False)
     last_name: Mapped[str] = mapped_column(String, nullable=False)
     email: Mapped[str] = mapped_column(String, nullable=False, index=True)
-    resume_path: Mapped[str | None] = mapped_column(String, nullable=True)
+    # Indexed for the orphaned-upload sweeper's batched lookups.
+    resume_path: Mapped[str | None] = mapped_column(String, nullable=True, index=True)
+    # Codec of the stored file (None: raw) and its original size; a NULL size
+    # means the file predates compression and has not been examined yet.
+    resume_codec: Mapped[str | None] = mapped_column(String, nullable=True)
+    resume_size: Mapped[int | None] = mapped_column(Integer, nullable=True)
     state: Mapped[LeadState] = mapped_column(
         Enum(LeadState), nullable=False, default=LeadState.PENDING
     )
@@ -30,5 +35,78 @@ class Lead(Base):
         DateTime(timezone=True), server_default=func.now()
     )
     updated_at: Mapped[datetime] = mapped_column(
-        DateTime(timezone=True), server_default=func.now(), onupdate=func.now()
+        DateTime(timezone=True),
+        server_default=func.now(),
+        onupdate=func.now(),
+        index=True,
+    )
+    # Duplicate-detection blocking keys (see dedupe_service) and the earliest
+    # lead of this lead's duplicate group; NULL when the lead is canonical.
+    email_key: Mapped[str | None] = mapped_column(String, nullable=True, index=True)
+    name_key: Mapped[str | None] = mapped_column(String, nullable=True)
+    canonical_lead_id: Mapped[str | None] = mapped_column(
+        String, nullable=True, index=True
+    )
+    # Work-queue lease (see claim_service): who is working the lead and until
+    # when. Both are NULL while the lead is unclaimed.
+    claimed_by: Mapped[str | None] = mapped_column(String, nullable=True)
+    lease_expires_at: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True), nullable=True
+    )
+
+    __table_args__ = (
+        # Partial indexes: claiming walks unleased PENDING leads oldest first,
+        # and reclaiming expired leases only looks at leased rows, so both stay
+        # small lookups however long the REACHED_OUT history grows.
+        Index(
+            "ix_leads_claimable",
+            "created_at",
+            sqlite_where=text("state = 'PENDING' AND lease_expires_at IS NULL"),
+        ),
+        Index(
+            "ix_leads_lease_expiry",
+            "lease_expires_at",
+            sqlite_where=text("lease_expires_at IS NOT NULL"),
+        ),
+        # A new lead's name-key candidates are the bucket's oldest rows.
+        Index("ix_leads_name_key_created_at", "name_key", "created_at"),
+    )
+
+
+class LeadArchive(Base):
+    """Cold storage for REACHED_OUT leads moved out of ``leads`` by the archive job."""
+
+    __tablename__ = "leads_archive"
+
+    id: Mapped[str] = mapped_column(String, primary_key=True)
+    first_name: Mapped[str] = mapped_column(String, nullable=False)
+    last_name: Mapped[str] = mapped_column(String, nullable=False)
+    email: Mapped[str] = mapped_column(String, nullable=False, index=True)
+    resume_path: Mapped[str | None] = mapped_column(String, nullable=True, index=True)
+    resume_codec: Mapped[str | None] = mapped_column(String, nullable=True)
+    resume_size: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    state: Mapped[LeadState] = mapped_column(Enum(LeadState), nullable=False)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False
+    )
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False
+    )
+    # Indexed for the duplicate-detection passes and group lookups, which
+    # include archived leads.
+    email_key: Mapped[str | None] = mapped_column(String, nullable=True, index=True)
+    name_key: Mapped[str | None] = mapped_column(String, nullable=True)
+    canonical_lead_id: Mapped[str | None] = mapped_column(
+        String, nullable=True, index=True
+    )
+    claimed_by: Mapped[str | None] = mapped_column(String, nullable=True)
+    lease_expires_at: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True), nullable=True
+    )
+    archived_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now()
+    )
+
+    __table_args__ = (
+        Index("ix_leads_archive_name_key_created_at", "name_key", "created_at"),
     )
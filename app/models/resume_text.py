@@ -0,0 +1,29 @@
+import enum
+from datetime import datetime
+
+from sqlalchemy import DateTime, Enum, String, Text, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.base import Base
+
+
+class ResumeTextStatus(str, enum.Enum):
+    PENDING = "PENDING"
+    DONE = "DONE"
+    FAILED = "FAILED"
+
+
+class LeadResumeText(Base):
+    """Plain text extracted from a lead's resume by the background pipeline."""
+
+    __tablename__ = "lead_resume_text"
+
+    lead_id: Mapped[str] = mapped_column(String, primary_key=True)
+    status: Mapped[ResumeTextStatus] = mapped_column(
+        Enum(ResumeTextStatus), nullable=False, default=ResumeTextStatus.PENDING, index=True
+    )
+    text: Mapped[str | None] = mapped_column(Text, nullable=True)
+    error: Mapped[str | None] = mapped_column(String, nullable=True)
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), onupdate=func.now()
+    )
@@ -0,0 +1,42 @@
+"""Redistribute leads across SQLite shards after changing DATABASE_SHARDS.
+
+Stop the service, run this, then restart it with DATABASE_SHARDS set to --to.
+
+Usage: python -m app.reshard --to N [--from M] [--batch-size B]
+"""
+
+import argparse
+import asyncio
+import time
+
+from app.core.config import settings
+from app.core.database import shard_urls
+from app.services.reshard_service import BATCH_SIZE, reshard
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(prog="python -m app.reshard")
+    parser.add_argument("--to", type=int, required=True, help="new number of shards")
+    parser.add_argument(
+        "--from",
+        dest="from_count",
+        type=int,
+        default=settings.DATABASE_SHARDS,
+        help="current number of shards (default: DATABASE_SHARDS)",
+    )
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+    args = parser.parse_args()
+    if args.to < 1 or args.from_count < 1:
+        parser.error("shard counts must be at least 1")
+
+    start = time.perf_counter()
+    moved = asyncio.run(reshard(settings.DATABASE_URL, args.from_count, args.to, args.batch_size))
+    print(f"Moved {moved} row(s) from {args.from_count} to {args.to} shard(s) in {time.perf_counter() - start:.1f}s")
+    if args.to < args.from_count:
+        stale = shard_urls(settings.DATABASE_URL, args.from_count)[args.to :]
+        print("No lead data is left in: " + ", ".join(stale))
+    print(f"Set DATABASE_SHARDS={args.to} before restarting the service.")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,10 @@
 from datetime import datetime
 
-from pydantic import BaseModel, EmailStr
+from pydantic import BaseModel, EmailStr, Field
 
+from app.core.config import settings
 from app.models.lead import LeadState
+from app.models.resume_text import ResumeTextStatus
 
 
 class LeadCreateResponse(BaseModel):
@@ -28,7 +30,25 @@ class LeadDetailResponse(BaseModel):
     state: LeadState
     created_at: datetime
     updated_at: datetime
+    archived_at: datetime | None = None
+    canonical_lead_id: str | None = None
+    claimed_by: str | None = None
+    lease_expires_at: datetime | None = None
+
+
+class LeadResourceResponse(LeadDetailResponse):
+    """Single-lead view with data that is too costly to include in listings."""
+
+    duplicate_ids: list[str] = []
+    resume_text_status: ResumeTextStatus | None = None
 
 
 class LeadUpdateStateRequest(BaseModel):
     state: LeadState
+
+
+class LeadClaimRequest(BaseModel):
+    count: int = Field(1, ge=1, le=settings.LEAD_CLAIM_MAX_BATCH, description="How many leads to claim")
+    claimant: str | None = Field(
+        None, min_length=1, max_length=255, description="Who the leads are leased to (default: the logged-in user)"
+    )
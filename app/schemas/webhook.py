@@ -0,0 +1,25 @@
+import json
+from datetime import datetime
+
+from pydantic import BaseModel, field_validator
+
+from app.models.webhook import WebhookDeliveryStatus
+
+
+class WebhookDeliveryResponse(BaseModel):
+    model_config = {"from_attributes": True}
+
+    id: str
+    subscriber: str
+    event_type: str
+    status: WebhookDeliveryStatus
+    attempts: int
+    last_error: str | None
+    created_at: datetime
+    next_attempt_at: datetime
+    payload: dict
+
+    @field_validator("payload", mode="before")
+    @classmethod
+    def _decode_payload(cls, value):
+        return json.loads(value) if isinstance(value, str) else value
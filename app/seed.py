@@ -1,16 +1,284 @@
-"""Generate a bcrypt password hash for the internal user.
+"""Seeding utilities.
 
-Usage: python -m app.seed <password>
+Usage:
+    python -m app.seed <password>
+        Print a bcrypt password hash for the internal user.
+
+    python -m app.seed generate --leads N [--resumes M] [--seed S] [--end YYYY-MM-DD]
+        Bulk-insert N synthetic leads (and write M dummy resumes) into the
+        configured database. Output is deterministic for a given seed and end date.
 """
 
+import argparse
+import asyncio
+import os
+import queue
+import random
 import sys
+import threading
+import time
+import uuid
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import Engine, create_engine, event
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import create_async_engine
 
+from app.core.config import settings
+from app.core.database import ensure_schema, shard_for, shard_urls
 from app.core.security import hash_password
+from app.models.lead import Lead, LeadState
+from app.services.dedupe_service import canonical_email, name_key
+
+BATCH_SIZE = 50_000
+RESUME_EXTENSIONS = (".pdf", ".pdf", ".pdf", ".docx", ".doc")
+
+FIRST_NAMES = (
+    "Maria", "José", "Wei", "Aisha", "Carlos", "Priya", "Olga", "Ahmed", "Sofia",
+    "Daniel", "Fatima", "Hiroshi", "Elena", "Kwame", "Ana", "Dmitri", "Lucía", "Arjun",
+    "Chloe", "Omar", "Nadia", "Mateo", "Yuki", "Ibrahim", "Grace", "Luca", "Amara",
+    "Ravi", "Ingrid", "Tomás",
+)
+LAST_NAMES = (
+    "Garcia", "Nguyen", "Patel", "Kim", "Rodriguez", "Chen", "Okafor", "Ivanova",
+    "Haddad", "Silva", "Müller", "Rossi", "Tanaka", "Mensah", "Hernandez", "Kowalski",
+    "Singh", "Ali", "Lopez", "Novak", "Fernandes", "Yilmaz", "Sato", "Dubois",
+    "Mahmoud", "Cohen", "Reyes",
+)
+EMAIL_DOMAINS = (
+    "gmail.com", "yahoo.com", "outlook.com", "proton.me", "icloud.com", "example.com",
+)
+
+# Lead ages follow an exponential distribution (most leads are recent) capped
+# at MAX_AGE_DAYS; the chance a lead has been reached out grows with its age.
+MEAN_AGE_DAYS = 90
+MAX_AGE_DAYS = 730
+REACH_OUT_DAYS = 30
+
+
+def sync_database_url(url: str) -> str:
+    """Map the app's async driver URL to its synchronous equivalent."""
+    parsed = make_url(url)
+    return parsed.set(drivername=parsed.get_backend_name()).render_as_string(
+        hide_password=False
+    )
+
+
+def create_bulk_engine(database_url: str) -> Engine:
+    engine = create_engine(sync_database_url(database_url))
+    if engine.dialect.name == "sqlite":
+
+        @event.listens_for(engine, "connect")
+        def _fast_pragmas(dbapi_conn, _record) -> None:
+            cursor = dbapi_conn.cursor()
+            cursor.execute("PRAGMA journal_mode=WAL")
+            cursor.execute("PRAGMA synchronous=OFF")
+            cursor.execute("PRAGMA temp_store=MEMORY")
+            cursor.close()
+
+    return engine
+
+
+def lead_batches(
+    count: int,
+    rng: random.Random,
+    end: datetime,
+    resume_paths: list[str],
+    upload_dir: str,
+    batch_size: int = BATCH_SIZE,
+) -> Iterator[list[dict]]:
+    """Yield lists of row dicts for ``Lead.__table__`` totalling ``count`` rows.
+
+    Leads cycle through ``resume_paths``; when it is empty each lead gets a
+    unique path under ``upload_dir`` that does not exist on disk. Dedupe
+    blocking keys are filled in, so new submissions match generated history.
+    """
+    name_keys = {
+        (first, last): name_key(first, last)
+        for first in FIRST_NAMES
+        for last in LAST_NAMES
+    }
+    max_age = MAX_AGE_DAYS * 86_400
+    mean_age = MEAN_AGE_DAYS * 86_400
+    reach_out = REACH_OUT_DAYS * 86_400
+    produced = 0
+    while produced < count:
+        rows = []
+        for i in range(produced, min(produced + batch_size, count)):
+            first = rng.choice(FIRST_NAMES)
+            last = rng.choice(LAST_NAMES)
+            age = min(rng.expovariate(1 / mean_age), max_age)
+            created = end - timedelta(seconds=age)
+            if rng.random() < min(age / reach_out, 0.95):
+                state = LeadState.REACHED_OUT
+                updated = created + timedelta(
+                    seconds=rng.uniform(0, min(age, reach_out))
+                )
+            else:
+                state = LeadState.PENDING
+                updated = created
+            if resume_paths:
+                resume_path = resume_paths[i % len(resume_paths)]
+            else:
+                resume_path = os.path.join(
+                    upload_dir, f"{uuid.UUID(int=rng.getrandbits(128), version=4)}.pdf"
+                )
+            email = f"{first.lower()}.{last.lower()}{i}@{rng.choice(EMAIL_DOMAINS)}"
+            rows.append(
+                {
+                    "id": str(uuid.UUID(int=rng.getrandbits(128), version=4)),
+                    "first_name": first,
+                    "last_name": last,
+                    "email": email,
+                    "resume_path": resume_path,
+                    "state": state,
+                    "created_at": created,
+                    "updated_at": updated,
+                    "email_key": canonical_email(email),
+                    "name_key": name_keys[first, last],
+                }
+            )
+        produced += len(rows)
+        yield rows
+
+
+def _prefetch(batches: Iterator[list[dict]], depth: int = 2) -> Iterator[list[dict]]:
+    """Build the next batches on a helper thread while the current one is inserted."""
+    buffer: queue.Queue = queue.Queue(maxsize=depth)
+    done = object()
+
+    def produce() -> None:
+        try:
+            for batch in batches:
+                buffer.put(batch)
+        finally:
+            buffer.put(done)
+
+    threading.Thread(target=produce, daemon=True).start()
+    while (batch := buffer.get()) is not done:
+        yield batch
+
+
+def _dummy_resume(index: int, seed: int, ext: str) -> bytes:
+    rng = random.Random(seed * 1_000_003 + index)
+    filler = rng.randbytes(rng.randrange(2_048, 64 * 1024))
+    if ext == ".pdf":
+        header = b"%PDF-1.4\n% synthetic resume " + str(index).encode()
+        return header + b"\n" + filler + b"\n%%EOF\n"
+    return b"PK\x03\x04synthetic resume " + str(index).encode() + b"\n" + filler
+
+
+def write_resumes(
+    count: int, seed: int, upload_dir: str, workers: int | None = None
+) -> list[str]:
+    """Write ``count`` dummy resume files in parallel; return their relative paths."""
+    os.makedirs(upload_dir, exist_ok=True)
+    rng = random.Random(seed)
+    specs = []
+    for i in range(count):
+        stem = uuid.UUID(int=rng.getrandbits(128), version=4)
+        extension = rng.choice(RESUME_EXTENSIONS)
+        specs.append((i, os.path.join(upload_dir, f"{stem}{extension}")))
+
+    def write(spec: tuple[int, str]) -> str:
+        index, path = spec
+        with open(path, "wb") as f:
+            f.write(_dummy_resume(index, seed, os.path.splitext(path)[1]))
+        return path
+
+    with ThreadPoolExecutor(
+        max_workers=workers or min(32, (os.cpu_count() or 1) * 4)
+    ) as pool:
+        return list(pool.map(write, specs, chunksize=256))
+
+
+async def _prepare_schema(urls: list[str]) -> None:
+    import app.models  # noqa: F401  (the fingerprint covers every model)
+
+    for url in urls:
+        engine = create_async_engine(url)
+        try:
+            await ensure_schema(engine)
+        finally:
+            await engine.dispose()
+
+
+def generate(
+    leads: int,
+    resumes: int = 0,
+    seed: int = 0,
+    end: datetime | None = None,
+    database_url: str | None = None,
+    upload_dir: str | None = None,
+    batch_size: int = BATCH_SIZE,
+    shards: int | None = None,
+) -> None:
+    """Bulk-insert ``leads`` synthetic rows through SQLAlchemy Core.
+
+    With ``shards`` (default ``DATABASE_SHARDS``) above one, each row is
+    written to the shard file ``shard_for`` assigns its id.
+    """
+    end = end or datetime.now(timezone.utc).replace(
+        hour=0, minute=0, second=0, microsecond=0
+    )
+    upload_dir = upload_dir or settings.UPLOAD_DIR
+    shards = settings.DATABASE_SHARDS if shards is None else shards
+    resume_paths = write_resumes(resumes, seed, upload_dir) if resumes else []
+
+    urls = shard_urls(database_url or settings.DATABASE_URL, shards)
+    asyncio.run(_prepare_schema(urls))
+    engines = [create_bulk_engine(url) for url in urls]
+    try:
+        insert = Lead.__table__.insert()
+        rng = random.Random(seed)
+        for rows in _prefetch(
+            lead_batches(leads, rng, end, resume_paths, upload_dir, batch_size)
+        ):
+            by_shard: dict[int, list[dict]] = {}
+            for row in rows:
+                by_shard.setdefault(shard_for(row["id"], len(engines)), []).append(row)
+            for index, shard_rows in by_shard.items():
+                with engines[index].begin() as conn:
+                    conn.execute(insert, shard_rows)
+    finally:
+        for engine in engines:
+            engine.dispose()
+
+
+def _generate_main(argv: list[str]) -> None:
+    parser = argparse.ArgumentParser(prog="python -m app.seed generate")
+    parser.add_argument(
+        "--leads", type=int, required=True, help="number of leads to insert"
+    )
+    parser.add_argument(
+        "--resumes", type=int, default=0, help="number of dummy resume files to write"
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--end",
+        type=lambda v: datetime.fromisoformat(v).replace(tzinfo=timezone.utc),
+        default=None,
+        help="newest created_at (YYYY-MM-DD, default: today UTC)",
+    )
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    generate(args.leads, args.resumes, args.seed, args.end, batch_size=args.batch_size)
+    elapsed = time.perf_counter() - start
+    summary = f"Inserted {args.leads} leads and wrote {args.resumes} resumes"
+    print(f"{summary} in {elapsed:.1f}s")
 
 
 def main() -> None:
+    if len(sys.argv) >= 2 and sys.argv[1] == "generate":
+        _generate_main(sys.argv[2:])
+        return
     if len(sys.argv) != 2:
         print("Usage: python -m app.seed <password>")
+        print("       python -m app.seed generate --leads N [--resumes M] [--seed S]")
         sys.exit(1)
     password = sys.argv[1]
     hashed = hash_password(password)
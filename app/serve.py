@@ -0,0 +1,344 @@
+"""Production server: a pre-forking supervisor for uvicorn workers.
+
+Usage: python -m app.serve [--workers N] [--host H] [--port P] [--log-level info]
+
+The supervisor imports the app and checks the schema once, then forks
+SERVER_WORKERS workers (default: one per available CPU) that share its
+listening socket. Modules loaded before the fork are shared copy-on-write;
+``gc.freeze()`` keeps the collector from dirtying those pages. uvloop and
+httptools are used when installed.
+
+Signals:
+    SIGTERM / SIGINT  stop accepting, let in-flight requests finish, exit
+    SIGHUP            zero-downtime reload: re-exec the supervisor with the
+                      same PID and socket, start workers on the new code,
+                      then retire the old ones once the new ones are ready
+A dead worker is replaced automatically.
+
+One worker at a time is the primary: only it runs the background services
+(resume text extraction, webhook delivery, upload sweeps), so they are not
+duplicated per worker. When the primary exits, its replacement takes over.
+"""
+
+import argparse
+import asyncio
+import gc
+import logging
+import os
+import select
+import signal
+import socket
+import subprocess
+import sys
+import time
+
+logger = logging.getLogger("app.serve")
+
+# Seconds to wait for a new worker to finish its lifespan startup.
+READY_TIMEOUT = 60
+# Minimum seconds between replacing crashed workers, so a worker that dies on
+# startup does not turn into a fork loop.
+RESPAWN_INTERVAL = 1.0
+# How often spawn_ready() looks up from its ready pipes to handle signals.
+SIGNAL_POLL_INTERVAL = 0.1
+
+
+def default_workers() -> int:
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:  # not available on macOS
+        return os.cpu_count() or 1
+
+
+def _available(module: str) -> bool:
+    try:
+        __import__(module)
+    except ImportError:
+        return False
+    return True
+
+
+def uvicorn_options() -> dict:
+    """Worker ``uvicorn.Config`` options derived from ``Settings``."""
+    from app.core.config import settings
+
+    return {
+        "loop": "uvloop" if _available("uvloop") else "asyncio",
+        "http": "httptools" if _available("httptools") else "h11",
+        "backlog": settings.SERVER_BACKLOG,
+        "timeout_keep_alive": settings.SERVER_KEEP_ALIVE_SECONDS,
+        "limit_concurrency": settings.SERVER_LIMIT_CONCURRENCY or None,
+        "timeout_graceful_shutdown": settings.SERVER_GRACEFUL_TIMEOUT_SECONDS,
+    }
+
+
+def _bind(host: str, port: int, backlog: int) -> socket.socket:
+    sock = socket.socket(
+        socket.AF_INET6 if ":" in host else socket.AF_INET, socket.SOCK_STREAM
+    )
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(backlog)
+    sock.set_inheritable(True)
+    return sock
+
+
+async def _prepare_schema() -> None:
+    from app.core.database import engines, ensure_schema
+
+    # Once here rather than racing in every worker's lifespan; no connection
+    # may survive into the forked workers.
+    await ensure_schema()
+    for engine in engines:
+        await engine.dispose()
+
+
+def _run_worker(
+    sock: socket.socket, ready_fd: int, log_level: str, primary: bool
+) -> None:
+    import uvicorn
+
+    from app.core.config import settings
+    from app.main import app
+
+    # Only the primary worker's lifespan starts the background services.
+    settings.BACKGROUND_TASKS = settings.BACKGROUND_TASKS and primary
+
+    class ReadyServer(uvicorn.Server):
+        async def startup(self, sockets=None) -> None:
+            await super().startup(sockets)
+            if self.started:
+                os.write(ready_fd, b"1")
+            os.close(ready_fd)
+
+    # The supervisor handles SIGHUP; uvicorn installs its own SIGINT/SIGTERM.
+    signal.signal(signal.SIGHUP, signal.SIG_IGN)
+    gc.enable()
+    config = uvicorn.Config(
+        app, lifespan="on", log_level=log_level, **uvicorn_options()
+    )
+    ReadyServer(config).run(sockets=[sock])
+
+
+class Supervisor:
+    def __init__(
+        self, sock: socket.socket, workers: int, log_level: str, argv: list[str]
+    ):
+        self.sock = sock
+        self.size = workers
+        self.log_level = log_level
+        self.argv = argv
+        self.workers: set[int] = set()
+        self.primary: int | None = None
+        self.stopping = False
+        self._pending: int | None = None
+        self._last_spawn = 0.0
+
+    def _on_signal(self, signum, _frame) -> None:
+        self._pending = signum
+
+    def spawn(self) -> tuple[int, int]:
+        """Fork one worker; return its pid and the read end of its ready pipe.
+
+        The worker becomes the primary if there is none.
+        """
+        ready_r, ready_w = os.pipe()
+        primary = self.primary is None
+        gc.freeze()  # keep the shared heap's pages clean in the child
+        pid = os.fork()
+        if pid == 0:
+            code = 0
+            try:
+                os.close(ready_r)
+                for sig in (signal.SIGTERM, signal.SIGINT):
+                    signal.signal(sig, signal.SIG_DFL)
+                _run_worker(self.sock, ready_w, self.log_level, primary)
+            except BaseException:
+                logger.exception("Worker %d crashed", os.getpid())
+                code = 1
+            finally:
+                os._exit(code)
+        os.close(ready_w)
+        self.workers.add(pid)
+        if primary:
+            self.primary = pid
+        self._last_spawn = time.monotonic()
+        return pid, ready_r
+
+    def spawn_ready(self, count: int) -> bool:
+        """Fork ``count`` workers and wait until all have started.
+
+        Stops waiting early when a signal arrives, leaving it to ``run``.
+        """
+        pipes = [self.spawn()[1] for _ in range(count)]
+        deadline = time.monotonic() + READY_TIMEOUT
+        ready = 0
+        while pipes and time.monotonic() < deadline and self._pending is None:
+            wait = min(SIGNAL_POLL_INTERVAL, max(0.0, deadline - time.monotonic()))
+            readable, _, _ = select.select(pipes, [], [], wait)
+            for fd in readable:
+                ready += os.read(fd, 1) == b"1"
+                os.close(fd)
+                pipes.remove(fd)
+        for fd in pipes:
+            os.close(fd)
+        return ready == count
+
+    def stop_workers(self, pids: set[int]) -> None:
+        """SIGTERM ``pids``, give them the graceful timeout, then SIGKILL."""
+        from app.core.config import settings
+
+        for pid in pids:
+            self._kill(pid, signal.SIGTERM)
+        deadline = time.monotonic() + settings.SERVER_GRACEFUL_TIMEOUT_SECONDS + 5
+        remaining = set(pids)
+        while remaining and time.monotonic() < deadline:
+            for pid in list(remaining):
+                if os.waitpid(pid, os.WNOHANG)[0]:
+                    remaining.discard(pid)
+            time.sleep(0.05)
+        for pid in remaining:
+            self._kill(pid, signal.SIGKILL)
+            os.waitpid(pid, 0)
+        self.workers -= pids
+        if self.primary in pids:
+            self.primary = None
+
+    @staticmethod
+    def _kill(pid: int, sig: int) -> None:
+        try:
+            os.kill(pid, sig)
+        except ProcessLookupError:
+            pass
+
+    def reap(self) -> None:
+        while True:
+            try:
+                pid, status = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                return
+            if pid == 0:
+                return
+            if pid == self.primary:
+                self.primary = None
+            if pid in self.workers:
+                self.workers.discard(pid)
+                if not self.stopping:
+                    logger.warning(
+                        "Worker %d exited (status %d); replacing it", pid, status
+                    )
+
+    def reload(self) -> None:
+        """Re-exec this process on the current code, handing over socket and workers."""
+        check = subprocess.run(
+            [sys.executable, "-c", "import app.main"],
+            capture_output=True,
+            text=True,
+            check=False,
+        )
+        if check.returncode != 0:
+            logger.error("Reload aborted, new code does not import:\n%s", check.stderr)
+            return
+        logger.info("Reloading: re-executing supervisor %d", os.getpid())
+        args = [
+            sys.executable,
+            "-m",
+            "app.serve",
+            *self.argv,
+            "--fd",
+            str(self.sock.fileno()),
+        ]
+        if self.workers:
+            args += ["--retire", ",".join(map(str, sorted(self.workers)))]
+        os.execv(sys.executable, args)
+
+    def run(self, retire: set[int]) -> None:
+        for sig in (signal.SIGTERM, signal.SIGINT, signal.SIGHUP):
+            signal.signal(sig, self._on_signal)
+
+        if not self.spawn_ready(self.size) and self._pending is None:
+            logger.error("Not every new worker started in time")
+        if retire:
+            # After a reload: the new generation is serving, retire the old one.
+            self.workers |= retire
+            self.stop_workers(retire)
+        logger.info(
+            "Serving with %d worker(s) on supervisor %d", len(self.workers), os.getpid()
+        )
+
+        while True:
+            signum, self._pending = self._pending, None
+            if signum in (signal.SIGTERM, signal.SIGINT):
+                self.stopping = True
+                self.stop_workers(set(self.workers))
+                return
+            if signum == signal.SIGHUP:
+                self.reload()
+            self.reap()
+            if (
+                len(self.workers) < self.size
+                and time.monotonic() - self._last_spawn >= RESPAWN_INTERVAL
+            ):
+                self.spawn_ready(1)
+            time.sleep(0.1)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(prog="python -m app.serve")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="worker processes (default: SERVER_WORKERS)",
+    )
+    parser.add_argument("--host", default=None, help="default: SERVER_HOST")
+    parser.add_argument("--port", type=int, default=None, help="default: SERVER_PORT")
+    parser.add_argument(
+        "--log-level", default="info", choices=["debug", "info", "warning", "error"]
+    )
+    # Set by a reload to hand the socket and old workers to the new image.
+    parser.add_argument("--fd", type=int, default=None, help=argparse.SUPPRESS)
+    parser.add_argument("--retire", default="", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    logging.basicConfig(
+        level=args.log_level.upper(),
+        format="%(asctime)s %(name)s %(levelname)s %(message)s",
+    )
+    # Collect nothing while the shared heap is built; workers re-enable gc.
+    gc.disable()
+
+    import app.main  # noqa: F401  (preload: shared copy-on-write by the workers)
+    from app.core.config import settings
+
+    asyncio.run(_prepare_schema())
+
+    if args.fd is not None:
+        sock = socket.socket(fileno=args.fd)
+        sock.set_inheritable(True)
+    else:
+        sock = _bind(
+            args.host or settings.SERVER_HOST,
+            args.port or settings.SERVER_PORT,
+            settings.SERVER_BACKLOG,
+        )
+    workers = args.workers or settings.SERVER_WORKERS or default_workers()
+    retire = {int(pid) for pid in args.retire.split(",") if pid}
+    Supervisor(sock, workers, args.log_level, _strip_internal(sys.argv[1:])).run(retire)
+
+
+def _strip_internal(argv: list[str]) -> list[str]:
+    """``argv`` without the ``--fd`` / ``--retire`` options added by a reload."""
+    kept, skip = [], False
+    for arg in argv:
+        if skip:
+            skip = False
+        elif arg in ("--fd", "--retire"):
+            skip = True
+        elif not arg.startswith(("--fd=", "--retire=")):
+            kept.append(arg)
+    return kept
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+from datetime import timedelta
+
+from sqlalchemy import delete, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.models.base import utcnow
+from app.models.lead import Lead, LeadArchive, LeadState
+
+LEAD_COLUMNS = [column.name for column in Lead.__table__.columns]
+
+
+async def archive_leads(
+    db: AsyncSession,
+    older_than: timedelta | None = None,
+    batch_size: int | None = None,
+) -> int:
+    """Move REACHED_OUT leads not updated within ``older_than`` into ``leads_archive``.
+
+    Rows are moved in batches, each in its own transaction, so the hot table
+    is never locked for long. Returns the number of leads archived.
+    """
+    older_than = older_than or timedelta(days=settings.ARCHIVE_AFTER_DAYS)
+    batch_size = batch_size or settings.ARCHIVE_BATCH_SIZE
+    cutoff = utcnow() - older_than
+
+    archived = 0
+    while True:
+        result = await db.execute(
+            select(Lead.id)
+            .where(Lead.state == LeadState.REACHED_OUT, Lead.updated_at < cutoff)
+            .limit(batch_size)
+        )
+        ids = list(result.scalars().all())
+        if not ids:
+            return archived
+
+        await db.execute(
+            insert(LeadArchive).from_select(
+                LEAD_COLUMNS,
+                select(*(Lead.__table__.c[name] for name in LEAD_COLUMNS)).where(Lead.id.in_(ids)),
+            )
+        )
+        await db.execute(
+            delete(Lead).where(Lead.id.in_(ids)).execution_options(synchronize_session=False)
+        )
+        await db.commit()
+        archived += len(ids)
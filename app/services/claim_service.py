@@ -0,0 +1,61 @@
+from datetime import datetime, timedelta
+from operator import attrgetter
+
+from sqlalchemy import literal_column, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.models.base import utcnow
+from app.models.lead import Lead
+
+# Spelled as literals rather than bound parameters so SQLite can match them
+# against the partial indexes' WHERE clauses (see Lead.__table_args__).
+_PENDING = Lead.state == literal_column("'PENDING'")
+_CLAIMABLE = _PENDING & Lead.lease_expires_at.is_(None)
+
+_RELEASED = {"claimed_by": None, "lease_expires_at": None}
+
+
+async def reclaim_expired(db: AsyncSession, now: datetime | None = None) -> None:
+    """Return leads whose lease ran out to the queue."""
+    await db.execute(
+        update(Lead)
+        .where(_PENDING, Lead.lease_expires_at < (now or utcnow()))
+        .values(**_RELEASED)
+        .execution_options(synchronize_session=False)
+    )
+
+
+async def claim_leads(
+    db: AsyncSession,
+    claimant: str,
+    count: int = 1,
+    ttl: timedelta | None = None,
+) -> list[Lead]:
+    """Lease the ``count`` oldest unclaimed PENDING leads to ``claimant``.
+
+    Expired leases are reclaimed first. The claim itself is one conditional
+    ``UPDATE … RETURNING``: a row is only taken while it is still PENDING and
+    unleased, so concurrent claimers never receive the same lead. Returns the
+    claimed leads oldest first (fewer than ``count`` when the queue runs dry).
+    """
+    now = utcnow()
+    expires = now + (ttl or timedelta(minutes=settings.LEAD_CLAIM_TTL_MINUTES))
+    await reclaim_expired(db, now)
+
+    oldest = select(Lead.id).where(_CLAIMABLE).order_by(Lead.created_at).limit(count)
+    result = await db.execute(
+        update(Lead)
+        .where(Lead.id.in_(oldest.scalar_subquery()), _CLAIMABLE)
+        .values(claimed_by=claimant, lease_expires_at=expires)
+        .returning(Lead)
+        .execution_options(populate_existing=True)
+    )
+    claimed = sorted(result.scalars().all(), key=attrgetter("created_at"))
+    if len(claimed) > count:
+        # A sharded session runs the claim on every shard, each leasing its
+        # own oldest rows; hand back all but the globally oldest.
+        surplus = [lead.id for lead in claimed[count:]]
+        await db.execute(update(Lead).where(Lead.id.in_(surplus)).values(**_RELEASED))
+        claimed = claimed[:count]
+    return claimed
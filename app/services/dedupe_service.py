@@ -0,0 +1,341 @@
+import operator
+import unicodedata
+from collections.abc import AsyncIterator, Iterable
+from difflib import SequenceMatcher
+from operator import attrgetter
+
+from sqlalchemy import bindparam, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.database import first_page
+from app.models.lead import Lead, LeadArchive
+
+GMAIL_DOMAINS = {"gmail.com", "googlemail.com"}
+# Leads sharing a name key are only duplicates if their first names are this similar.
+FIRST_NAME_SIMILARITY = 0.85
+# Upper bound on candidates pulled from the index for a single new lead.
+MAX_CANDIDATES = 50
+BATCH_SIZE = 5_000
+
+# Archived leads keep their place in duplicate groups, so the batch job
+# maintains both tables.
+LEAD_MODELS = (Lead, LeadArchive)
+
+# Executemany updates keyed by ``b_id``, one per table. Assigning updated_at to
+# itself stops the column's onupdate from firing: key maintenance is not a
+# lead change.
+_UPDATE_KEYS = {
+    model: update(model.__table__)
+    .where(model.__table__.c.id == bindparam("b_id"))
+    .values(
+        email_key=bindparam("b_email_key"),
+        name_key=bindparam("b_name_key"),
+        updated_at=model.__table__.c.updated_at,
+    )
+    for model in LEAD_MODELS
+}
+_UPDATE_CANONICAL = {
+    model: update(model.__table__)
+    .where(model.__table__.c.id == bindparam("b_id"))
+    .values(canonical_lead_id=bindparam("b_canonical"), updated_at=model.__table__.c.updated_at)
+    for model in LEAD_MODELS
+}
+
+_SOUNDEX_CODES = {
+    **dict.fromkeys("BFPV", "1"),
+    **dict.fromkeys("CGJKQSXZ", "2"),
+    **dict.fromkeys("DT", "3"),
+    "L": "4",
+    **dict.fromkeys("MN", "5"),
+    "R": "6",
+}
+
+
+def _ascii_letters(value: str) -> str:
+    decomposed = unicodedata.normalize("NFKD", value)
+    return "".join(ch for ch in decomposed if ch.isascii() and ch.isalpha()).upper()
+
+
+def soundex(name: str) -> str:
+    """American Soundex code (e.g. ``Robert`` -> ``R163``); empty for names without letters."""
+    letters = _ascii_letters(name)
+    if not letters:
+        return ""
+    code = letters[0]
+    previous = _SOUNDEX_CODES.get(letters[0], "")
+    for ch in letters[1:]:
+        digit = _SOUNDEX_CODES.get(ch, "")
+        if digit and digit != previous:
+            code += digit
+            if len(code) == 4:
+                break
+        if ch not in "HW":
+            previous = digit
+    return code.ljust(4, "0")
+
+
+def canonical_email(email: str) -> str:
+    """Lowercase, drop ``+tag`` suffixes and Gmail's ignored dots."""
+    local, _, domain = email.strip().lower().rpartition("@")
+    local = local.split("+", 1)[0]
+    if domain in GMAIL_DOMAINS:
+        local = local.replace(".", "")
+        domain = "gmail.com"
+    return f"{local}@{domain}"
+
+
+def name_key(first_name: str, last_name: str) -> str | None:
+    """Phonetic last name plus first initial, e.g. ``Smyth, Jon`` -> ``S530:J``."""
+    code = soundex(last_name)
+    initial = _ascii_letters(first_name)[:1]
+    if not code or not initial:
+        return None
+    return f"{code}:{initial}"
+
+
+def _normalized_first_name(first_name: str) -> str:
+    return _ascii_letters(first_name)
+
+
+def _similar_first_names(a: str, b: str) -> bool:
+    ratio = SequenceMatcher(None, _normalized_first_name(a), _normalized_first_name(b)).ratio()
+    return ratio >= FIRST_NAME_SIMILARITY
+
+
+async def assign_keys_and_link(db: AsyncSession, lead: Lead) -> None:
+    """Fill ``lead``'s blocking keys and link it to an existing duplicate group.
+
+    Candidates come from index lookups on the two keys, never a table scan.
+    An email match is probed on its own first, so a crowded name bucket can
+    never push it out of the capped candidate list.
+    """
+    lead.email_key = canonical_email(lead.email)
+    lead.name_key = name_key(lead.first_name, lead.last_name)
+
+    for model in LEAD_MODELS:
+        match = (
+            await db.execute(
+                select(model.id, model.canonical_lead_id).where(model.email_key == lead.email_key).limit(1)
+            )
+        ).first()
+        if match is not None:
+            lead.canonical_lead_id = match.canonical_lead_id or match.id
+            return
+    if lead.name_key is None:
+        return
+
+    candidates = []
+    for model in LEAD_MODELS:
+        # Served in order by the (name_key, created_at) index: no sort of the bucket.
+        result = await db.execute(
+            select(model.id, model.first_name, model.canonical_lead_id, model.created_at)
+            .where(model.name_key == lead.name_key)
+            .order_by(model.created_at)
+            .limit(MAX_CANDIDATES)
+        )
+        candidates += result.all()
+    # Sharded sessions concatenate per-shard results, so restore the order.
+    for candidate in sorted(candidates, key=attrgetter("created_at")):
+        if _similar_first_names(lead.first_name, candidate.first_name):
+            lead.canonical_lead_id = candidate.canonical_lead_id or candidate.id
+            return
+
+
+async def get_duplicate_ids(db: AsyncSession, lead: Lead | LeadArchive) -> list[str]:
+    """IDs of the other leads in ``lead``'s duplicate group, oldest first.
+
+    Archived leads stay in their group, so both tables are searched.
+    """
+    root = lead.canonical_lead_id or lead.id
+    rows = []
+    for model in LEAD_MODELS:
+        result = await db.execute(
+            select(model.id, model.created_at).where(
+                or_(model.id == root, model.canonical_lead_id == root), model.id != lead.id
+            )
+        )
+        rows += result.all()
+    return [row.id for row in sorted(rows, key=attrgetter("created_at"))]
+
+
+class _DisjointSet:
+    def __init__(self) -> None:
+        self.parent: dict[str, str] = {}
+
+    def find(self, item: str) -> str:
+        root = self.parent.setdefault(item, item)
+        while root != self.parent[root]:
+            root = self.parent[root]
+        while item != root:  # path compression
+            self.parent[item], item = root, self.parent[item]
+        return root
+
+    def union(self, a: str, b: str, rank: dict[str, tuple]) -> None:
+        root_a, root_b = self.find(a), self.find(b)
+        if root_a == root_b:
+            return
+        # Keep the oldest lead as the root so it becomes the canonical one.
+        if rank[root_b] < rank[root_a]:
+            root_a, root_b = root_b, root_a
+        self.parent[root_b] = root_a
+
+
+def _link(row, other, sets: _DisjointSet, rank: dict) -> None:
+    rank.setdefault(row.id, (row.created_at, row.id))
+    rank.setdefault(other.id, (other.created_at, other.id))
+    sets.union(row.id, other.id, rank)
+
+
+def _link_sorted_runs(rows: Iterable, key: str, sets: _DisjointSet, rank: dict) -> None:
+    """Union neighbours in ``rows`` (sorted by ``key``) that share its value."""
+    previous = None
+    for row in rows:
+        value = getattr(row, key)
+        if previous is not None and value is not None and value == getattr(previous, key):
+            _link(row, previous, sets, rank)
+        previous = row
+
+
+def _link_similar_names(rows: list, sets: _DisjointSet, rank: dict) -> None:
+    """Union each row with the oldest earlier row whose first name is similar.
+
+    ``rows`` share a name key. This is the rule ``assign_keys_and_link``
+    applies on submission, including its cap on candidates, so the batch job
+    reproduces the links made online instead of rearranging them.
+    """
+    rows.sort(key=lambda row: (row.created_at, row.id))
+    for i, row in enumerate(rows):
+        for candidate in rows[: min(i, MAX_CANDIDATES)]:
+            if _similar_first_names(row.first_name, candidate.first_name):
+                _link(row, candidate, sets, rank)
+                break
+
+
+async def backfill_keys(db: AsyncSession, batch_size: int = BATCH_SIZE) -> int:
+    """Compute blocking keys for leads, archived or not, created before they existed."""
+    updated = 0
+    for model in LEAD_MODELS:
+        while True:
+            result = await db.execute(
+                select(model.id, model.email, model.first_name, model.last_name)
+                .where(model.email_key.is_(None))
+                .limit(batch_size)
+            )
+            rows = result.all()
+            if not rows:
+                break
+            await db.execute(
+                _UPDATE_KEYS[model],
+                [
+                    {
+                        "b_id": row.id,
+                        "b_email_key": canonical_email(row.email),
+                        "b_name_key": name_key(row.first_name, row.last_name),
+                    }
+                    for row in rows
+                ],
+            )
+            await db.commit()
+            updated += len(rows)
+    return updated
+
+
+async def _rows_by_key(db: AsyncSession, key: str, compare, value: str, limit: int | None = None) -> list:
+    """Rows of both lead tables where ``compare(<key column>, value)`` holds.
+
+    With ``limit``, each table contributes its first ``limit`` rows in key order.
+    """
+    rows = []
+    for model in LEAD_MODELS:
+        column = getattr(model, key)
+        query = select(model.id, model.first_name, model.email_key, model.name_key, model.created_at).where(
+            compare(column, value)
+        )
+        if limit is not None:
+            query = query.order_by(column).limit(limit)
+        rows += (await db.execute(query)).all()
+    return rows
+
+
+async def _key_groups(db: AsyncSession, key: str, batch_size: int) -> AsyncIterator[list]:
+    """Yield each set of two or more leads sharing a value of the ``key`` column.
+
+    Leads are read from both tables in pages of about ``batch_size`` in key
+    order. A group cut off at the end of a page is instead fetched whole by
+    an index lookup on its key, so every group is seen complete exactly once.
+    """
+    get_key = attrgetter(key)
+    last = ""
+    while True:
+        page = await _rows_by_key(db, key, operator.gt, last, batch_size)
+        page = first_page(page, get_key, batch_size)
+        if not page:
+            return
+        if len(page) == batch_size:
+            boundary = get_key(page[-1])
+            page = [row for row in page if get_key(row) != boundary]
+            page += await _rows_by_key(db, key, operator.eq, boundary)
+        last = get_key(page[-1])
+        groups: dict[str, list] = {}
+        for row in page:
+            groups.setdefault(get_key(row), []).append(row)
+        for group in groups.values():
+            if len(group) > 1:
+                yield group
+
+
+async def _relink(
+    db: AsyncSession, model: type[Lead] | type[LeadArchive], sets: _DisjointSet, batch_size: int
+) -> int:
+    """Point every row of ``model`` at its group's root; return how many changed."""
+    changed = 0
+    last_id = ""
+    while True:
+        rows = (
+            await db.execute(
+                select(model.id, model.canonical_lead_id)
+                .where(model.id > last_id)
+                .order_by(model.id)
+                .limit(batch_size)
+            )
+        ).all()
+        rows = first_page(rows, attrgetter("id"), batch_size)
+        if not rows:
+            return changed
+        last_id = rows[-1].id
+        changes = []
+        for row in rows:
+            root = sets.find(row.id) if row.id in sets.parent else row.id
+            target = None if root == row.id else root
+            if target != row.canonical_lead_id:
+                changes.append({"b_id": row.id, "b_canonical": target})
+        if changes:
+            await db.execute(_UPDATE_CANONICAL[model], changes)
+        await db.commit()
+        changed += len(changes)
+
+
+async def dedupe_existing(db: AsyncSession, batch_size: int = BATCH_SIZE) -> int:
+    """Group all existing leads, archived ones included, into duplicate sets and relink them.
+
+    Sorted-neighbourhood blocking: one ordered pass per key (served by its
+    index) links matches into a disjoint-set forest. Within a name key each
+    lead is compared with at most ``MAX_CANDIDATES`` older ones, as on
+    submission, so the whole job is O(n log n). Leads are read ``batch_size`` at a time, and only
+    leads that have a duplicate enter the forest, so memory grows with the
+    number of duplicates rather than the table. Returns the number of leads
+    whose link changed.
+    """
+    await backfill_keys(db, batch_size)
+
+    sets = _DisjointSet()
+    rank: dict[str, tuple] = {}
+    async for group in _key_groups(db, "email_key", batch_size):
+        _link_sorted_runs(group, "email_key", sets, rank)
+    async for group in _key_groups(db, "name_key", batch_size):
+        _link_similar_names(group, sets, rank)
+
+    changed = 0
+    for model in LEAD_MODELS:
+        changed += await _relink(db, model, sets, batch_size)
+    return changed
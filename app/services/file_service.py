@@ -1,15 +1,24 @@
 import os
 import uuid
+from typing import NamedTuple
 
 from fastapi import HTTPException, UploadFile, status
+from starlette.concurrency import run_in_threadpool
 
 from app.core.config import settings
+from app.services.resume_storage import ResumeTooLarge, resolve_codec, store_resume
 
 ALLOWED_EXTENSIONS = {".pdf", ".doc", ".docx"}
 MAX_FILE_SIZE = 10 * 1024 * 1024  # 10 MB
 
 
-async def save_resume(file: UploadFile) -> str:
+class StoredResume(NamedTuple):
+    path: str
+    codec: str | None  # None: stored raw
+    size: int  # original size in bytes
+
+
+async def save_resume(file: UploadFile) -> StoredResume:
     if not file.filename:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST, detail="No filename provided"
@@ -22,16 +31,18 @@ async def save_resume(file: UploadFile) -> str:
             detail=f"File type '{ext}' not allowed. Accepted: {', '.join(sorted(ALLOWED_EXTENSIONS))}",
         )
 
-    content = await file.read()
-    if len(content) > MAX_FILE_SIZE:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"File exceeds maximum size of {MAX_FILE_SIZE // (1024 * 1024)} MB",
-        )
-
     safe_name = f"{uuid.uuid4()}{ext}"
     relative_path = os.path.join(settings.UPLOAD_DIR, safe_name)
-    with open(relative_path, "wb") as f:
-        f.write(content)
-
-    return relative_path
+    # Chunked copy (and compression) of the spooled upload, off the event loop.
+    try:
+        stored = await run_in_threadpool(
+            store_resume,
+            file.file,
+            relative_path,
+            resolve_codec(settings.RESUME_COMPRESSION),
+            settings.RESUME_COMPRESSION_MIN_SAVING,
+            MAX_FILE_SIZE,
+        )
+    except ResumeTooLarge as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from None
+    return StoredResume(*stored)
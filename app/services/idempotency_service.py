@@ -0,0 +1,121 @@
+import asyncio
+import hashlib
+import json
+from collections.abc import Awaitable, Callable
+from datetime import timedelta
+from typing import Any
+
+from fastapi import HTTPException, UploadFile
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy import delete
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.models.base import utcnow
+from app.models.idempotency import IdempotencyKey
+
+# Requests currently doing the work for a key in this process, with their
+# fingerprint. Concurrent duplicates await the same future instead of
+# repeating the side effects.
+_in_flight: dict[str, tuple[asyncio.Future, str | None]] = {}
+
+_CHUNK_SIZE = 64 * 1024
+
+
+async def request_fingerprint(fields: dict[str, str], upload: UploadFile | None = None) -> str:
+    """SHA-256 over the form ``fields`` and the uploaded file's name and bytes.
+
+    The upload is rewound afterwards so the request handler can read it again.
+    """
+    digest = hashlib.sha256(json.dumps(fields, sort_keys=True).encode())
+    if upload is not None:
+        digest.update(b"\0" + (upload.filename or "").encode() + b"\0")
+        while chunk := await upload.read(_CHUNK_SIZE):
+            digest.update(chunk)
+        await upload.seek(0)
+    return digest.hexdigest()
+
+
+def _check_fingerprint(stored: str | None, fingerprint: str | None) -> None:
+    if stored is not None and fingerprint is not None and stored != fingerprint:
+        raise HTTPException(
+            status_code=422,
+            detail="Idempotency-Key was already used for a different request",
+        )
+
+
+async def get_stored_response(db: AsyncSession, key: str, fingerprint: str | None = None) -> dict | None:
+    """The stored response for ``key``, or None if there is none or it expired.
+
+    Raises 422 when the key was stored for a request with another fingerprint.
+    """
+    record = await db.get(IdempotencyKey, key)
+    if record is None or record.expires_at <= utcnow():
+        return None
+    _check_fingerprint(record.request_fingerprint, fingerprint)
+    return json.loads(record.response_body)
+
+
+async def run_once(
+    db: AsyncSession,
+    key: str,
+    operation: Callable[[], Awaitable[Any]],
+    fingerprint: str | None = None,
+) -> tuple[Any, bool]:
+    """Run ``operation`` at most once per ``key`` within the TTL.
+
+    Returns ``(response, replayed)``: the operation's own result on the first
+    run, or its stored JSON-decoded form on a replay. The first request for a key does
+    the work and commits it together with the stored response, so a retry
+    can never observe the lead without its key; duplicates arriving while it
+    runs share its outcome, and later retries replay the stored body.
+
+    ``fingerprint`` identifies the request (see ``request_fingerprint()``);
+    reusing a key for a request with a different fingerprint is rejected
+    with 422 rather than answered with another request's response.
+    """
+    stored = await get_stored_response(db, key, fingerprint)
+    if stored is not None:
+        return stored, True
+
+    pending = _in_flight.get(key)
+    if pending is not None:
+        future, in_flight_fingerprint = pending
+        _check_fingerprint(in_flight_fingerprint, fingerprint)
+        return await asyncio.shield(future), True
+
+    future = asyncio.get_running_loop().create_future()
+    _in_flight[key] = (future, fingerprint)
+    try:
+        body = await operation()
+        await db.execute(delete(IdempotencyKey).where(IdempotencyKey.expires_at <= utcnow()))
+        await db.merge(
+            IdempotencyKey(
+                key=key,
+                response_body=json.dumps(jsonable_encoder(body)),
+                request_fingerprint=fingerprint,
+                expires_at=utcnow() + timedelta(hours=settings.IDEMPOTENCY_TTL_HOURS),
+            )
+        )
+        try:
+            await db.commit()
+        except IntegrityError:
+            # Another worker process committed the same key first.
+            await db.rollback()
+            stored = await get_stored_response(db, key, fingerprint)
+            if stored is None:
+                raise
+            future.set_result(stored)
+            return stored, True
+        future.set_result(body)
+        return body, False
+    except asyncio.CancelledError:
+        future.cancel()
+        raise
+    except BaseException as exc:
+        future.set_exception(exc)
+        future.exception()  # mark retrieved when no duplicate is waiting
+        raise
+    finally:
+        del _in_flight[key]
@@ -1,11 +1,19 @@
+import heapq
+from datetime import datetime, timedelta, timezone
+from operator import attrgetter
+
 from fastapi import HTTPException, UploadFile, status
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.config import settings
-from app.models.lead import Lead, LeadState
+from app.core.database import scatter
+from app.models.lead import Lead, LeadArchive, LeadState
+from app.services.dedupe_service import assign_keys_and_link
 from app.services.email_service import EmailService
 from app.services.file_service import save_resume
+from app.services.resume_text_service import schedule_extraction
+from app.services.webhook_service import LEAD_CREATED, LEAD_STATE_CHANGED, emit_event
 
 
 async def create_lead(
@@ -16,17 +24,22 @@ async def create_lead(
     email: str,
     resume: UploadFile,
 ) -> Lead:
-    resume_path = await save_resume(resume)
+    stored = await save_resume(resume)
 
     lead = Lead(
         first_name=first_name,
         last_name=last_name,
         email=email,
-        resume_path=resume_path,
+        resume_path=stored.path,
+        resume_codec=stored.codec,
+        resume_size=stored.size,
     )
+    await assign_keys_and_link(db, lead)
     db.add(lead)
     await db.flush()
     await db.refresh(lead)
+    schedule_extraction(db, lead)
+    emit_event(db, LEAD_CREATED, lead)
 
     # Notify the prospect
     await email_service.send_email(
@@ -44,13 +57,41 @@ async def create_lead(
     return lead
 
 
-async def list_leads(db: AsyncSession) -> list[Lead]:
-    result = await db.execute(select(Lead).order_by(Lead.created_at.desc()))
+async def _select_leads(
+    db: AsyncSession, model: type[Lead] | type[LeadArchive], updated_since: datetime | None
+) -> list:
+    query = select(model).order_by(model.created_at.desc())
+    if updated_since is not None:
+        # Timestamps are stored as naive UTC. SQLite's CURRENT_TIMESTAMP has
+        # whole-second precision and compares as text, so match at second
+        # granularity: rows stamped in the same second are never dropped.
+        if updated_since.tzinfo is not None:
+            updated_since = updated_since.astimezone(timezone.utc).replace(tzinfo=None)
+        since = updated_since.replace(microsecond=0) - timedelta(microseconds=1)
+        query = query.where(model.updated_at > since)
+    result = await db.execute(query)
     return list(result.scalars().all())
 
 
-async def get_lead(db: AsyncSession, lead_id: str) -> Lead:
-    lead = await db.get(Lead, lead_id)
+async def list_leads(
+    db: AsyncSession,
+    updated_since: datetime | None = None,
+    include_archived: bool = False,
+) -> list[Lead | LeadArchive]:
+    models = (Lead, LeadArchive) if include_archived else (Lead,)
+
+    async def select_shard(session: AsyncSession) -> list[list]:
+        return [await _select_leads(session, model, updated_since) for model in models]
+
+    # One newest-first list per table per shard; k-way merge instead of re-sorting.
+    parts = [part for shard in await scatter(db, select_shard) for part in shard]
+    if len(parts) == 1:
+        return parts[0]
+    return list(heapq.merge(*parts, key=attrgetter("created_at"), reverse=True))
+
+
+async def get_lead(db: AsyncSession, lead_id: str) -> Lead | LeadArchive:
+    lead = await db.get(Lead, lead_id) or await db.get(LeadArchive, lead_id)
     if not lead:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Lead not found"
@@ -69,7 +110,12 @@ async def update_lead_state(
             detail="Can only transition from PENDING to REACHED_OUT",
         )
 
+    previous_state = lead.state
     lead.state = new_state
+    # Reaching out finishes the work; release any claim on the lead.
+    lead.claimed_by = None
+    lead.lease_expires_at = None
     await db.flush()
     await db.refresh(lead)
+    emit_event(db, LEAD_STATE_CHANGED, lead, previous_state=previous_state.value)
     return lead
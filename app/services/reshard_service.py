@@ -0,0 +1,76 @@
+"""Redistribute lead rows when the number of SQLite shards changes."""
+
+from sqlalchemy import delete, insert, select
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+
+from app.core.database import ensure_schema, shard_for, shard_urls
+from app.models.lead import Lead, LeadArchive
+from app.models.resume_text import LeadResumeText
+
+# (table, column holding the lead id that decides the shard); each table is
+# keyed by that column, so it also drives the keyset pagination.
+SHARDED_TABLES = (
+    (Lead.__table__, Lead.__table__.c.id),
+    (LeadArchive.__table__, LeadArchive.__table__.c.id),
+    (LeadResumeText.__table__, LeadResumeText.__table__.c.lead_id),
+)
+BATCH_SIZE = 5_000
+
+
+async def _move_table(
+    source_index: int,
+    engines: list[AsyncEngine],
+    to_count: int,
+    table,
+    key,
+    batch_size: int,
+) -> int:
+    source = engines[source_index]
+    moved = 0
+    last_key = ""
+    while True:
+        async with source.connect() as conn:
+            rows = (
+                await conn.execute(select(table).where(key > last_key).order_by(key).limit(batch_size))
+            ).mappings().all()
+        if not rows:
+            return moved
+        last_key = rows[-1][key.name]
+
+        by_target: dict[int, list[dict]] = {}
+        for row in rows:
+            target = shard_for(row[key.name], to_count)
+            if target != source_index:
+                by_target.setdefault(target, []).append(dict(row))
+        for target, batch in by_target.items():
+            # Copy first, delete second: an interrupted run leaves duplicates,
+            # never losses, and OR REPLACE makes the rerun converge.
+            async with engines[target].begin() as conn:
+                await conn.execute(insert(table).prefix_with("OR REPLACE"), batch)
+            async with source.begin() as conn:
+                await conn.execute(delete(table).where(key.in_([row[key.name] for row in batch])))
+            moved += len(batch)
+
+
+async def reshard(
+    database_url: str, from_count: int, to_count: int, batch_size: int = BATCH_SIZE
+) -> int:
+    """Move every lead-owned row from a ``from_count`` to a ``to_count`` layout.
+
+    Rows already on their target shard are left alone; shard 0 keeps the
+    global tables either way. Safe to rerun after an interruption. Returns
+    the number of rows moved. The service must be stopped while it runs.
+    """
+    urls = shard_urls(database_url, max(from_count, to_count))
+    engines = [create_async_engine(url) for url in urls]
+    try:
+        for engine in engines[:to_count]:
+            await ensure_schema(engine)
+        moved = 0
+        for source_index in range(from_count):
+            for table, key in SHARDED_TABLES:
+                moved += await _move_table(source_index, engines, to_count, table, key, batch_size)
+        return moved
+    finally:
+        for engine in engines:
+            await engine.dispose()
@@ -0,0 +1,181 @@
+"""On-disk resume codecs (standard library, plus ``zstandard`` when installed).
+
+A compressed resume keeps its original name with a codec suffix appended
+(``<uuid>.pdf.zst`` or ``<uuid>.pdf.gz``), so readers can tell the codec from
+the path alone. Files are written and read in chunks, through a dot-prefixed
+temporary file that the upload sweeper ignores. Like ``resume_text``, these
+functions also run in worker processes and must not touch app state.
+"""
+
+import os
+from collections.abc import Iterator
+from typing import BinaryIO
+
+CHUNK_SIZE = 1024 * 1024
+# Compression is tried on this much of a file before committing to it.
+SAMPLE_SIZE = 64 * 1024
+SUFFIXES = {"zstd": ".zst", "gzip": ".gz"}
+GZIP_LEVEL = 6
+ZSTD_LEVEL = 9
+
+
+class ResumeTooLarge(ValueError):
+    pass
+
+
+def zstd_available() -> bool:
+    try:
+        import zstandard  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def resolve_codec(codec: str) -> str | None:
+    """Map a configured codec to the one this install can write (None for raw)."""
+    if codec == "none":
+        return None
+    if codec == "zstd" and not zstd_available():
+        return "gzip"
+    return codec
+
+
+def codec_for_path(path: str) -> str | None:
+    for codec, suffix in SUFFIXES.items():
+        if path.endswith(suffix):
+            return codec
+    return None
+
+
+def original_name(path: str) -> str:
+    """``path`` without its codec suffix."""
+    codec = codec_for_path(path)
+    return path[: -len(SUFFIXES[codec])] if codec else path
+
+
+def _compressobj(codec: str):
+    if codec == "zstd":
+        import zstandard
+
+        return zstandard.ZstdCompressor(level=ZSTD_LEVEL).compressobj()
+    import zlib
+
+    return zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 31)
+
+
+def open_resume(path: str) -> BinaryIO:
+    """Open a stored resume for reading its original bytes."""
+    codec = codec_for_path(path)
+    if codec == "gzip":
+        import gzip
+
+        return gzip.open(path, "rb")
+    if codec == "zstd":
+        import zstandard
+
+        return zstandard.ZstdDecompressor().stream_reader(open(path, "rb"), closefd=True)
+    return open(path, "rb")
+
+
+def read_resume(path: str) -> bytes:
+    with open_resume(path) as f:
+        return f.read()
+
+
+def iter_resume(path: str, chunk_size: int = CHUNK_SIZE) -> Iterator[bytes]:
+    with open_resume(path) as f:
+        while chunk := f.read(chunk_size):
+            yield chunk
+
+
+def _write(src: BinaryIO, dest: str, codec: str | None, max_size: int | None) -> tuple[int, int]:
+    """Copy ``src`` to ``dest`` (compressed with ``codec``); return (original, stored) sizes."""
+    tmp = os.path.join(os.path.dirname(dest), f".{os.path.basename(dest)}.tmp")
+    compressor = _compressobj(codec) if codec else None
+    size = stored = 0
+    try:
+        with open(tmp, "wb") as out:
+            while chunk := src.read(CHUNK_SIZE):
+                size += len(chunk)
+                if max_size is not None and size > max_size:
+                    raise ResumeTooLarge(f"File exceeds maximum size of {max_size // (1024 * 1024)} MB")
+                if compressor is not None:
+                    chunk = compressor.compress(chunk)
+                out.write(chunk)
+                stored += len(chunk)
+            if compressor is not None:
+                tail = compressor.flush()
+                out.write(tail)
+                stored += len(tail)
+        os.replace(tmp, dest)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+    return size, stored
+
+
+def _worth_it(size: int, stored: int, min_saving: float) -> bool:
+    return stored <= size * (1 - min_saving)
+
+
+def _sample_worth_it(src: BinaryIO, codec: str, min_saving: float) -> bool:
+    """Whether the first ``SAMPLE_SIZE`` bytes of ``src`` compress well enough.
+
+    Already-compressed formats (most PDFs, DOCX zips) show it in their first
+    bytes, so they are written once, raw, instead of compressed in full and
+    then written again. ``src`` is left rewound.
+    """
+    sample = src.read(SAMPLE_SIZE)
+    src.seek(0)
+    if not sample:
+        return False
+    compressor = _compressobj(codec)
+    return _worth_it(len(sample), len(compressor.compress(sample)) + len(compressor.flush()), min_saving)
+
+
+def store_resume(
+    src: BinaryIO,
+    path: str,
+    codec: str | None,
+    min_saving: float = 0.1,
+    max_size: int | None = None,
+) -> tuple[str, str | None, int]:
+    """Write ``src`` to ``path``, or to ``path`` + codec suffix if that saves enough.
+
+    Returns ``(stored_path, codec or None, original_size)``. When compression
+    saves less than ``min_saving`` on a sample of the file (already-compressed
+    PDFs and DOCX zips), ``src`` is stored raw without compressing the rest;
+    if the whole file turns out not to save enough it is rewritten raw.
+    """
+    src.seek(0)
+    if codec is not None and _sample_worth_it(src, codec, min_saving):
+        compressed = path + SUFFIXES[codec]
+        size, stored = _write(src, compressed, codec, max_size)
+        if _worth_it(size, stored, min_saving):
+            return compressed, codec, size
+        os.remove(compressed)
+        src.seek(0)
+    size, _stored = _write(src, path, None, max_size)
+    return path, None, size
+
+
+def compress_existing(path: str, codec: str, min_saving: float = 0.1) -> tuple[str | None, int] | None:
+    """Compress a raw stored resume next to itself.
+
+    Returns ``(compressed_path, original_size)``, with ``None`` as the path
+    when compression did not save enough, or ``None`` if the file is missing.
+    The raw file is left in place for the caller to remove.
+    """
+    try:
+        with open(path, "rb") as src:
+            if not _sample_worth_it(src, codec, min_saving):
+                return None, os.fstat(src.fileno()).st_size
+            compressed = path + SUFFIXES[codec]
+            size, stored = _write(src, compressed, codec, None)
+    except FileNotFoundError:
+        return None
+    if _worth_it(size, stored, min_saving):
+        return compressed, size
+    os.remove(compressed)
+    return None, size
@@ -0,0 +1,211 @@
+import asyncio
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from operator import attrgetter
+
+from fastapi import HTTPException, status
+from sqlalchemy import bindparam, select, update
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.config import settings
+from app.core.database import async_session, first_page
+from app.models.lead import Lead, LeadArchive
+from app.services.lead_service import get_lead
+from app.services.resume_storage import compress_existing, original_name, read_resume
+
+BATCH_SIZE = 500
+REPORT_SAMPLE = 200
+REPORT_PAGE_SIZE = 10_000
+
+MEDIA_TYPES = {
+    ".pdf": "application/pdf",
+    ".doc": "application/msword",
+    ".docx": "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+}
+
+
+def _storage_update(table):
+    # Keyed by the old path: synthetic leads can share one file. Assigning
+    # updated_at to itself keeps a storage change from looking like a lead edit.
+    return (
+        update(table)
+        .where(table.c.resume_path == bindparam("b_old"))
+        .values(
+            resume_path=bindparam("b_new"),
+            resume_codec=bindparam("b_codec"),
+            resume_size=bindparam("b_size"),
+            updated_at=table.c.updated_at,
+        )
+    )
+
+
+_UPDATES = [_storage_update(Lead.__table__), _storage_update(LeadArchive.__table__)]
+
+
+@dataclass
+class ResumeDownload:
+    path: str
+    filename: str
+    media_type: str
+    size: int
+
+
+async def get_resume_download(db: AsyncSession, lead_id: str) -> ResumeDownload:
+    lead = await get_lead(db, lead_id)
+    if not lead.resume_path or not os.path.exists(lead.resume_path):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Resume not found")
+    name = os.path.basename(original_name(lead.resume_path))
+    ext = os.path.splitext(name)[1].lower()
+    return ResumeDownload(
+        path=lead.resume_path,
+        filename=name,
+        media_type=MEDIA_TYPES.get(ext, "application/octet-stream"),
+        # Compressed files always record their original size; raw ones are as stored.
+        size=lead.resume_size if lead.resume_size is not None else os.path.getsize(lead.resume_path),
+    )
+
+
+@dataclass
+class CompressionResult:
+    examined: int = 0
+    compressed: int = 0
+    bytes_before: int = 0
+    bytes_after: int = 0
+
+
+async def compress_existing_resumes(
+    session_factory: async_sessionmaker[AsyncSession] = async_session,
+    codec: str = "gzip",
+    workers: int | None = None,
+    batch_size: int = BATCH_SIZE,
+    min_saving: float | None = None,
+) -> CompressionResult:
+    """Compress every stored resume that has not been examined yet.
+
+    Each batch of files is compressed in parallel worker processes. A batch's
+    rows are updated in one transaction, and only then are the raw files
+    removed, so an interruption leaves at worst a redundant file for the
+    upload sweeper. Safe to rerun.
+    """
+    min_saving = settings.RESUME_COMPRESSION_MIN_SAVING if min_saving is None else min_saving
+    result = CompressionResult()
+    loop = asyncio.get_running_loop()
+    with ProcessPoolExecutor(
+        max_workers=workers or os.cpu_count(), mp_context=multiprocessing.get_context("spawn")
+    ) as pool:
+        for model in (Lead, LeadArchive):
+            last_id = ""
+            while True:
+                async with session_factory() as db:
+                    rows = (
+                        await db.execute(
+                            select(model.id, model.resume_path)
+                            .where(
+                                model.id > last_id,
+                                model.resume_path.is_not(None),
+                                model.resume_size.is_(None),
+                            )
+                            .order_by(model.id)
+                            .limit(batch_size)
+                        )
+                    ).all()
+                rows = first_page(rows, attrgetter("id"), batch_size)
+                if not rows:
+                    break
+                last_id = rows[-1].id
+
+                paths = list(dict.fromkeys(row.resume_path for row in rows))
+                outcomes = await asyncio.gather(
+                    *(loop.run_in_executor(pool, compress_existing, p, codec, min_saving) for p in paths)
+                )
+                changes, replaced = [], []
+                for old, outcome in zip(paths, outcomes):
+                    if outcome is None:
+                        continue  # missing file; reported by sweep_uploads --missing
+                    new, size = outcome
+                    result.examined += 1
+                    result.bytes_before += size
+                    if new is None:
+                        changes.append({"b_old": old, "b_new": old, "b_codec": None, "b_size": size})
+                        result.bytes_after += size
+                    else:
+                        changes.append({"b_old": old, "b_new": new, "b_codec": codec, "b_size": size})
+                        replaced.append(old)
+                        result.compressed += 1
+                        result.bytes_after += os.path.getsize(new)
+                if changes:
+                    async with session_factory() as db:
+                        for statement in _UPDATES:
+                            await db.execute(statement, changes)
+                        await db.commit()
+                for old in replaced:
+                    os.remove(old)
+    return result
+
+
+def _timed_reads(paths: list[str]) -> tuple[int, float, float]:
+    """Bytes read, seconds to read the stored files, seconds to read them decoded."""
+    total = 0
+    start = time.perf_counter()
+    for path in paths:
+        with open(path, "rb") as f:
+            f.read()
+    stored = time.perf_counter() - start
+    start = time.perf_counter()
+    for path in paths:
+        total += len(read_resume(path))
+    return total, stored, time.perf_counter() - start
+
+
+async def storage_report(
+    session_factory: async_sessionmaker[AsyncSession] = async_session,
+    sample: int = REPORT_SAMPLE,
+) -> dict:
+    """Space saved by compression and the cost of decompressing on read."""
+    files = compressed = original = on_disk = 0
+    sampled: list[str] = []
+    for model in (Lead, LeadArchive):
+        last_id = ""
+        while True:
+            async with session_factory() as db:
+                rows = (
+                    await db.execute(
+                        select(model.id, model.resume_path, model.resume_codec, model.resume_size)
+                        .where(model.id > last_id, model.resume_size.is_not(None))
+                        .order_by(model.id)
+                        .limit(REPORT_PAGE_SIZE)
+                    )
+                ).all()
+            rows = first_page(rows, attrgetter("id"), REPORT_PAGE_SIZE)
+            if not rows:
+                break
+            last_id = rows[-1].id
+            for row in rows:
+                stored = row.resume_size
+                if row.resume_codec is not None:
+                    try:
+                        stored = os.path.getsize(row.resume_path)
+                    except FileNotFoundError:
+                        continue
+                    compressed += 1
+                    if len(sampled) < sample:
+                        sampled.append(row.resume_path)
+                files += 1
+                original += row.resume_size
+                on_disk += stored
+
+    read_bytes, stored_s, decoded_s = await asyncio.to_thread(_timed_reads, sampled)
+    return {
+        "files": files,
+        "compressed_files": compressed,
+        "original_bytes": original,
+        "stored_bytes": on_disk,
+        "saved_bytes": original - on_disk,
+        "saved_pct": round(100 * (original - on_disk) / original, 1) if original else 0.0,
+        "read_sample_files": len(sampled),
+        "read_ms_per_mb_stored": round(stored_s * 1000 / (read_bytes / 2**20), 3) if read_bytes else 0.0,
+        "read_ms_per_mb_decompressed": round(decoded_s * 1000 / (read_bytes / 2**20), 3) if read_bytes else 0.0,
+    }
@@ -0,0 +1,115 @@
+"""Plain-text extraction for uploaded resumes (standard library only).
+
+These functions run inside worker processes of the extraction pipeline, so
+they must stay importable top-level functions with no app state.
+"""
+
+import io
+import os
+import re
+import zipfile
+import zlib
+from xml.etree import ElementTree
+
+from app.services.resume_storage import original_name, read_resume
+
+MAX_TEXT_LENGTH = 1_000_000
+
+_WORD_NS = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+_PDF_STREAM = re.compile(rb"<<(.*?)>>\s*stream\r?\n(.*?)\r?\nendstream", re.DOTALL)
+_PDF_TEXT_OP = re.compile(rb"\[((?:[^\]\\]|\\.)*)\]\s*TJ|\(((?:[^)\\]|\\.)*)\)\s*(?:Tj|'|\")|(T\*|Td|TD|ET)")
+_PDF_STRING = re.compile(rb"\(((?:[^)\\]|\\.)*)\)")
+_PDF_ESCAPES = {b"n": b"\n", b"r": b"\r", b"t": b"\t", b"b": b"\b", b"f": b"\f"}
+_DOC_UTF16_RUN = re.compile(rb"(?:[\x20-\x7e\r\t]\x00){4,}")
+_DOC_ASCII_RUN = re.compile(rb"[\x20-\x7e\r\t]{4,}")
+
+
+def _normalize(text: str) -> str:
+    lines = (" ".join(line.split()) for line in text.splitlines())
+    return "\n".join(line for line in lines if line)[:MAX_TEXT_LENGTH]
+
+
+def extract_docx(data: bytes) -> str:
+    with zipfile.ZipFile(io.BytesIO(data)) as archive:
+        xml = archive.read("word/document.xml")
+    parts = []
+    for _, element in ElementTree.iterparse(io.BytesIO(xml), events=("end",)):
+        if element.tag == f"{_WORD_NS}t" and element.text:
+            parts.append(element.text)
+        elif element.tag == f"{_WORD_NS}tab":
+            parts.append("\t")
+        elif element.tag in (f"{_WORD_NS}p", f"{_WORD_NS}br"):
+            parts.append("\n")
+    return "".join(parts)
+
+
+def _pdf_unescape(raw: bytes) -> bytes:
+    out = bytearray()
+    i = 0
+    while i < len(raw):
+        ch = raw[i : i + 1]
+        if ch != b"\\":
+            out += ch
+            i += 1
+            continue
+        nxt = raw[i + 1 : i + 2]
+        if nxt in _PDF_ESCAPES:
+            out += _PDF_ESCAPES[nxt]
+            i += 2
+        elif nxt.isdigit():
+            octal = re.match(rb"[0-7]{1,3}", raw[i + 1 : i + 4]).group()
+            out.append(int(octal, 8) & 0xFF)
+            i += 1 + len(octal)
+        elif nxt in (b"\r", b"\n"):
+            i += 2
+        else:
+            out += nxt
+            i += 2
+    return bytes(out)
+
+
+def _pdf_decode(raw: bytes) -> str:
+    data = _pdf_unescape(raw)
+    if data.startswith(b"\xfe\xff"):
+        return data[2:].decode("utf-16-be", errors="ignore")
+    return data.decode("latin-1")
+
+
+def extract_pdf(data: bytes) -> str:
+    """Text from the content streams' show-text operators (Tj, TJ, ', ")."""
+    parts = []
+    for header, body in _PDF_STREAM.findall(data):
+        if b"FlateDecode" in header:
+            try:
+                body = zlib.decompress(body)
+            except zlib.error:
+                continue
+        elif b"/Filter" in header:
+            continue  # images and other encodings carry no text
+        for array, string, newline in _PDF_TEXT_OP.findall(body):
+            if newline:
+                parts.append("\n")
+            elif array:
+                parts.append("".join(_pdf_decode(s) for s in _PDF_STRING.findall(array)))
+            else:
+                parts.append(_pdf_decode(string))
+    return "".join(parts)
+
+
+def extract_doc(data: bytes) -> str:
+    """Best-effort text from legacy binary Word files: the longest printable runs."""
+    utf16 = [run.decode("utf-16-le") for run in _DOC_UTF16_RUN.findall(data)]
+    if sum(map(len, utf16)) >= 20:
+        return "\n".join(utf16)
+    return "\n".join(run.decode("ascii") for run in _DOC_ASCII_RUN.findall(data))
+
+
+EXTRACTORS = {".pdf": extract_pdf, ".docx": extract_docx, ".doc": extract_doc}
+
+
+def extract_text(path: str) -> str:
+    ext = os.path.splitext(original_name(path))[1].lower()
+    extractor = EXTRACTORS.get(ext)
+    if extractor is None:
+        raise ValueError(f"Unsupported resume type '{ext}'")
+    return _normalize(extractor(read_resume(path)))
@@ -0,0 +1,280 @@
+import asyncio
+import logging
+import multiprocessing
+import os
+import signal
+from collections.abc import Callable
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from operator import attrgetter
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.config import settings
+from app.core.database import async_session, first_page, on_commit
+from app.models.lead import Lead, LeadArchive
+from app.models.resume_text import LeadResumeText, ResumeTextStatus
+from app.services.resume_text import extract_text
+
+logger = logging.getLogger(__name__)
+
+
+def _report_pid(pids) -> None:
+    # Pool initializer: tell the parent which processes to kill on a restart.
+    pids.put(os.getpid())
+
+
+class ResumeTextPipeline:
+    """Extracts resume text in a process pool, fed by a bounded in-memory queue.
+
+    Parsing is CPU-bound, so it runs in worker processes rather than on the
+    event loop. Leads submitted in this process are queued directly. Every
+    ``poll_interval`` seconds PENDING rows are also picked up from the
+    database: leads submitted by processes that run no pipeline, and jobs
+    that did not fit in the queue.
+    """
+
+    def __init__(
+        self,
+        workers: int | None = None,
+        queue_size: int | None = None,
+        timeout: float | None = None,
+        session_factory: async_sessionmaker[AsyncSession] = async_session,
+        extractor: Callable[[str], str] = extract_text,
+        poll_interval: float | None = None,
+    ):
+        self.workers = workers or settings.RESUME_EXTRACT_WORKERS
+        self.queue_size = queue_size or settings.RESUME_EXTRACT_QUEUE_SIZE
+        self.timeout = timeout or settings.RESUME_EXTRACT_TIMEOUT_SECONDS
+        self.session_factory = session_factory
+        self.extractor = extractor
+        self.poll_interval = settings.RESUME_EXTRACT_POLL_SECONDS if poll_interval is None else poll_interval
+        self._queue: asyncio.Queue | None = None
+        # Leads queued or being extracted, so polling does not queue them twice.
+        self._queued: set[str] = set()
+        self._pool: ProcessPoolExecutor | None = None
+        self._pids = None
+        self._warm: asyncio.Future | None = None
+        # Bumped on every pool restart, so jobs can tell whether the pool
+        # they ran on was replaced under them.
+        self._generation = 0
+        self._consumers: list[asyncio.Task] = []
+
+    @property
+    def running(self) -> bool:
+        return self._queue is not None
+
+    async def start(self) -> None:
+        self._queue = asyncio.Queue(maxsize=self.queue_size)
+        self._new_pool()
+        self._consumers = [asyncio.create_task(self._consume()) for _ in range(self.workers)]
+        if self.poll_interval > 0:
+            self._consumers.append(asyncio.create_task(self._poll()))
+
+    async def stop(self) -> None:
+        for task in self._consumers:
+            task.cancel()
+        await asyncio.gather(*self._consumers, return_exceptions=True)
+        self._consumers = []
+        if self._pool is not None:
+            # Workers still starting unpickle the pid queue; let them finish first.
+            await self._warm
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pids.close()
+        self._pool = self._pids = self._warm = None
+        self._queue = None
+        self._queued.clear()
+
+    def submit_nowait(self, lead_id: str, path: str) -> bool:
+        """Queue a job without waiting; returns False if not running or full."""
+        if self._queue is None:
+            return False
+        if lead_id in self._queued:
+            return True
+        try:
+            self._queue.put_nowait((lead_id, path))
+        except asyncio.QueueFull:
+            logger.warning("Resume extraction queue full; lead %s left PENDING", lead_id)
+            return False
+        self._queued.add(lead_id)
+        return True
+
+    async def submit(self, lead_id: str, path: str) -> None:
+        """Queue a job, waiting for room (used by the backfill)."""
+        self._queued.add(lead_id)
+        await self._queue.put((lead_id, path))
+
+    async def join(self) -> None:
+        await self._queue.join()
+
+    def _new_pool(self) -> None:
+        # Spawn rather than fork: the server process already runs threads
+        # (the aiosqlite driver), which fork does not copy safely.
+        context = multiprocessing.get_context("spawn")
+        self._pids = context.SimpleQueue()
+        self._pool = ProcessPoolExecutor(
+            max_workers=self.workers, mp_context=context, initializer=_report_pid, initargs=(self._pids,)
+        )
+        # Start every worker now; jobs wait for this before their timeout
+        # starts, so interpreter startup is never billed to a resume.
+        loop = asyncio.get_running_loop()
+        self._warm = asyncio.gather(
+            *(loop.run_in_executor(self._pool, os.getpid) for _ in range(self.workers)),
+            return_exceptions=True,
+        )
+
+    def _restart_pool(self, generation: int) -> None:
+        # A timed-out parse keeps its worker busy and executors cannot cancel
+        # a running call, so kill the workers and start a fresh pool. Jobs
+        # that were running beside it fail with BrokenProcessPool and are
+        # retried (see _extract), and a restart that another job already did
+        # is not repeated.
+        if generation != self._generation:
+            return
+        self._generation += 1
+        pool, pids = self._pool, self._pids
+        self._new_pool()
+        pool.shutdown(wait=False)
+        while not pids.empty():
+            try:
+                os.kill(pids.get(), signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+        pids.close()
+
+    async def _ready(self) -> int:
+        """Wait until the current pool's workers have started; return its generation."""
+        warm = None
+        while warm is not self._warm:
+            warm = self._warm
+            await asyncio.shield(warm)
+        return self._generation
+
+    async def _extract(self, path: str) -> tuple[ResumeTextStatus, str | None, str | None]:
+        loop = asyncio.get_running_loop()
+        while True:
+            generation = await self._ready()
+            try:
+                text = await asyncio.wait_for(
+                    loop.run_in_executor(self._pool, self.extractor, path), self.timeout
+                )
+            except (TimeoutError, BrokenProcessPool) as exc:
+                if generation != self._generation:
+                    continue  # the pool was restarted for another job; run this one again
+                self._restart_pool(generation)
+                if isinstance(exc, TimeoutError):
+                    return ResumeTextStatus.FAILED, None, f"Timed out after {self.timeout:g}s"
+                return ResumeTextStatus.FAILED, None, "Extraction worker crashed"
+            except Exception as exc:
+                # A malformed upload can make the parsers raise almost anything;
+                # record it on the row and keep the traceback in the log.
+                logger.warning("Resume text extraction failed for %s", path, exc_info=True)
+                return ResumeTextStatus.FAILED, None, f"{type(exc).__name__}: {exc}"[:500]
+            return ResumeTextStatus.DONE, text, None
+
+    async def _consume(self) -> None:
+        while True:
+            lead_id, path = await self._queue.get()
+            try:
+                status, text, error = await self._extract(path)
+                async with self.session_factory() as session:
+                    await session.merge(
+                        LeadResumeText(lead_id=lead_id, status=status, text=text, error=error)
+                    )
+                    await session.commit()
+            except Exception:
+                logger.exception("Failed to store resume text for lead %s", lead_id)
+            finally:
+                self._queued.discard(lead_id)
+                self._queue.task_done()
+
+    async def queue_pending(self) -> int:
+        """Queue PENDING extractions not queued here yet, as room allows; return how many."""
+        room = self._queue.maxsize - self._queue.qsize()
+        if room <= 0:
+            return 0
+        rows = []
+        async with self.session_factory() as session:
+            # Leads archived before their extraction ran still need it.
+            for model in (Lead, LeadArchive):
+                rows += (
+                    await session.execute(
+                        select(LeadResumeText.lead_id, model.resume_path)
+                        .join(model, model.id == LeadResumeText.lead_id)
+                        .where(LeadResumeText.status == ResumeTextStatus.PENDING, model.resume_path.is_not(None))
+                        .limit(room + len(self._queued))
+                    )
+                ).all()
+        queued = 0
+        for lead_id, path in rows:
+            if lead_id not in self._queued and not self._queue.full():
+                queued += self.submit_nowait(lead_id, path)
+        return queued
+
+    async def _poll(self) -> None:
+        while True:
+            await asyncio.sleep(self.poll_interval)
+            try:
+                await self.queue_pending()
+            except Exception:
+                logger.exception("Polling for pending resume extractions failed")
+
+
+pipeline = ResumeTextPipeline()
+
+
+def schedule_extraction(db: AsyncSession, lead: Lead) -> None:
+    """Record a PENDING extraction for ``lead`` and queue it once ``db`` commits."""
+    db.add(LeadResumeText(lead_id=lead.id, status=ResumeTextStatus.PENDING))
+    lead_id, path = lead.id, lead.resume_path
+
+    on_commit(db, lambda: pipeline.submit_nowait(lead_id, path))
+
+
+async def get_resume_text_status(db: AsyncSession, lead_id: str) -> ResumeTextStatus | None:
+    result = await db.execute(
+        select(LeadResumeText.status).where(LeadResumeText.lead_id == lead_id)
+    )
+    return result.scalar_one_or_none()
+
+
+async def backfill(
+    session_factory: async_sessionmaker[AsyncSession] = async_session,
+    retry_failed: bool = False,
+    batch_size: int = 1000,
+    runner: ResumeTextPipeline | None = None,
+) -> int:
+    """Extract text for every lead, archived or not, that has none yet (and failed ones if asked)."""
+    # The backfill queues PENDING rows itself; no need to poll for them.
+    runner = runner or ResumeTextPipeline(session_factory=session_factory, poll_interval=0)
+    statuses = [ResumeTextStatus.PENDING] + ([ResumeTextStatus.FAILED] if retry_failed else [])
+
+    await runner.start()
+    queued = 0
+    try:
+        for model in (Lead, LeadArchive):
+            missing = (
+                select(model.id, model.resume_path)
+                .outerjoin(LeadResumeText, LeadResumeText.lead_id == model.id)
+                .where(
+                    model.resume_path.is_not(None),
+                    (LeadResumeText.lead_id.is_(None)) | (LeadResumeText.status.in_(statuses)),
+                )
+                .order_by(model.id)
+            )
+            last_id = ""
+            while True:
+                async with session_factory() as session:
+                    rows = (await session.execute(missing.where(model.id > last_id).limit(batch_size))).all()
+                rows = first_page(rows, attrgetter("id"), batch_size)
+                if not rows:
+                    break
+                for lead_id, path in rows:
+                    await runner.submit(lead_id, path)
+                queued += len(rows)
+                last_id = rows[-1].id
+        await runner.join()
+    finally:
+        await runner.stop()
+    return queued
@@ -0,0 +1,304 @@
+"""Reconcile ``UPLOAD_DIR`` with the resume paths stored on leads.
+
+Resumes are written before their lead is inserted, so a failed or abandoned
+submission leaves a file no lead points at. The sweeper walks the upload
+tree in name order, reading each directory once per run, and looks up each
+chunk of paths with one indexed ``IN`` query per lead table. Unreferenced
+files older than the grace period are quarantined (or deleted). Progress is
+checkpointed after every chunk, so a sweep over millions of files can be
+spread across runs and survives restarts. Only one process sweeps a given
+upload directory at a time.
+"""
+
+import asyncio
+import fcntl
+import heapq
+import itertools
+import json
+import logging
+import os
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from operator import attrgetter
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.config import settings
+from app.core.database import async_session, first_page
+from app.models.lead import Lead, LeadArchive
+
+logger = logging.getLogger(__name__)
+
+# Entries whose names start with a dot (the quarantine directory, the
+# checkpoint file, temporary files) are never swept.
+QUARANTINE_DIR = ".quarantine"
+CHECKPOINT_FILE = ".sweep_checkpoint.json"
+CHUNK_SIZE = 1000
+# Most directory entries a walk holds at once. Uploads are flat, so without a
+# bound an unlimited sweep would hold every name in UPLOAD_DIR; each further
+# page costs one more scandir pass over the directory instead.
+WALK_PAGE_SIZE = 100_000
+# SweepResult.removed_paths keeps only this many examples.
+MAX_REPORTED_PATHS = 1000
+
+
+def iter_upload_tree(
+    root: str, after: tuple[str, ...] = (), page_size: int = WALK_PAGE_SIZE
+) -> Iterator[tuple[str, ...]]:
+    """Yield files under ``root`` as path-component tuples, in sorted order.
+
+    Only paths that sort after ``after`` are yielded. Each ``os.scandir``
+    pass over a directory keeps the ``page_size`` smallest names after the
+    cursor, so memory stays bounded however large the directory is. Pass the
+    number of files the caller will consume when it is smaller: the
+    directory is then listed once, and a later walk resumes from its
+    checkpoint instead of relisting what came before it.
+    """
+    yield from _walk(root, (), after, page_size)
+
+
+def _walk(
+    root: str, rel: tuple[str, ...], after: tuple[str, ...], page_size: int
+) -> Iterator[tuple[str, ...]]:
+    directory = os.path.join(root, *rel)
+    cursor = None
+    if after:
+        cursor = after[0]
+        if len(after) > 1 and os.path.isdir(os.path.join(directory, cursor)):
+            yield from _walk(root, rel + (cursor,), after[1:], page_size)
+    while True:
+        try:
+            with os.scandir(directory) as entries:
+                names = (
+                    (entry.name, entry.is_dir(follow_symlinks=False))
+                    for entry in entries
+                    if not entry.name.startswith(".") and (cursor is None or entry.name > cursor)
+                )
+                page = heapq.nsmallest(page_size, names)
+        except FileNotFoundError:
+            return
+        for name, is_dir in page:
+            if is_dir:
+                yield from _walk(root, rel + (name,), (), page_size)
+            else:
+                yield rel + (name,)
+        # Only reached when the caller reads on past a full page: the run has
+        # no smaller budget, or some of the page's entries were empty directories.
+        if len(page) < page_size:
+            return
+        cursor = page[-1][0]
+
+
+@dataclass
+class SweepResult:
+    scanned: int = 0
+    orphaned: int = 0
+    removed: int = 0
+    too_recent: int = 0
+    finished: bool = False
+    # Another process was already sweeping this directory; nothing was done.
+    locked: bool = False
+    removed_paths: list[str] = field(default_factory=list)
+
+
+def _load_checkpoint(path: str) -> tuple[str, ...]:
+    try:
+        with open(path) as f:
+            return tuple(json.load(f)["after"])
+    except (FileNotFoundError, ValueError, KeyError):
+        return ()
+
+
+def _save_checkpoint(path: str, after: tuple[str, ...] | None) -> None:
+    if after is None:
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+        return
+    tmp = path + ".tmp"
+    with open(tmp, "w") as f:
+        json.dump({"after": list(after)}, f)
+    os.replace(tmp, path)
+
+
+@contextmanager
+def _sweep_lock(upload_dir: str) -> Iterator[bool]:
+    """Hold an exclusive lock on ``upload_dir``; yield False if another process has it.
+
+    The lock is an ``flock`` on the directory itself, so nothing is left behind
+    in the tree and it is released when the holder exits, however it exits.
+    """
+    try:
+        fd = os.open(upload_dir, os.O_RDONLY)
+    except FileNotFoundError:
+        yield True  # nothing to sweep, nothing to race over
+        return
+    try:
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            yield False
+            return
+        yield True
+    finally:
+        os.close(fd)
+
+
+def _stored_forms(upload_dir: str, rel: tuple[str, ...]) -> tuple[str, str]:
+    # Leads store os.path.join(UPLOAD_DIR, name); accept the absolute form too
+    # in case UPLOAD_DIR was switched between relative and absolute.
+    return os.path.join(upload_dir, *rel), os.path.join(os.path.abspath(upload_dir), *rel)
+
+
+async def _referenced(db: AsyncSession, paths: list[str]) -> set[str]:
+    found: set[str] = set()
+    for model in (Lead, LeadArchive):
+        result = await db.execute(select(model.resume_path).where(model.resume_path.in_(paths)))
+        found.update(result.scalars())
+    return found
+
+
+def _remove(upload_dir: str, rel: tuple[str, ...], delete: bool) -> bool:
+    source = os.path.join(upload_dir, *rel)
+    try:
+        if delete:
+            os.remove(source)
+        else:
+            target = os.path.join(upload_dir, QUARANTINE_DIR, *rel)
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            os.replace(source, target)
+    except FileNotFoundError:
+        return False  # already handled by a concurrent sweep
+    return True
+
+
+async def sweep_uploads(
+    session_factory: async_sessionmaker[AsyncSession] = async_session,
+    upload_dir: str | None = None,
+    grace_seconds: float | None = None,
+    delete: bool | None = None,
+    max_files: int | None = None,
+    dry_run: bool = False,
+) -> SweepResult:
+    """Sweep up to ``max_files`` files, continuing from the last checkpoint."""
+    upload_dir = upload_dir or settings.UPLOAD_DIR
+    grace_seconds = settings.UPLOAD_SWEEP_GRACE_MINUTES * 60 if grace_seconds is None else grace_seconds
+    delete = settings.UPLOAD_SWEEP_ACTION == "delete" if delete is None else delete
+    checkpoint = os.path.join(upload_dir, CHECKPOINT_FILE)
+
+    with _sweep_lock(upload_dir) as acquired:
+        if not acquired:
+            logger.info("Upload sweep skipped: another process is sweeping %s", upload_dir)
+            return SweepResult(locked=True)
+        return await _sweep(upload_dir, checkpoint, grace_seconds, delete, max_files, dry_run, session_factory)
+
+
+async def _sweep(
+    upload_dir: str,
+    checkpoint: str,
+    grace_seconds: float,
+    delete: bool,
+    max_files: int | None,
+    dry_run: bool,
+    session_factory: async_sessionmaker[AsyncSession],
+) -> SweepResult:
+    result = SweepResult()
+    page_size = WALK_PAGE_SIZE if max_files is None else min(max_files, WALK_PAGE_SIZE)
+    files = iter_upload_tree(upload_dir, _load_checkpoint(checkpoint), page_size=page_size)
+    cutoff = time.time() - grace_seconds
+    while max_files is None or result.scanned < max_files:
+        limit = CHUNK_SIZE if max_files is None else min(CHUNK_SIZE, max_files - result.scanned)
+        chunk = await asyncio.to_thread(list, itertools.islice(files, limit))
+        if not chunk:
+            result.finished = True
+            break
+        result.scanned += len(chunk)
+
+        forms = {rel: _stored_forms(upload_dir, rel) for rel in chunk}
+        async with session_factory() as db:
+            referenced = await _referenced(db, [p for pair in forms.values() for p in pair])
+        for rel, pair in forms.items():
+            if referenced.intersection(pair):
+                continue
+            result.orphaned += 1
+            path = pair[0]
+            try:
+                if os.stat(path).st_mtime > cutoff:
+                    result.too_recent += 1  # may belong to a submission still in progress
+                    continue
+            except FileNotFoundError:
+                continue
+            if dry_run or await asyncio.to_thread(_remove, upload_dir, rel, delete):
+                result.removed += 1
+                if len(result.removed_paths) < MAX_REPORTED_PATHS:
+                    result.removed_paths.append(path)
+        if not dry_run:
+            _save_checkpoint(checkpoint, chunk[-1])
+
+    if result.finished and not dry_run:
+        _save_checkpoint(checkpoint, None)
+    return result
+
+
+async def find_missing_files(
+    session_factory: async_sessionmaker[AsyncSession] = async_session,
+    batch_size: int = CHUNK_SIZE,
+) -> list[tuple[str, str]]:
+    """Return ``(lead_id, resume_path)`` for leads whose resume file does not exist."""
+    missing: list[tuple[str, str]] = []
+    for model in (Lead, LeadArchive):
+        last_id = ""
+        while True:
+            async with session_factory() as db:
+                rows = (
+                    await db.execute(
+                        select(model.id, model.resume_path)
+                        .where(model.id > last_id, model.resume_path.is_not(None))
+                        .order_by(model.id)
+                        .limit(batch_size)
+                    )
+                ).all()
+            rows = first_page(rows, attrgetter("id"), batch_size)
+            if not rows:
+                break
+            exists = await asyncio.to_thread(lambda paths: [os.path.exists(p) for p in paths], [row.resume_path for row in rows])
+            missing.extend((row.id, row.resume_path) for row, ok in zip(rows, exists) if not ok)
+            last_id = rows[-1].id
+    return missing
+
+
+class UploadSweeper:
+    """Runs ``sweep_uploads`` every ``interval`` seconds in the background."""
+
+    def __init__(self, interval: float | None = None, max_files: int | None = None):
+        self.interval = settings.UPLOAD_SWEEP_INTERVAL_MINUTES * 60 if interval is None else interval
+        self.max_files = settings.UPLOAD_SWEEP_MAX_FILES if max_files is None else max_files
+        self._task: asyncio.Task | None = None
+
+    async def start(self) -> None:
+        if self.interval > 0:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                result = await sweep_uploads(max_files=self.max_files)
+            except Exception:
+                logger.exception("Upload sweep failed")
+                continue
+            if result.removed:
+                logger.info("Upload sweep removed %d orphaned file(s)", result.removed)
+
+
+sweeper = UploadSweeper()
@@ -0,0 +1,354 @@
+import asyncio
+import hashlib
+import hmac
+import json
+import logging
+import random
+import time
+import uuid
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import TYPE_CHECKING, Self
+
+from fastapi import HTTPException, status
+from sqlalchemy import bindparam, delete, select, update
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.config import WebhookSubscriber, settings
+from app.core.database import async_session, on_commit
+from app.models.base import utcnow
+from app.models.lead import Lead
+from app.models.webhook import WebhookDelivery, WebhookDeliveryStatus
+from app.schemas.lead import LeadDetailResponse
+
+if TYPE_CHECKING:
+    import httpx
+
+logger = logging.getLogger(__name__)
+
+LEAD_CREATED = "lead.created"
+LEAD_STATE_CHANGED = "lead.state_changed"
+
+# Delivered rows are deleted in batches of this size, at most every PRUNE_INTERVAL.
+PRUNE_BATCH_SIZE = 1000
+PRUNE_INTERVAL = timedelta(hours=1)
+
+SIGNATURE_HEADER = "X-Alma-Signature"
+TIMESTAMP_HEADER = "X-Alma-Timestamp"
+
+_deliveries = WebhookDelivery.__table__
+_RECORD_FAILURE = (
+    update(_deliveries)
+    .where(_deliveries.c.id == bindparam("b_id"))
+    .values(
+        status=bindparam("b_status"),
+        attempts=bindparam("b_attempts"),
+        next_attempt_at=bindparam("b_next"),
+        last_error=bindparam("b_error"),
+    )
+)
+
+
+def sign(secret: str, timestamp: str, body: bytes) -> str:
+    """HMAC-SHA256 over ``"<timestamp>.<body>"``, as sent in ``X-Alma-Signature``."""
+    digest = hmac.new(secret.encode(), timestamp.encode() + b"." + body, hashlib.sha256)
+    return f"sha256={digest.hexdigest()}"
+
+
+def emit_event(db: AsyncSession, event_type: str, lead: Lead, **data) -> None:
+    """Queue ``event_type`` for every subscriber in ``db``'s transaction.
+
+    The rows commit (or roll back) with the change that caused them, and the
+    dispatcher is woken once they are visible.
+    """
+    subscribers = settings.WEBHOOK_SUBSCRIBERS
+    if not subscribers:
+        return
+    now = utcnow()
+    envelope = {
+        "id": str(uuid.uuid4()),
+        "type": event_type,
+        "occurred_at": now.isoformat() + "Z",
+        "data": {"lead": LeadDetailResponse.model_validate(lead).model_dump(mode="json"), **data},
+    }
+    payload = json.dumps(envelope, separators=(",", ":"))
+    for subscriber in subscribers:
+        db.add(
+            WebhookDelivery(
+                subscriber=subscriber.name,
+                event_type=event_type,
+                payload=payload,
+                next_attempt_at=now,
+            )
+        )
+    on_commit(db, dispatcher.wake)
+
+
+class WebhookDispatcher:
+    """Delivers queued webhook events from a background task.
+
+    Due rows are claimed with a short lease (so several app processes never
+    send the same row at once), grouped into batches per subscriber and POSTed
+    through one pooled keep-alive client. Each subscriber has its own cap on
+    concurrent requests. Failed batches are retried with jittered exponential
+    backoff until ``max_attempts``, after which the rows are marked DEAD.
+    """
+
+    def __init__(
+        self,
+        subscribers: list[WebhookSubscriber] | None = None,
+        session_factory: async_sessionmaker[AsyncSession] = async_session,
+        batch_size: int | None = None,
+        max_attempts: int | None = None,
+        backoff_base: float | None = None,
+        backoff_max: float | None = None,
+        timeout: float | None = None,
+        poll_interval: float | None = None,
+        retention: timedelta | None = None,
+        transport: "httpx.AsyncBaseTransport | None" = None,
+    ):
+        self.subscribers = {s.name: s for s in (subscribers if subscribers is not None else settings.WEBHOOK_SUBSCRIBERS)}
+        self.session_factory = session_factory
+        self.batch_size = batch_size or settings.WEBHOOK_BATCH_SIZE
+        self.max_attempts = max_attempts or settings.WEBHOOK_MAX_ATTEMPTS
+        self.backoff_base = settings.WEBHOOK_BACKOFF_BASE_SECONDS if backoff_base is None else backoff_base
+        self.backoff_max = backoff_max or settings.WEBHOOK_BACKOFF_MAX_SECONDS
+        self.timeout = timeout or settings.WEBHOOK_TIMEOUT_SECONDS
+        self.poll_interval = poll_interval or settings.WEBHOOK_POLL_SECONDS
+        self.retention = timedelta(days=settings.WEBHOOK_RETENTION_DAYS) if retention is None else retention
+        self.transport = transport
+        # One round claims at most enough rows to fill every subscriber's slots once.
+        self.claim_size = self.batch_size * max(1, sum(s.max_concurrency for s in self.subscribers.values()))
+        self._semaphores = {name: asyncio.Semaphore(s.max_concurrency) for name, s in self.subscribers.items()}
+        self._client: httpx.AsyncClient | None = None
+        self._wake: asyncio.Event | None = None
+        self._task: asyncio.Task | None = None
+        self._pruned_at: datetime | None = None
+
+    async def __aenter__(self) -> Self:
+        self._open_client()
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        await self.stop()
+
+    def _open_client(self) -> None:
+        # httpx is imported here, not at module level, so workers without
+        # subscribers never pay for it at startup.
+        import httpx
+
+        if self._client is None:
+            slots = sum(s.max_concurrency for s in self.subscribers.values()) or 1
+            self._client = httpx.AsyncClient(
+                timeout=self.timeout,
+                limits=httpx.Limits(max_connections=slots, max_keepalive_connections=slots),
+                transport=self.transport,
+            )
+
+    async def start(self) -> None:
+        self._open_client()
+        self._wake = asyncio.Event()
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        self._wake = None
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    def wake(self) -> None:
+        """Skip the rest of the poll interval (called after new events commit)."""
+        if self._wake is not None:
+            self._wake.set()
+
+    async def _run(self) -> None:
+        while True:
+            self._wake.clear()
+            if self._pruned_at is None or utcnow() - self._pruned_at >= PRUNE_INTERVAL:
+                self._pruned_at = utcnow()
+                try:
+                    await self.prune()
+                except Exception:
+                    logger.exception("Pruning delivered webhooks failed")
+            try:
+                processed = await self.run_once()
+            except Exception:
+                logger.exception("Webhook dispatch round failed")
+                processed = 0
+            if processed:
+                continue  # keep draining a backlog without waiting
+            try:
+                await asyncio.wait_for(self._wake.wait(), self.poll_interval)
+            except TimeoutError:
+                pass
+
+    def _backoff(self, attempts: int) -> timedelta:
+        delay = min(self.backoff_base * 2 ** (attempts - 1), self.backoff_max)
+        return timedelta(seconds=delay * random.uniform(0.5, 1.0))
+
+    async def _claim_rows(self, session: AsyncSession, where, limit: int, lease: datetime) -> list:
+        ids = select(_deliveries.c.id).where(where).order_by(_deliveries.c.next_attempt_at).limit(limit)
+        claim = (
+            update(_deliveries)
+            .where(_deliveries.c.id.in_(ids.scalar_subquery()), where)
+            .values(next_attempt_at=lease)
+            .returning(_deliveries.c.id, _deliveries.c.subscriber, _deliveries.c.payload, _deliveries.c.attempts)
+        )
+        return list((await session.execute(claim)).all())
+
+    async def _claim(self) -> list:
+        now = utcnow()
+        due = (_deliveries.c.status == WebhookDeliveryStatus.PENDING) & (_deliveries.c.next_attempt_at <= now)
+        # Push the claimed rows' next attempt past the request timeout: if this
+        # process dies mid-delivery they simply become due again. Each
+        # subscriber gets no more rows than its slots send at once, so no
+        # claimed batch waits for a slot while its lease runs out.
+        lease = now + timedelta(seconds=self.timeout * 2)
+        rows = []
+        async with self.session_factory() as session:
+            for name, subscriber in self.subscribers.items():
+                rows += await self._claim_rows(
+                    session, due & (_deliveries.c.subscriber == name), self.batch_size * subscriber.max_concurrency, lease
+                )
+            # Rows for subscribers no longer configured, to be dead-lettered.
+            rows += await self._claim_rows(
+                session, due & _deliveries.c.subscriber.not_in(list(self.subscribers)), self.claim_size, lease
+            )
+            await session.commit()
+        return rows
+
+    async def prune(self, now: datetime | None = None) -> int:
+        """Delete DELIVERED rows older than ``retention``; return how many went."""
+        if not self.retention:
+            return 0
+        cutoff = (now or utcnow()) - self.retention
+        # A delivered row's next_attempt_at is its last lease, just after
+        # delivered_at, so the (status, next_attempt_at) index finds them.
+        old = (
+            (_deliveries.c.status == WebhookDeliveryStatus.DELIVERED)
+            & (_deliveries.c.next_attempt_at < cutoff)
+            & (_deliveries.c.delivered_at < cutoff)
+        )
+        deleted = 0
+        while True:
+            async with self.session_factory() as session:
+                ids = select(_deliveries.c.id).where(old).limit(PRUNE_BATCH_SIZE)
+                result = await session.execute(delete(_deliveries).where(_deliveries.c.id.in_(ids.scalar_subquery())))
+                await session.commit()
+            deleted += result.rowcount
+            if result.rowcount < PRUNE_BATCH_SIZE:
+                return deleted
+
+    async def _post(self, subscriber: WebhookSubscriber, rows: list) -> str | None:
+        """POST one batch of events; return None on success or an error description."""
+        import httpx
+
+        body = b'{"events":[' + b",".join(row.payload.encode() for row in rows) + b"]}"
+        timestamp = str(int(time.time()))
+        headers = {
+            "Content-Type": "application/json",
+            TIMESTAMP_HEADER: timestamp,
+            SIGNATURE_HEADER: sign(subscriber.secret, timestamp, body),
+        }
+        async with self._semaphores[subscriber.name]:
+            try:
+                response = await self._client.post(subscriber.url, content=body, headers=headers)
+            except httpx.HTTPError as exc:
+                return f"{type(exc).__name__}: {exc}"[:500]
+        if response.is_success:
+            return None
+        return f"HTTP {response.status_code}"
+
+    async def run_once(self) -> int:
+        """Deliver one round of due events and return how many rows were attempted."""
+        self._open_client()
+        rows = await self._claim()
+        if not rows:
+            return 0
+
+        by_subscriber: dict[str, list] = defaultdict(list)
+        for row in rows:
+            by_subscriber[row.subscriber].append(row)
+        batches, orphans = [], []
+        for name, subscriber_rows in by_subscriber.items():
+            subscriber = self.subscribers.get(name)
+            if subscriber is None:
+                orphans.extend(subscriber_rows)
+                continue
+            for start in range(0, len(subscriber_rows), self.batch_size):
+                batches.append((subscriber, subscriber_rows[start : start + self.batch_size]))
+        errors = await asyncio.gather(*(self._post(subscriber, batch) for subscriber, batch in batches))
+
+        now = utcnow()
+        delivered: list[str] = []
+        failures: list[dict] = []
+
+        def fail(row, error: str, dead: bool = False) -> None:
+            attempts = row.attempts + 1
+            dead = dead or attempts >= self.max_attempts
+            failures.append(
+                {
+                    "b_id": row.id,
+                    "b_status": WebhookDeliveryStatus.DEAD if dead else WebhookDeliveryStatus.PENDING,
+                    "b_attempts": attempts,
+                    "b_next": now if dead else now + self._backoff(attempts),
+                    "b_error": error,
+                }
+            )
+
+        for (_subscriber, batch), error in zip(batches, errors):
+            if error is None:
+                delivered.extend(row.id for row in batch)
+            else:
+                for row in batch:
+                    fail(row, error)
+        for row in orphans:
+            fail(row, "Subscriber is no longer configured", dead=True)
+
+        async with self.session_factory() as session:
+            if delivered:
+                await session.execute(
+                    update(_deliveries)
+                    .where(_deliveries.c.id.in_(delivered))
+                    .values(status=WebhookDeliveryStatus.DELIVERED, delivered_at=now, last_error=None)
+                )
+            if failures:
+                await session.execute(_RECORD_FAILURE, failures)
+            await session.commit()
+        return len(rows)
+
+
+dispatcher = WebhookDispatcher()
+
+
+async def list_dead_letters(
+    db: AsyncSession, subscriber: str | None = None, limit: int = 100
+) -> list[WebhookDelivery]:
+    query = (
+        select(WebhookDelivery)
+        .where(WebhookDelivery.status == WebhookDeliveryStatus.DEAD)
+        .order_by(WebhookDelivery.created_at.desc())
+        .limit(limit)
+    )
+    if subscriber is not None:
+        query = query.where(WebhookDelivery.subscriber == subscriber)
+    result = await db.execute(query)
+    return list(result.scalars().all())
+
+
+async def retry_dead_letter(db: AsyncSession, delivery_id: str) -> WebhookDelivery:
+    delivery = await db.get(WebhookDelivery, delivery_id)
+    if delivery is None or delivery.status != WebhookDeliveryStatus.DEAD:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Dead-letter delivery not found"
+        )
+    delivery.status = WebhookDeliveryStatus.PENDING
+    delivery.attempts = 0
+    delivery.next_attempt_at = utcnow()
+    await db.flush()
+    on_commit(db, dispatcher.wake)
+    return delivery
@@ -0,0 +1,71 @@
+"""Quarantine or delete uploaded files that no lead references.
+
+Usage:
+    python -m app.sweep_uploads [--max-files N] [--grace-minutes M] [--delete] [--dry-run]
+    python -m app.sweep_uploads --missing
+
+Sweeps resume from the checkpoint left by the previous run (including the
+background sweeper's) until the whole tree has been visited.
+"""
+
+import argparse
+import asyncio
+import time
+
+from app.core.config import settings
+from app.core.database import ensure_schema
+from app.services.upload_sweep_service import (
+    SweepResult,
+    find_missing_files,
+    sweep_uploads,
+)
+
+MISSING_SHOWN = 20
+
+
+async def run(args: argparse.Namespace) -> SweepResult | list[tuple[str, str]]:
+    await ensure_schema()
+    if args.missing:
+        return await find_missing_files()
+    return await sweep_uploads(
+        grace_seconds=args.grace_minutes * 60,
+        delete=args.delete or None,
+        max_files=args.max_files,
+        dry_run=args.dry_run,
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(prog="python -m app.sweep_uploads")
+    parser.add_argument("--max-files", type=int, default=None, help="stop after N files (resume next run)")
+    parser.add_argument("--grace-minutes", type=int, default=settings.UPLOAD_SWEEP_GRACE_MINUTES)
+    parser.add_argument("--delete", action="store_true", help="delete orphans instead of quarantining them")
+    parser.add_argument("--dry-run", action="store_true", help="report orphans without touching them")
+    parser.add_argument("--missing", action="store_true", help="list leads whose resume file is missing")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    result = asyncio.run(run(args))
+    elapsed = time.perf_counter() - start
+    if args.missing:
+        for lead_id, path in result[:MISSING_SHOWN]:
+            print(f"{lead_id}  {path}")
+        if len(result) > MISSING_SHOWN:
+            print(f"... and {len(result) - MISSING_SHOWN} more")
+        print(f"{len(result)} lead(s) point at a missing resume ({elapsed:.1f}s)")
+        return
+
+    if result.locked:
+        print("Another process is sweeping this upload directory; try again later.")
+        return
+    action = "would remove" if args.dry_run else "removed"
+    print(
+        f"Scanned {result.scanned} file(s): {result.orphaned} orphaned, {action} {result.removed}, "
+        f"{result.too_recent} within the grace period ({elapsed:.1f}s)"
+    )
+    if not result.finished:
+        print("Stopped at --max-files; run again to continue.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""Show that hot-path latency stays flat as archived history grows.
+
+Usage:
+    python -m benchmarks.archive [--history 10000,100000,1000000] [--hot 1000]
+
+For each history size a fresh database gets ``--hot`` recent leads plus
+``--history`` old REACHED_OUT leads. Listing and get-by-id are measured with
+all history in ``leads`` and again after the archive job has moved it to
+``leads_archive``.
+"""
+
+import argparse
+import asyncio
+import json
+import tempfile
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+from benchmarks.harness import (
+    asgi_client,
+    configure_environment,
+    create_schema,
+    login,
+    measure,
+    print_result,
+)
+
+
+async def _reset_database(history: int, hot: int, seed: int) -> list[str]:
+    """Fill a fresh database and return the IDs of the hot leads."""
+    from sqlalchemy import delete, select, update
+
+    from app.core.database import engine
+    from app.models.lead import Lead, LeadArchive, LeadState
+    from app.seed import generate
+
+    async with engine.begin() as conn:
+        await conn.execute(delete(Lead))
+        await conn.execute(delete(LeadArchive))
+
+    today = datetime.now(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
+    await asyncio.to_thread(generate, history, seed=seed, end=today - timedelta(days=365))
+    async with engine.begin() as conn:
+        # Keep the generated timestamps; the column's onupdate would reset them.
+        await conn.execute(
+            update(Lead).values(state=LeadState.REACHED_OUT, updated_at=Lead.updated_at)
+        )
+        existing = set((await conn.execute(select(Lead.id))).scalars())
+
+    await asyncio.to_thread(generate, hot, seed=seed + 1, end=today)
+    async with engine.connect() as conn:
+        return [lead_id for lead_id in (await conn.execute(select(Lead.id))).scalars() if lead_id not in existing]
+
+
+async def _archive() -> int:
+    from app.core.database import async_session
+    from app.services.archive_service import archive_leads
+
+    async with async_session() as session:
+        return await archive_leads(session, timedelta(days=90))
+
+
+async def run(args: argparse.Namespace) -> dict[str, dict]:
+    results: dict[str, dict] = {}
+    with tempfile.TemporaryDirectory(prefix="alma-bench-") as tmp:
+        configure_environment(Path(tmp))
+        await create_schema()
+
+        async with asgi_client() as client:
+            headers = await login(client)
+
+            async def measure_hot(label: str) -> None:
+                for name, requests in (
+                    ("list", [lambda: client.get("/api/leads", headers=headers)] * args.iterations),
+                    ("get", [lambda i=i: client.get(f"/api/leads/{i}", headers=headers) for i in hot_ids[: args.iterations * 10]]),
+                ):
+                    key = f"{name}[{label}]"
+                    results[key] = await measure(requests, args.concurrency)
+                    print_result(key, results[key])
+
+            for size in args.history:
+                hot_ids = await _reset_database(size, args.hot, args.seed)
+                await measure_hot(f"{size}:hot+cold")
+                archived = await _archive()
+                print(f"  archived {archived} lead(s)")
+                await measure_hot(f"{size}:archived")
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--history", type=lambda v: [int(s) for s in v.split(",")], default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--hot", type=int, default=1_000, help="recent leads kept in the hot table")
+    parser.add_argument("--iterations", type=int, default=20)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--seed", type=int, default=1234)
+    parser.add_argument("--output", type=Path, default=None, help="write results as JSON")
+    args = parser.parse_args()
+
+    results = asyncio.run(run(args))
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(json.dumps({"results": results}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""Measure bytes on the wire and CPU per request for compressed lead listings.
+
+Usage:
+    python -m benchmarks.compression [--list-sizes 100,1000,10000] [--iterations 20]
+
+For each list size the scratch database is topped up to that many leads and
+``GET /api/leads`` is requested in-process with each encoding this install
+can produce (plus ``identity``). CPU is process time per request, so it
+covers query, serialization and compression; the difference to ``identity``
+is the cost of compressing.
+"""
+
+import argparse
+import asyncio
+import json
+import tempfile
+import time
+from pathlib import Path
+
+from benchmarks.harness import (
+    asgi_client,
+    configure_environment,
+    create_schema,
+    login,
+    seed_leads,
+)
+
+
+async def run(args: argparse.Namespace) -> dict[str, dict]:
+    results: dict[str, dict] = {}
+    with tempfile.TemporaryDirectory(prefix="alma-bench-") as tmp:
+        configure_environment(Path(tmp))
+        await create_schema()
+
+        from app.core.compression import available_encodings
+        from app.core.config import settings
+
+        encodings = ["identity"] + [e for e in settings.COMPRESSION_ENCODINGS if e in available_encodings()]
+        async with asgi_client() as client:
+            headers = await login(client)
+            for size in args.list_sizes:
+                await seed_leads(size, args.seed)
+                identity_bytes = None
+                for encoding in encodings:
+                    wire = 0
+                    cpu_start, wall_start = time.process_time(), time.perf_counter()
+                    for _ in range(args.iterations):
+                        async with client.stream(
+                            "GET", "/api/leads", headers={**headers, "Accept-Encoding": encoding}
+                        ) as resp:
+                            resp.raise_for_status()
+                            wire += sum([len(chunk) async for chunk in resp.aiter_raw()])
+                    cpu = (time.process_time() - cpu_start) / args.iterations
+                    wall = (time.perf_counter() - wall_start) / args.iterations
+                    per_request = wire // args.iterations
+                    identity_bytes = identity_bytes or per_request
+                    key = f"list[{size}]:{encoding}"
+                    results[key] = {
+                        "bytes": per_request,
+                        "ratio": round(identity_bytes / per_request, 2),
+                        "cpu_ms": round(cpu * 1000, 3),
+                        "wall_ms": round(wall * 1000, 3),
+                    }
+                    print(
+                        f"{key:<24} {per_request:>11,} bytes  x{results[key]['ratio']:<6} "
+                        f"cpu {results[key]['cpu_ms']:>9.2f}ms  wall {results[key]['wall_ms']:>9.2f}ms"
+                    )
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--list-sizes", type=lambda v: [int(s) for s in v.split(",")], default=[100, 1_000, 10_000])
+    parser.add_argument("--iterations", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=1234)
+    parser.add_argument("--output", type=Path, default=None, help="write results as JSON")
+    args = parser.parse_args()
+
+    results = asyncio.run(run(args))
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(json.dumps({"results": results}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
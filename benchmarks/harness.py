@@ -0,0 +1,180 @@
+"""Shared setup for the benchmark scripts: scratch app environment, seeding, clients, timing."""
+
+import asyncio
+import os
+import socket
+import subprocess
+import sys
+import time
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from pathlib import Path
+
+import httpx
+
+from benchmarks.stats import summarize
+
+BENCH_DIR = Path(__file__).resolve().parent
+
+BENCH_USERNAME = "bench"
+BENCH_PASSWORD = "bench-password"
+
+
+def configure_environment(workdir: Path) -> dict[str, str]:
+    """Point the app at a scratch database before any ``app`` module is imported."""
+    env = {
+        "DATABASE_URL": f"sqlite+aiosqlite:///{workdir / 'bench.db'}",
+        "UPLOAD_DIR": str(workdir / "uploads"),
+        "JWT_SECRET_KEY": "bench-secret",
+        "INTERNAL_USER_USERNAME": BENCH_USERNAME,
+        # Every benchmark request comes from one client IP.
+        "ADMISSION_RATE_PER_MINUTE": "0",
+    }
+    os.environ.update(env)
+    os.makedirs(env["UPLOAD_DIR"], exist_ok=True)
+
+    from app.core.config import settings
+    from app.core.security import hash_password
+
+    password_hash = hash_password(BENCH_PASSWORD)
+    settings.INTERNAL_USER_PASSWORD_HASH = password_hash
+    settings.ADMISSION_RATE_PER_MINUTE = 0
+    env["INTERNAL_USER_PASSWORD_HASH"] = password_hash
+    return env
+
+
+async def create_schema() -> None:
+    from app.core.database import ensure_schema
+
+    await ensure_schema()
+
+
+async def count_leads() -> int:
+    from sqlalchemy import func, select
+
+    from app.core.database import engine
+    from app.models.lead import Lead
+
+    async with engine.connect() as conn:
+        return (await conn.execute(select(func.count()).select_from(Lead))).scalar_one()
+
+
+async def seed_leads(target: int, seed: int) -> None:
+    """Top the ``leads`` table up to ``target`` rows with the bulk generator."""
+    from app.seed import generate
+
+    existing = await count_leads()
+    if target > existing:
+        # Offset the seed by the current size so top-ups never repeat IDs.
+        await asyncio.to_thread(generate, target - existing, seed=seed + existing)
+
+
+async def pending_lead_ids(limit: int) -> list[str]:
+    from sqlalchemy import select
+
+    from app.core.database import engine
+    from app.models.lead import Lead, LeadState
+
+    async with engine.connect() as conn:
+        result = await conn.execute(
+            select(Lead.id).where(Lead.state == LeadState.PENDING).limit(limit)
+        )
+        return list(result.scalars())
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_uvicorn(env: dict[str, str]) -> tuple[subprocess.Popen, str]:
+    return start_server(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", "{port}", "--log-level", "warning"], env
+    )
+
+
+def start_server(command: list[str], env: dict[str, str]) -> tuple[subprocess.Popen, str]:
+    """Run ``command`` (with ``{port}`` filled in) and wait until it answers HTTP."""
+    port = free_port()
+    proc = subprocess.Popen(
+        [arg.format(port=port) for arg in command],
+        env={**os.environ, **env},
+        stdout=subprocess.DEVNULL,
+        cwd=BENCH_DIR.parent,
+    )
+    base_url = f"http://127.0.0.1:{port}"
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        try:
+            httpx.get(f"{base_url}/docs", timeout=1)
+            return proc, base_url
+        except httpx.TransportError:
+            if proc.poll() is not None:
+                break
+            time.sleep(0.1)
+    proc.terminate()
+    raise RuntimeError(f"{command[2]} did not start")
+
+
+async def measure(requests, concurrency: int) -> dict:
+    """Run the zero-arg coroutine factories in ``requests`` with bounded concurrency."""
+    latencies: list[float] = []
+    errors = 0
+    queue = list(reversed(requests))
+
+    async def worker() -> None:
+        nonlocal errors
+        while queue:
+            make_request = queue.pop()
+            start = time.perf_counter()
+            try:
+                resp = await make_request()
+            except httpx.HTTPError:
+                # Timeouts and dropped connections fail the request, not the run.
+                errors += 1
+                continue
+            elapsed = time.perf_counter() - start
+            if resp.status_code >= 400:
+                errors += 1
+            else:
+                latencies.append(elapsed)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return summarize(latencies, time.perf_counter() - start, errors)
+
+
+async def login(client: httpx.AsyncClient) -> dict[str, str]:
+    resp = await client.post(
+        "/api/auth/login", json={"username": BENCH_USERNAME, "password": BENCH_PASSWORD}
+    )
+    resp.raise_for_status()
+    return {"Authorization": f"Bearer {resp.json()['access_token']}"}
+
+
+@asynccontextmanager
+async def asgi_client() -> AsyncIterator[httpx.AsyncClient]:
+    """In-process client for the app with email delivery silenced."""
+    from app.main import app
+    from app.services.email_service import EmailService, get_email_service
+
+    class _SilentEmailService(EmailService):
+        async def send_email(self, to: str, subject: str, body: str) -> None:
+            pass
+
+    app.dependency_overrides[get_email_service] = _SilentEmailService
+    transport = httpx.ASGITransport(app=app)
+    try:
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=300) as client:
+            yield client
+    finally:
+        app.dependency_overrides.pop(get_email_service, None)
+
+
+def print_result(name: str, result: dict) -> None:
+    print(
+        f"{name:<18} {result['requests']:>6} req  {result['throughput_rps']:>9.1f} req/s  "
+        f"p50 {result['p50_ms']:>8.2f}ms  p95 {result['p95_ms']:>8.2f}ms  "
+        f"p99 {result['p99_ms']:>8.2f}ms  errors {result['errors']}"
+    )
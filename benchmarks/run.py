@@ -0,0 +1,223 @@
+"""Benchmark the API's hot endpoints and compare against a stored baseline.
+
+Usage:
+    python -m benchmarks.run [--uvicorn] [--scenarios login,submit,...]
+                             [--list-sizes 1000,100000,1000000]
+                             [--output benchmarks/results/latest.json]
+                             [--baseline benchmarks/baseline.json]
+
+By default the app is driven in-process through httpx's ``ASGITransport``.
+With ``--uvicorn`` a real server is started on localhost and driven over TCP.
+Each run uses a throwaway SQLite database and upload directory.
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+import platform
+import random
+import sys
+import tempfile
+from datetime import datetime, timezone
+from pathlib import Path
+
+import httpx
+
+from benchmarks.harness import (
+    BENCH_DIR,
+    BENCH_PASSWORD,
+    BENCH_USERNAME,
+    asgi_client,
+    configure_environment,
+    create_schema,
+    login,
+    measure,
+    pending_lead_ids,
+    print_result,
+    seed_leads,
+    start_uvicorn,
+)
+from benchmarks.stats import compare
+
+DEFAULT_OUTPUT = BENCH_DIR / "results" / "latest.json"
+DEFAULT_BASELINE = BENCH_DIR / "baseline.json"
+
+SCENARIOS = ("login", "submit", "get", "patch", "list")
+# label -> (resume size in bytes, divisor applied to --iterations)
+RESUME_SIZES = {
+    "10kb": (10 * 1024, 1),
+    "1mb": (1024 * 1024, 10),
+    "5mb": (5 * 1024 * 1024, 40),
+}
+
+
+async def run_scenarios(client: httpx.AsyncClient, args: argparse.Namespace) -> dict[str, dict]:
+    rng = random.Random(args.seed)
+    results: dict[str, dict] = {}
+    headers = await login(client)
+    n = args.iterations
+
+    def record(name: str, result: dict) -> None:
+        results[name] = result
+        print_result(name, result)
+
+    if "login" in args.scenarios:
+        body = {"username": BENCH_USERNAME, "password": BENCH_PASSWORD}
+        record(
+            "login",
+            await measure(
+                [lambda: client.post("/api/auth/login", json=body)] * max(1, n // 10),
+                args.concurrency,
+            ),
+        )
+
+    if "submit" in args.scenarios:
+        from app.seed import FIRST_NAMES, LAST_NAMES
+
+        # A fresh email and a varied name per submission: a shared one would
+        # send every request down the dedupe match path into a single group.
+        submitted = itertools.count()
+        for label, (size, divisor) in RESUME_SIZES.items():
+            content = b"%PDF-1.4\n" + rng.randbytes(size)
+            iterations = max(1, n // divisor)
+
+            def submit(content=content):
+                fields = {
+                    "first_name": rng.choice(FIRST_NAMES),
+                    "last_name": rng.choice(LAST_NAMES),
+                    "email": f"bench{next(submitted)}@example.com",
+                }
+                return client.post(
+                    "/api/leads",
+                    data=fields,
+                    files={"resume": ("resume.pdf", content, "application/pdf")},
+                )
+
+            record(f"submit[{label}]", await measure([submit] * iterations, args.concurrency))
+
+    if "get" in args.scenarios or "patch" in args.scenarios:
+        # Generated history is mostly REACHED_OUT; seed enough for n PENDING leads.
+        await seed_leads(n * 10, args.seed)
+        ids = await pending_lead_ids(n)
+
+    if "get" in args.scenarios:
+        record(
+            "get",
+            await measure(
+                [lambda lead_id=lead_id: client.get(f"/api/leads/{lead_id}", headers=headers) for lead_id in ids],
+                args.concurrency,
+            ),
+        )
+
+    if "patch" in args.scenarios:
+        record(
+            "patch",
+            await measure(
+                [
+                    lambda lead_id=lead_id: client.patch(
+                        f"/api/leads/{lead_id}", json={"state": "REACHED_OUT"}, headers=headers
+                    )
+                    for lead_id in ids
+                ],
+                args.concurrency,
+            ),
+        )
+
+    if "list" in args.scenarios:
+        for size in sorted(args.list_sizes):
+            await seed_leads(size, args.seed)
+            # Full-table listings get expensive quickly; scale repetitions down.
+            iterations = max(3, n * 1000 // size)
+            record(
+                f"list[{size}]",
+                await measure(
+                    [lambda: client.get("/api/leads", headers=headers)] * iterations,
+                    min(args.concurrency, iterations),
+                ),
+            )
+
+    return results
+
+
+async def run(args: argparse.Namespace) -> dict[str, dict]:
+    with tempfile.TemporaryDirectory(prefix="alma-bench-") as tmp:
+        env = configure_environment(Path(tmp))
+        await create_schema()
+
+        if args.uvicorn:
+            proc, base_url = start_uvicorn(env)
+            try:
+                async with httpx.AsyncClient(base_url=base_url, timeout=300) as client:
+                    return await run_scenarios(client, args)
+            finally:
+                proc.terminate()
+                proc.wait()
+
+        async with asgi_client() as client:
+            return await run_scenarios(client, args)
+
+
+def _csv(value: str) -> list[str]:
+    return [item.strip() for item in value.split(",") if item.strip()]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--uvicorn", action="store_true", help="drive a real uvicorn server on localhost")
+    parser.add_argument("--scenarios", type=_csv, default=list(SCENARIOS), help="comma-separated subset of: " + ", ".join(SCENARIOS))
+    parser.add_argument("--list-sizes", type=lambda v: [int(s) for s in _csv(v)], default=[1_000, 100_000, 1_000_000])
+    parser.add_argument("--iterations", type=int, default=200, help="requests per scenario (scaled down for heavy ones)")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--seed", type=int, default=1234)
+    parser.add_argument("--output", type=Path, default=DEFAULT_OUTPUT)
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE)
+    parser.add_argument("--save-baseline", action="store_true", help="also write results to --baseline")
+    parser.add_argument("--max-latency-regression", type=float, default=0.10, help="allowed p95 growth (fraction)")
+    parser.add_argument("--max-throughput-regression", type=float, default=0.10, help="allowed throughput drop (fraction)")
+    args = parser.parse_args()
+
+    unknown = set(args.scenarios) - set(SCENARIOS)
+    if unknown:
+        parser.error(f"unknown scenarios: {', '.join(sorted(unknown))}")
+
+    results = asyncio.run(run(args))
+    report = {
+        "meta": {
+            "mode": "uvicorn" if args.uvicorn else "asgi",
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "iterations": args.iterations,
+            "concurrency": args.concurrency,
+        },
+        "results": results,
+    }
+
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    args.output.write_text(json.dumps(report, indent=2))
+    print(f"\nResults written to {args.output}")
+
+    if args.save_baseline:
+        args.baseline.write_text(json.dumps(report, indent=2))
+        print(f"Baseline written to {args.baseline}")
+        return
+
+    if not args.baseline.exists():
+        print("No baseline found; skipping comparison.")
+        return
+
+    baseline = json.loads(args.baseline.read_text())["results"]
+    regressions = compare(
+        results, baseline, args.max_latency_regression, args.max_throughput_regression
+    )
+    if regressions:
+        print("\nRegressions against baseline:")
+        for line in regressions:
+            print(f"  {line}")
+        sys.exit(1)
+    print("No regressions against baseline.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,192 @@
+"""Compare the pre-forking server against a single uvicorn process.
+
+Usage:
+    python -m benchmarks.serve [--workers 0] [--requests 4000] [--clients 2] [--tasks 16]
+
+Starts ``uvicorn app.main:app`` (the default single-process setup) and then
+``python -m app.serve`` on the same scratch database, and drives each with
+``--clients`` load processes issuing authenticated ``GET /api/leads/{id}``
+requests over TCP. After the load, memory is read from
+``/proc/<pid>/smaps_rollup`` for the server and its workers: RSS counts
+shared copy-on-write pages in full for every process, PSS divides them
+between the processes sharing them, and private is what each worker owns
+alone. Linux only.
+"""
+
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from benchmarks.harness import (
+    configure_environment,
+    create_schema,
+    pending_lead_ids,
+    print_result,
+    seed_leads,
+    start_server,
+)
+from benchmarks.stats import summarize
+
+SERVERS = {
+    "uvicorn": [sys.executable, "-m", "uvicorn", "app.main:app", "--port", "{port}", "--log-level", "warning"],
+    "app.serve": [sys.executable, "-m", "app.serve", "--port", "{port}", "--log-level", "warning", "--workers"],
+}
+
+
+async def _load(base_url: str, token: str, ids: list[str], count: int, tasks: int):
+    import httpx
+
+    headers = {"Authorization": f"Bearer {token}"}
+    latencies: list[float] = []
+    errors = 0
+    remaining = list(range(count))
+
+    async with httpx.AsyncClient(base_url=base_url, headers=headers, timeout=60) as client:
+
+        async def worker() -> None:
+            nonlocal errors
+            while remaining:
+                i = remaining.pop()
+                start = time.perf_counter()
+                try:
+                    resp = await client.get(f"/api/leads/{ids[i % len(ids)]}")
+                except httpx.TransportError:
+                    errors += 1
+                    continue
+                if resp.status_code >= 400:
+                    errors += 1
+                else:
+                    latencies.append(time.perf_counter() - start)
+
+        started = time.time()
+        await asyncio.gather(*(worker() for _ in range(tasks)))
+        return latencies, errors, started, time.time()
+
+
+def _load_process(base_url: str, token: str, ids: list[str], count: int, tasks: int):
+    return asyncio.run(_load(base_url, token, ids, count, tasks))
+
+
+def _children(pid: int) -> list[int]:
+    try:
+        with open(f"/proc/{pid}/task/{pid}/children") as f:
+            return [int(child) for child in f.read().split()]
+    except FileNotFoundError:
+        return []
+
+
+def _memory_kb(pid: int) -> dict[str, int]:
+    fields = {}
+    with open(f"/proc/{pid}/smaps_rollup") as f:
+        for line in f:
+            name, _, value = line.partition(":")
+            if value.strip().endswith("kB"):
+                fields[name] = int(value.split()[0])
+    return {
+        "rss_kb": fields["Rss"],
+        "pss_kb": fields["Pss"],
+        "private_kb": fields["Private_Clean"] + fields["Private_Dirty"],
+    }
+
+
+def _memory(name: str, pid: int) -> dict:
+    """Memory of the serving processes: the server itself, or the supervisor's workers."""
+    if name == "uvicorn":
+        workers = [pid]
+        supervisor = None
+    else:
+        workers = _children(pid)
+        supervisor = _memory_kb(pid)
+    per_worker = [_memory_kb(worker) for worker in workers]
+    report = {
+        f"worker_{key}": round(sum(m[key] for m in per_worker) / len(per_worker)) for key in per_worker[0]
+    }
+    report["workers"] = len(per_worker)
+    report["total_pss_kb"] = sum(m["pss_kb"] for m in per_worker) + (supervisor["pss_kb"] if supervisor else 0)
+    if supervisor:
+        report["supervisor_pss_kb"] = supervisor["pss_kb"]
+    return report
+
+
+async def _login(base_url: str) -> str:
+    import httpx
+
+    from benchmarks.harness import login
+
+    async with httpx.AsyncClient(base_url=base_url, timeout=60) as client:
+        return (await login(client))["Authorization"].removeprefix("Bearer ")
+
+
+def run(args: argparse.Namespace) -> dict[str, dict]:
+    from app.serve import default_workers
+
+    workers = args.workers or default_workers()
+    results: dict[str, dict] = {}
+    context = multiprocessing.get_context("spawn")
+    with tempfile.TemporaryDirectory(prefix="alma-bench-") as tmp:
+        env = configure_environment(Path(tmp))
+        asyncio.run(create_schema())
+        asyncio.run(seed_leads(args.leads, args.seed))
+        ids = asyncio.run(pending_lead_ids(args.leads))
+
+        with ProcessPoolExecutor(max_workers=args.clients, mp_context=context) as pool:
+            for name, command in SERVERS.items():
+                if name == "app.serve":
+                    command = [*command, str(workers)]
+                proc, base_url = start_server(command, env)
+                try:
+                    token = asyncio.run(_login(base_url))
+                    # Warm every worker's connection pool and caches first.
+                    pool.submit(_load_process, base_url, token, ids, 200 * workers, args.tasks).result()
+                    per_client = args.requests // args.clients
+                    futures = [
+                        pool.submit(_load_process, base_url, token, ids, per_client, args.tasks)
+                        for _ in range(args.clients)
+                    ]
+                    outcomes = [future.result() for future in futures]
+                    memory = _memory(name, proc.pid)
+                finally:
+                    proc.terminate()
+                    proc.wait()
+
+                latencies = [latency for outcome in outcomes for latency in outcome[0]]
+                errors = sum(outcome[1] for outcome in outcomes)
+                wall = max(outcome[3] for outcome in outcomes) - min(outcome[2] for outcome in outcomes)
+                key = f"get[{name}]" if name == "uvicorn" else f"get[{name} x{workers}]"
+                results[key] = {**summarize(latencies, wall, errors), **memory}
+                print_result(key, results[key])
+                print(
+                    f"{'':<18} {memory['workers']} worker(s)  rss {memory['worker_rss_kb'] / 1024:.1f}MB  "
+                    f"pss {memory['worker_pss_kb'] / 1024:.1f}MB  private {memory['worker_private_kb'] / 1024:.1f}MB"
+                    f" per worker  total pss {memory['total_pss_kb'] / 1024:.1f}MB"
+                )
+    results["meta"] = {"cpus": os.cpu_count(), "workers": workers}
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=int, default=0, help="app.serve workers (0 = one per CPU)")
+    parser.add_argument("--requests", type=int, default=4000, help="requests per server")
+    parser.add_argument("--leads", type=int, default=1000)
+    parser.add_argument("--clients", type=int, default=2, help="load-generating processes")
+    parser.add_argument("--tasks", type=int, default=16, help="concurrent requests per client")
+    parser.add_argument("--seed", type=int, default=1234)
+    parser.add_argument("--output", type=Path, default=None, help="write results as JSON")
+    args = parser.parse_args()
+
+    results = run(args)
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(json.dumps({"results": results}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+"""Measure lead write throughput as the number of SQLite shards grows.
+
+Usage:
+    python -m benchmarks.sharding [--shards 1,2,4,8] [--leads 2000] [--processes 2] [--tasks 8]
+
+For each shard count a fresh set of database files is written to by
+``--processes`` worker processes (standing in for server workers), each
+running ``--tasks`` concurrent writers. Every write is one lead inserted and
+committed through the same sharded session factory the app uses, so with a
+single shard all commits queue on one file lock.
+"""
+
+import argparse
+import asyncio
+import json
+import multiprocessing
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from benchmarks.harness import print_result
+from benchmarks.stats import summarize
+
+# Long enough that contended writers wait for the lock instead of failing.
+BUSY_TIMEOUT_SECONDS = 60
+
+
+async def _write(url: str, shards: int, count: int, tasks: int) -> tuple[list[float], int, float, float]:
+    from sqlalchemy.exc import OperationalError
+    from sqlalchemy.ext.asyncio import create_async_engine
+
+    import app.models  # noqa: F401
+    from app.core.database import make_sessionmaker, shard_urls
+    from app.models.lead import Lead
+
+    engines = [
+        create_async_engine(u, connect_args={"timeout": BUSY_TIMEOUT_SECONDS}) for u in shard_urls(url, shards)
+    ]
+    session_factory = make_sessionmaker(engines)
+    latencies: list[float] = []
+    errors = 0
+    remaining = list(range(count))
+
+    async def writer() -> None:
+        nonlocal errors
+        while remaining:
+            i = remaining.pop()
+            start = time.perf_counter()
+            try:
+                async with session_factory() as session:
+                    session.add(Lead(first_name="Bench", last_name=f"Writer{i}", email=f"w{i}@example.com"))
+                    await session.commit()
+            except OperationalError:  # database is locked
+                errors += 1
+            else:
+                latencies.append(time.perf_counter() - start)
+
+    started = time.time()
+    await asyncio.gather(*(writer() for _ in range(tasks)))
+    finished = time.time()
+    for engine in engines:
+        await engine.dispose()
+    return latencies, errors, started, finished
+
+
+def _write_process(url: str, shards: int, count: int, tasks: int):
+    return asyncio.run(_write(url, shards, count, tasks))
+
+
+async def _prepare(url: str, shards: int) -> None:
+    from sqlalchemy.ext.asyncio import create_async_engine
+
+    from app.core.database import ensure_schema, shard_urls
+
+    for shard_url in shard_urls(url, shards):
+        engine = create_async_engine(shard_url)
+        await ensure_schema(engine)
+        await engine.dispose()
+
+
+def run(args: argparse.Namespace) -> dict[str, dict]:
+    results: dict[str, dict] = {}
+    # Spawned workers start with their own engines and event loops.
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=args.processes, mp_context=context) as pool:
+        for shards in args.shards:
+            with tempfile.TemporaryDirectory(prefix="alma-bench-") as tmp:
+                url = f"sqlite+aiosqlite:///{Path(tmp) / 'bench.db'}"
+                asyncio.run(_prepare(url, shards))
+                per_process = args.leads // args.processes
+                futures = [
+                    pool.submit(_write_process, url, shards, per_process, args.tasks)
+                    for _ in range(args.processes)
+                ]
+                outcomes = [future.result() for future in futures]
+
+            latencies = [latency for outcome in outcomes for latency in outcome[0]]
+            errors = sum(outcome[1] for outcome in outcomes)
+            wall = max(outcome[3] for outcome in outcomes) - min(outcome[2] for outcome in outcomes)
+            key = f"insert[{shards} shard{'s' if shards > 1 else ''}]"
+            results[key] = summarize(latencies, wall, errors)
+            print_result(key, results[key])
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--shards", type=lambda v: [int(s) for s in v.split(",")], default=[1, 2, 4, 8])
+    parser.add_argument("--leads", type=int, default=2000, help="leads written per shard count")
+    parser.add_argument("--processes", type=int, default=2)
+    parser.add_argument("--tasks", type=int, default=8, help="concurrent writers per process")
+    parser.add_argument("--output", type=Path, default=None, help="write results as JSON")
+    args = parser.parse_args()
+
+    results = run(args)
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(json.dumps({"results": results}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
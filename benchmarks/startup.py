@@ -0,0 +1,130 @@
+"""Measure worker cold-start cost against fixed budgets.
+
+Usage:
+    python -m benchmarks.startup [--runs 5]
+
+Reports the cumulative ``python -X importtime`` cost of ``import app.main``
+and the time from spawning uvicorn until it answers its first request, on a
+fresh database (schema is created) and again on the same database (schema
+fingerprint matches, DDL is skipped). Exits non-zero if a median exceeds its
+budget or if a module that should be deferred is imported at startup.
+"""
+
+import argparse
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import httpx
+
+from benchmarks.harness import BENCH_DIR, free_port
+
+IMPORT_BUDGET_MS = 1500.0
+FIRST_REQUEST_BUDGET_MS = 5000.0
+
+# Only needed on the auth path or when webhooks are configured.
+DEFERRED_MODULES = ("jose", "passlib", "httpx")
+
+_IMPORTTIME_LINE = re.compile(r"import time:\s+\d+ \|\s+(\d+) \| app\.main$", re.MULTILINE)
+
+
+def scratch_env(workdir: Path) -> dict[str, str]:
+    return {
+        "DATABASE_URL": f"sqlite+aiosqlite:///{workdir / 'startup.db'}",
+        "UPLOAD_DIR": str(workdir / "uploads"),
+    }
+
+
+def import_time_ms() -> float:
+    """Cumulative import time of ``app.main`` in a fresh interpreter."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import app.main"],
+        capture_output=True,
+        text=True,
+        cwd=BENCH_DIR.parent,
+        check=True,
+    )
+    return int(_IMPORTTIME_LINE.search(proc.stderr).group(1)) / 1000
+
+
+def eagerly_imported() -> list[str]:
+    """Deferred modules that ``import app.main`` nevertheless loads."""
+    code = (
+        "import json, sys, app.main; "
+        f"print(json.dumps([m for m in {DEFERRED_MODULES!r} if m in sys.modules]))"
+    )
+    proc = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, cwd=BENCH_DIR.parent, check=True
+    )
+    return json.loads(proc.stdout)
+
+
+def time_to_first_request_ms(env: dict[str, str]) -> float:
+    """Spawn uvicorn and return the milliseconds until ``/openapi.json`` answers."""
+    port = free_port()
+    start = time.perf_counter()
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port), "--log-level", "warning"],
+        env={**os.environ, **env},
+        stdout=subprocess.DEVNULL,
+        cwd=BENCH_DIR.parent,
+    )
+    try:
+        deadline = time.monotonic() + 30
+        while time.monotonic() < deadline:
+            try:
+                httpx.get(f"http://127.0.0.1:{port}/openapi.json", timeout=1).raise_for_status()
+                return (time.perf_counter() - start) * 1000
+            except httpx.TransportError:
+                if proc.poll() is not None:
+                    break
+                time.sleep(0.01)
+        raise RuntimeError("uvicorn did not start")
+    finally:
+        proc.terminate()
+        proc.wait()
+
+
+def run(runs: int) -> tuple[dict[str, float], list[str]]:
+    imports = [import_time_ms() for _ in range(runs)]
+    with tempfile.TemporaryDirectory(prefix="alma-bench-") as tmp:
+        env = scratch_env(Path(tmp))
+        cold = time_to_first_request_ms(env)
+        warm = [time_to_first_request_ms(env) for _ in range(runs)]
+    results = {
+        "import_ms": round(statistics.median(imports), 1),
+        "first_request_new_db_ms": round(cold, 1),
+        "first_request_ms": round(statistics.median(warm), 1),
+    }
+    failures = [f"{m} is imported at startup" for m in eagerly_imported()]
+    if results["import_ms"] > IMPORT_BUDGET_MS:
+        failures.append(f"import app.main took {results['import_ms']}ms (budget {IMPORT_BUDGET_MS:g}ms)")
+    if results["first_request_ms"] > FIRST_REQUEST_BUDGET_MS:
+        failures.append(
+            f"first request after {results['first_request_ms']}ms (budget {FIRST_REQUEST_BUDGET_MS:g}ms)"
+        )
+    return results, failures
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    results, failures = run(args.runs)
+    print(f"import app.main            {results['import_ms']:>8.1f}ms  (budget {IMPORT_BUDGET_MS:g}ms)")
+    print(f"first request, new db      {results['first_request_new_db_ms']:>8.1f}ms")
+    print(f"first request              {results['first_request_ms']:>8.1f}ms  (budget {FIRST_REQUEST_BUDGET_MS:g}ms)")
+    for failure in failures:
+        print(f"FAIL {failure}")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
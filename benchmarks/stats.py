@@ -0,0 +1,67 @@
+"""Latency summaries and baseline comparison for benchmark results."""
+
+import math
+
+
+def percentile(sorted_samples: list[float], pct: float) -> float:
+    """Nearest-rank percentile of an already-sorted sample list."""
+    if not sorted_samples:
+        return 0.0
+    rank = max(1, math.ceil(pct / 100 * len(sorted_samples)))
+    return sorted_samples[min(rank, len(sorted_samples)) - 1]
+
+
+def summarize(latencies: list[float], wall_seconds: float, errors: int = 0) -> dict:
+    """Summarize per-request latencies (seconds) into a result entry (milliseconds)."""
+    samples = sorted(latencies)
+    count = len(samples)
+    return {
+        "requests": count,
+        "errors": errors,
+        "wall_s": round(wall_seconds, 4),
+        "throughput_rps": round(count / wall_seconds, 2) if wall_seconds > 0 else 0.0,
+        "mean_ms": round(sum(samples) / count * 1000, 3) if count else 0.0,
+        "p50_ms": round(percentile(samples, 50) * 1000, 3),
+        "p95_ms": round(percentile(samples, 95) * 1000, 3),
+        "p99_ms": round(percentile(samples, 99) * 1000, 3),
+    }
+
+
+def compare(
+    current: dict[str, dict],
+    baseline: dict[str, dict],
+    max_latency_regression: float = 0.10,
+    max_throughput_regression: float = 0.10,
+) -> list[str]:
+    """Return a human-readable line for every scenario that regressed.
+
+    Thresholds are fractions: ``0.10`` allows p95 latency to grow and
+    throughput to drop by up to 10% before the scenario is flagged. Any
+    growth in failed requests is flagged too, since failures drop out of
+    the latency samples and can make p95 look better. Scenarios missing
+    from either side are ignored.
+    """
+    regressions = []
+    for name, result in current.items():
+        base = baseline.get(name)
+        if base is None:
+            continue
+        base_errors = base.get("errors", 0)
+        if result.get("errors", 0) > base_errors:
+            regressions.append(f"{name}: errors {base_errors} -> {result['errors']}")
+        if base["p95_ms"] > 0:
+            growth = result["p95_ms"] / base["p95_ms"] - 1
+            if growth > max_latency_regression:
+                regressions.append(
+                    f"{name}: p95 {base['p95_ms']:.2f}ms -> {result['p95_ms']:.2f}ms "
+                    f"(+{growth:.0%}, limit {max_latency_regression:.0%})"
+                )
+        if base["throughput_rps"] > 0:
+            drop = 1 - result["throughput_rps"] / base["throughput_rps"]
+            if drop > max_throughput_regression:
+                regressions.append(
+                    f"{name}: throughput {base['throughput_rps']:.1f} -> "
+                    f"{result['throughput_rps']:.1f} req/s "
+                    f"(-{drop:.0%}, limit {max_throughput_regression:.0%})"
+                )
+    return regressions
@@ -0,0 +1,117 @@
+"""Measure webhook delivery throughput against a local stub receiver.
+
+Usage:
+    python -m benchmarks.webhooks [--events 5000] [--batch-sizes 1,50] [--concurrency 1,8] [--latency-ms 5]
+
+For each batch size / per-subscriber concurrency pair, ``--events`` queued
+deliveries are drained by ``WebhookDispatcher`` into a stub HTTP server that
+waits ``--latency-ms`` before answering (standing in for a remote CRM).
+"""
+
+import argparse
+import asyncio
+import json
+import tempfile
+import threading
+import time
+import uuid
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+from benchmarks.harness import configure_environment, create_schema
+
+
+def _start_receiver(latency: float) -> ThreadingHTTPServer:
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_POST(self):
+            self.rfile.read(int(self.headers["Content-Length"]))
+            time.sleep(latency)
+            self.send_response(204)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+async def _queue(events: int) -> None:
+    from sqlalchemy import delete, insert
+
+    from app.core.database import engine
+    from app.models.webhook import WebhookDelivery
+
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
+    payload = json.dumps({"type": "lead.created", "data": {"lead": {"first_name": "Jane", "last_name": "Doe"}}})
+    rows = [
+        {"id": str(uuid.uuid4()), "subscriber": "bench", "event_type": "lead.created", "payload": payload, "next_attempt_at": now}
+        for _ in range(events)
+    ]
+    async with engine.begin() as conn:
+        await conn.execute(delete(WebhookDelivery))
+        await conn.execute(insert(WebhookDelivery), rows)
+
+
+async def _drain(url: str, batch_size: int, concurrency: int) -> int:
+    from app.core.config import WebhookSubscriber
+    from app.services.webhook_service import WebhookDispatcher
+
+    subscriber = WebhookSubscriber(name="bench", url=url, secret="bench-secret", max_concurrency=concurrency)
+    delivered = 0
+    async with WebhookDispatcher([subscriber], batch_size=batch_size) as dispatcher:
+        while processed := await dispatcher.run_once():
+            delivered += processed
+    return delivered
+
+
+async def run(args: argparse.Namespace) -> dict[str, dict]:
+    results: dict[str, dict] = {}
+    with tempfile.TemporaryDirectory(prefix="alma-bench-") as tmp:
+        configure_environment(Path(tmp))
+        await create_schema()
+        server = _start_receiver(args.latency_ms / 1000)
+        url = f"http://127.0.0.1:{server.server_port}/hook"
+        try:
+            for batch_size in args.batch_sizes:
+                for concurrency in args.concurrency:
+                    await _queue(args.events)
+                    start = time.perf_counter()
+                    delivered = await _drain(url, batch_size, concurrency)
+                    wall = time.perf_counter() - start
+                    key = f"batch={batch_size},conc={concurrency}"
+                    results[key] = {
+                        "deliveries": delivered,
+                        "wall_s": round(wall, 4),
+                        "deliveries_per_s": round(delivered / wall, 1),
+                    }
+                    print(f"{key:<20} {delivered:>7} deliveries  {wall:>7.2f}s  {delivered / wall:>10.1f} deliveries/s")
+        finally:
+            server.shutdown()
+            server.server_close()
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--events", type=int, default=5_000)
+    parser.add_argument("--batch-sizes", type=lambda v: [int(s) for s in v.split(",")], default=[1, 50])
+    parser.add_argument("--concurrency", type=lambda v: [int(s) for s in v.split(",")], default=[1, 8])
+    parser.add_argument("--latency-ms", type=float, default=5.0, help="stub receiver response delay")
+    parser.add_argument("--output", type=Path, default=None, help="write results as JSON")
+    args = parser.parse_args()
+
+    results = asyncio.run(run(args))
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(json.dumps({"results": results}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,219 @@
+"""Shared API client for the CLI scripts (standard library only).
+
+Connections are kept alive and reused through a small pool, so a script that
+makes many requests pays for the TCP handshake once per pooled connection
+rather than once per call. Responses are requested and decoded with gzip.
+"""
+
+import base64
+import gzip
+import http.client
+import json
+import mimetypes
+import os
+import queue
+import sys
+import urllib.parse
+import uuid
+from contextlib import contextmanager
+from typing import Self
+
+BASE_URL = os.environ.get("ALMA_BASE_URL", "http://localhost:8000")
+TOKEN_PATH = os.path.join(os.path.dirname(__file__), "..", ".token")
+
+# Errors that mean a pooled keep-alive connection was closed by the server.
+# They can arrive after the server has already acted on the request.
+STALE_CONNECTION_ERRORS = (
+    http.client.RemoteDisconnected,
+    BrokenPipeError,
+    ConnectionResetError,
+)
+# Only these are resent on a fresh connection after such an error, unless the
+# request carries an Idempotency-Key for the server to replay.
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+
+
+class ApiError(Exception):
+    def __init__(self, status: int, detail: str):
+        super().__init__(f"{status}: {detail}")
+        self.status = status
+        self.detail = detail
+
+
+def load_token() -> str:
+    if not os.path.exists(TOKEN_PATH):
+        print("Error: not logged in. Run `python scripts/login.py` first.")
+        sys.exit(1)
+    with open(TOKEN_PATH) as f:
+        return f.read().strip()
+
+
+def token_subject(token: str) -> str | None:
+    """The username a JWT was issued to, read without verifying it (the server does that)."""
+    try:
+        payload = token.split(".")[1]
+        return json.loads(base64.urlsafe_b64decode(payload + "=" * (-len(payload) % 4)))["sub"]
+    except (IndexError, ValueError, KeyError, TypeError):
+        return None
+
+
+def save_token(token: str) -> None:
+    with open(TOKEN_PATH, "w") as f:
+        f.write(token)
+
+
+def exit_on_error(e: ApiError, prefix: str = "Error") -> None:
+    if e.status in (401, 403):
+        print("Error: token expired or invalid. Run `python scripts/login.py` again.")
+    else:
+        print(f"{prefix} ({e.status}): {e.detail}")
+    sys.exit(1)
+
+
+def build_multipart(fields: dict[str, str], file_path: str | None = None):
+    """Build a multipart/form-data body using stdlib only."""
+    boundary = uuid.uuid4().hex
+    lines = []
+
+    for key, value in fields.items():
+        lines.append(f"--{boundary}".encode())
+        lines.append(f'Content-Disposition: form-data; name="{key}"'.encode())
+        lines.append(b"")
+        lines.append(value.encode())
+
+    if file_path:
+        filename = os.path.basename(file_path)
+        content_type = mimetypes.guess_type(filename)[0] or "application/octet-stream"
+        with open(file_path, "rb") as f:
+            file_data = f.read()
+        lines.append(f"--{boundary}".encode())
+        lines.append(
+            f'Content-Disposition: form-data; name="resume"; filename="{filename}"'.encode()
+        )
+        lines.append(f"Content-Type: {content_type}".encode())
+        lines.append(b"")
+        lines.append(file_data)
+
+    lines.append(f"--{boundary}--".encode())
+    body = b"\r\n".join(lines)
+    content_type = f"multipart/form-data; boundary={boundary}"
+    return body, content_type
+
+
+class AlmaClient:
+    """Thread-safe API client backed by a pool of keep-alive connections."""
+
+    def __init__(self, base_url: str = BASE_URL, token: str | None = None, pool_size: int = 4):
+        parsed = urllib.parse.urlsplit(base_url)
+        self.host = parsed.hostname or "localhost"
+        self.port = parsed.port
+        self.prefix = parsed.path.rstrip("/")
+        self.connection_class = (
+            http.client.HTTPSConnection if parsed.scheme == "https" else http.client.HTTPConnection
+        )
+        self.token = token
+        self.pool_size = pool_size
+        self._pool: queue.LifoQueue = queue.LifoQueue()
+        for _ in range(pool_size):
+            self._pool.put(None)  # connections are opened lazily
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def close(self) -> None:
+        while not self._pool.empty():
+            conn = self._pool.get_nowait()
+            if conn is not None:
+                conn.close()
+
+    @contextmanager
+    def _connection(self):
+        conn = self._pool.get()
+        if conn is None:
+            conn = self.connection_class(self.host, self.port, timeout=60)
+        try:
+            yield conn
+        except BaseException:
+            conn.close()
+            raise
+        finally:
+            self._pool.put(conn)
+
+    def request(
+        self,
+        method: str,
+        path: str,
+        params: dict | None = None,
+        json_body: dict | None = None,
+        body: bytes | None = None,
+        headers: dict[str, str] | None = None,
+    ):
+        """Send a request and return the decoded JSON body; raise ApiError on 4xx/5xx."""
+        url = self.prefix + path
+        if params:
+            url += "?" + urllib.parse.urlencode(params)
+        all_headers = {"Accept-Encoding": "gzip", **(headers or {})}
+        if self.token:
+            all_headers["Authorization"] = f"Bearer {self.token}"
+        if json_body is not None:
+            body = json.dumps(json_body).encode()
+            all_headers["Content-Type"] = "application/json"
+
+        with self._connection() as conn:
+            try:
+                status, data = self._send(conn, method, url, body, all_headers)
+            except http.client.CannotSendRequest:
+                # Nothing went out on the broken connection; reconnect once.
+                conn.close()
+                status, data = self._send(conn, method, url, body, all_headers)
+            except STALE_CONNECTION_ERRORS:
+                # The server closed an idle keep-alive connection. Reconnect
+                # once, but only if resending cannot repeat the request's effect.
+                if method not in IDEMPOTENT_METHODS and "Idempotency-Key" not in all_headers:
+                    raise
+                conn.close()
+                status, data = self._send(conn, method, url, body, all_headers)
+
+        try:
+            payload = json.loads(data) if data else None
+        except ValueError:
+            payload = None
+        if status >= 400:
+            detail = payload.get("detail", "Unknown error") if isinstance(payload, dict) else "Unknown error"
+            raise ApiError(status, str(detail))
+        return payload
+
+    @staticmethod
+    def _send(conn, method, url, body, headers) -> tuple[int, bytes]:
+        conn.request(method, url, body=body, headers=headers)
+        resp = conn.getresponse()
+        data = resp.read()
+        if resp.getheader("Content-Encoding", "").lower() == "gzip":
+            data = gzip.decompress(data)
+        return resp.status, data
+
+    def login(self, username: str, password: str) -> str:
+        data = self.request("POST", "/api/auth/login", json_body={"username": username, "password": password})
+        return data["access_token"]
+
+    def list_leads(self, updated_since: str | None = None, include_archived: bool = False) -> list[dict]:
+        params = {"updated_since": updated_since} if updated_since else {}
+        if include_archived:
+            params["include_archived"] = "true"
+        return self.request("GET", "/api/leads", params=params)
+
+    def submit_lead(self, fields: dict[str, str], resume_path: str) -> dict:
+        """Submit a lead; a resend after a dropped connection replays rather than duplicates it."""
+        body, content_type = build_multipart(fields, resume_path)
+        headers = {"Content-Type": content_type, "Idempotency-Key": uuid.uuid4().hex}
+        return self.request("POST", "/api/leads", body=body, headers=headers)
+
+    def claim_leads(self, count: int = 1, claimant: str | None = None) -> list[dict]:
+        body = {"count": count, **({"claimant": claimant} if claimant else {})}
+        return self.request("POST", "/api/leads/claim", json_body=body)
+
+    def update_state(self, lead_id: str, state: str) -> dict:
+        return self.request("PATCH", f"/api/leads/{lead_id}", json_body={"state": state})
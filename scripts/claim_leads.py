@@ -0,0 +1,43 @@
+#!/usr/bin/env python3
+"""Claim the next pending lead(s) to work on (requires login).
+
+Usage: python scripts/claim_leads.py [COUNT] [--as NAME]
+
+Leases the oldest unclaimed PENDING leads so no one else is handed them until
+the lease expires or the lead is marked REACHED_OUT (scripts/reach_out.py).
+"""
+
+import argparse
+
+from alma_client import AlmaClient, ApiError, exit_on_error, load_token
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Claim the next pending lead(s).")
+    parser.add_argument("count", nargs="?", type=int, default=1)
+    parser.add_argument("--as", dest="claimant", default=None, help="who the leads are claimed for (default: your login)")
+    args = parser.parse_args()
+
+    token = load_token()
+    try:
+        with AlmaClient(token=token, pool_size=1) as client:
+            leads = client.claim_leads(args.count, args.claimant)
+    except ApiError as e:
+        exit_on_error(e)
+
+    if not leads:
+        print("No unclaimed pending leads.")
+        return
+
+    print(f"{'ID':<36}  {'Name':<25} {'Email':<30} {'Leased until (UTC)':<19}")
+    print("-" * 114)
+    for lead in leads:
+        name = f"{lead['first_name']} {lead['last_name']}"
+        expires = lead["lease_expires_at"][:19].replace("T", " ")
+        print(f"{lead['id']:<36}  {name:<25} {lead['email']:<30} {expires:<19}")
+
+    print(f"\nClaimed {len(leads)} lead(s) for {leads[0]['claimed_by']}.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+"""Local SQLite cache of leads, kept fresh with incremental `updated_since` syncs."""
+
+import os
+import sqlite3
+from collections.abc import Callable
+from datetime import datetime, timedelta, timezone
+
+CACHE_PATH = os.path.join(os.path.dirname(__file__), "..", ".leads_cache.db")
+
+# Re-request a short window before the high-water mark so rows committed
+# slightly out of timestamp order are never missed; upserts make it harmless.
+SYNC_OVERLAP = timedelta(seconds=5)
+
+# Bump when the cached columns or the rows a sync fetches change: an older
+# cache is dropped and refilled by a full sync.
+CACHE_VERSION = 2
+
+COLUMNS = (
+    "id",
+    "first_name",
+    "last_name",
+    "email",
+    "resume_path",
+    "state",
+    "created_at",
+    "updated_at",
+    "claimed_by",
+    "lease_expires_at",
+)
+
+
+def open_cache(base_url: str) -> sqlite3.Connection:
+    """Open the cache, resetting it if it was filled from a different server."""
+    conn = sqlite3.connect(CACHE_PATH)
+    conn.row_factory = sqlite3.Row
+    if conn.execute("PRAGMA user_version").fetchone()[0] != CACHE_VERSION:
+        conn.executescript("DROP TABLE IF EXISTS leads; DROP TABLE IF EXISTS meta;")
+        conn.execute(f"PRAGMA user_version = {CACHE_VERSION}")
+    conn.executescript(
+        """
+        CREATE TABLE IF NOT EXISTS leads (
+            id TEXT PRIMARY KEY,
+            first_name TEXT NOT NULL,
+            last_name TEXT NOT NULL,
+            email TEXT NOT NULL,
+            resume_path TEXT,
+            state TEXT NOT NULL,
+            created_at TEXT NOT NULL,
+            updated_at TEXT NOT NULL,
+            claimed_by TEXT,
+            lease_expires_at TEXT
+        );
+        CREATE INDEX IF NOT EXISTS ix_leads_created_at ON leads (created_at);
+        CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+        """
+    )
+    if _get_meta(conn, "base_url") != base_url:
+        reset(conn)
+        _set_meta(conn, "base_url", base_url)
+        conn.commit()
+    return conn
+
+
+def reset(conn: sqlite3.Connection) -> None:
+    conn.execute("DELETE FROM leads")
+    conn.execute("DELETE FROM meta WHERE key = 'high_water_mark'")
+
+
+def _get_meta(conn: sqlite3.Connection, key: str) -> str | None:
+    row = conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+    return row["value"] if row else None
+
+
+def _set_meta(conn: sqlite3.Connection, key: str, value: str) -> None:
+    conn.execute(
+        "INSERT INTO meta (key, value) VALUES (?, ?) "
+        "ON CONFLICT (key) DO UPDATE SET value = excluded.value",
+        (key, value),
+    )
+
+
+def store(conn: sqlite3.Connection, leads: list[dict]) -> None:
+    """Upsert leads as returned by the API."""
+    conn.executemany(
+        f"INSERT INTO leads ({', '.join(COLUMNS)}) VALUES ({', '.join('?' * len(COLUMNS))}) "
+        "ON CONFLICT (id) DO UPDATE SET "
+        + ", ".join(f"{col} = excluded.{col}" for col in COLUMNS[1:]),
+        [tuple(lead[col] for col in COLUMNS) for lead in leads],
+    )
+
+
+def sync(conn: sqlite3.Connection, fetch: Callable[[str | None], list[dict]]) -> int:
+    """Pull leads changed since the last sync and return how many were received.
+
+    ``fetch`` is called with an ISO-8601 ``updated_since`` value, or ``None``
+    for the initial full download. It must include archived leads: archiving
+    moves a lead out of the default listing without changing ``updated_at``,
+    so a delta of the default listing could never tell the cache it is gone.
+    Keeping them makes the cache the same set a full download returns.
+    """
+    mark = _get_meta(conn, "high_water_mark")
+    since = None
+    if mark is not None:
+        since = (datetime.fromisoformat(mark) - SYNC_OVERLAP).isoformat()
+
+    leads = fetch(since)
+    store(conn, leads)
+    newest = max((lead["updated_at"] for lead in leads), default=None, key=datetime.fromisoformat)
+    if newest is not None and (mark is None or datetime.fromisoformat(newest) > datetime.fromisoformat(mark)):
+        _set_meta(conn, "high_water_mark", newest)
+    conn.commit()
+    return len(leads)
+
+
+def cached_leads(conn: sqlite3.Connection, state: str | None = None) -> list[dict]:
+    query = "SELECT * FROM leads"
+    params: tuple = ()
+    if state is not None:
+        query += " WHERE state = ?"
+        params = (state,)
+    query += " ORDER BY created_at DESC"
+    return [dict(row) for row in conn.execute(query, params)]
+
+
+def active_claimant(lead: dict, now: datetime | None = None) -> str | None:
+    """Who holds ``lead``'s work-queue lease, or None if it is unclaimed or the lease ran out."""
+    if lead["claimed_by"] is None or lead["lease_expires_at"] is None:
+        return None
+    # The API reports naive UTC timestamps.
+    now = now or datetime.now(timezone.utc).replace(tzinfo=None)
+    return lead["claimed_by"] if datetime.fromisoformat(lead["lease_expires_at"]) > now else None
@@ -1,53 +1,40 @@
 #!/usr/bin/env python3
-"""List all leads (requires login)."""
+"""List all leads (requires login).
 
-import json
-import os
-import sys
-import urllib.request
-import urllib.error
-
-BASE_URL = os.environ.get("ALMA_BASE_URL", "http://localhost:8000")
-TOKEN_PATH = os.path.join(os.path.dirname(__file__), "..", ".token")
+Leads are cached locally in .leads_cache.db; each run downloads only the leads
+changed since the previous sync. Pass --full to discard the cache and refetch.
+"""
 
+import sys
+from functools import partial
 
-def load_token() -> str:
-    if not os.path.exists(TOKEN_PATH):
-        print("Error: not logged in. Run `python scripts/login.py` first.")
-        sys.exit(1)
-    with open(TOKEN_PATH) as f:
-        return f.read().strip()
+from alma_client import BASE_URL, AlmaClient, ApiError, exit_on_error, load_token
+from lead_cache import active_claimant, cached_leads, open_cache, reset, sync
 
 
 def main():
     token = load_token()
 
-    req = urllib.request.Request(
-        f"{BASE_URL}/api/leads",
-        headers={"Authorization": f"Bearer {token}"},
-        method="GET",
-    )
-
+    cache = open_cache(BASE_URL)
+    if "--full" in sys.argv[1:]:
+        reset(cache)
     try:
-        with urllib.request.urlopen(req) as resp:
-            leads = json.loads(resp.read())
-    except urllib.error.HTTPError as e:
-        if e.code in (401, 403):
-            print("Error: token expired or invalid. Run `python scripts/login.py` again.")
-        else:
-            detail = json.loads(e.read()).get("detail", "Unknown error")
-            print(f"Error ({e.code}): {detail}")
-        sys.exit(1)
+        with AlmaClient(token=token, pool_size=1) as client:
+            sync(cache, partial(client.list_leads, include_archived=True))
+    except ApiError as e:
+        exit_on_error(e)
+    leads = cached_leads(cache)
 
     if not leads:
         print("No leads found.")
         return
 
-    print(f"{'#':<4} {'ID':<36}  {'Name':<25} {'Email':<30} {'State':<12}")
-    print("-" * 110)
+    print(f"{'#':<4} {'ID':<36}  {'Name':<25} {'Email':<30} {'State':<12} {'Claimed by':<20}")
+    print("-" * 131)
     for i, lead in enumerate(leads, 1):
         name = f"{lead['first_name']} {lead['last_name']}"
-        print(f"{i:<4} {lead['id']:<36}  {name:<25} {lead['email']:<30} {lead['state']:<12}")
+        claimant = active_claimant(lead) or ""
+        print(f"{i:<4} {lead['id']:<36}  {name:<25} {lead['email']:<30} {lead['state']:<12} {claimant:<20}")
 
     print(f"\nTotal: {len(leads)} lead(s)")
 
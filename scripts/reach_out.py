@@ -1,94 +1,130 @@
 #!/usr/bin/env python3
-"""Mark a lead as REACHED_OUT (requires login)."""
+"""Mark one or more leads as REACHED_OUT (requires login).
 
-import json
-import os
+Usage: python scripts/reach_out.py [SELECTION] [--as NAME]
+
+SELECTION picks pending leads by number, e.g. "3", "1,4,7-10" or "all".
+Without it you are prompted after the pending list is shown. Leads claimed
+by someone else (scripts/claim_leads.py) are left out while their lease
+runs; your own claims are marked. Selected leads are updated concurrently
+over a small pool of keep-alive connections.
+"""
+
+import argparse
+import http.client
 import sys
-import urllib.request
-import urllib.error
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import partial
 
-BASE_URL = os.environ.get("ALMA_BASE_URL", "http://localhost:8000")
-TOKEN_PATH = os.path.join(os.path.dirname(__file__), "..", ".token")
+from alma_client import BASE_URL, AlmaClient, ApiError, exit_on_error, load_token, token_subject
+from lead_cache import active_claimant, cached_leads, open_cache, store, sync
 
+CONCURRENCY = 8
 
-def load_token() -> str:
-    if not os.path.exists(TOKEN_PATH):
-        print("Error: not logged in. Run `python scripts/login.py` first.")
-        sys.exit(1)
-    with open(TOKEN_PATH) as f:
-        return f.read().strip()
-
-
-def fetch_leads(token: str) -> list[dict]:
-    req = urllib.request.Request(
-        f"{BASE_URL}/api/leads",
-        headers={"Authorization": f"Bearer {token}"},
-        method="GET",
-    )
-    try:
-        with urllib.request.urlopen(req) as resp:
-            return json.loads(resp.read())
-    except urllib.error.HTTPError as e:
-        if e.code in (401, 403):
-            print("Error: token expired or invalid. Run `python scripts/login.py` again.")
-        else:
-            detail = json.loads(e.read()).get("detail", "Unknown error")
-            print(f"Error ({e.code}): {detail}")
-        sys.exit(1)
+
+def parse_selection(choice: str, count: int) -> list[int]:
+    """Turn "1,3-5" or "all" into sorted zero-based indexes; raise ValueError if invalid."""
+    choice = choice.strip().lower()
+    if choice in ("all", "a", "*"):
+        return list(range(count))
+
+    selected: set[int] = set()
+    for part in choice.split(","):
+        part = part.strip()
+        if not part:
+            continue
+        start, sep, end = part.partition("-")
+        first = int(start)
+        last = int(end) if sep else first
+        if first < 1 or last > count or first > last:
+            raise ValueError(part)
+        selected.update(range(first - 1, last))
+    if not selected:
+        raise ValueError(choice)
+    return sorted(selected)
 
 
 def main():
-    token = load_token()
-    leads = fetch_leads(token)
-
-    pending = [l for l in leads if l["state"] == "PENDING"]
-    if not pending:
-        print("No pending leads to reach out to.")
-        return
-
-    print("Pending leads:\n")
-    print(f"  {'#':<4} {'Name':<25} {'Email':<30}")
-    print(f"  {'-'*60}")
-    for i, lead in enumerate(pending, 1):
-        name = f"{lead['first_name']} {lead['last_name']}"
-        print(f"  {i:<4} {name:<25} {lead['email']:<30}")
-
-    print()
-    choice = input(f"Select a lead to mark as REACHED_OUT (1-{len(pending)}): ").strip()
-
-    try:
-        idx = int(choice) - 1
-        if idx < 0 or idx >= len(pending):
-            raise ValueError
-    except ValueError:
-        print("Invalid selection.")
-        sys.exit(1)
+    parser = argparse.ArgumentParser(description="Mark pending leads as REACHED_OUT.")
+    parser.add_argument("selection", nargs="*", help='lead numbers, e.g. "3", "1,4,7-10" or "all"')
+    parser.add_argument("--as", dest="claimant", default=None, help="whose claims count as yours (default: your login)")
+    args = parser.parse_args()
 
-    selected = pending[idx]
-    lead_id = selected["id"]
-
-    payload = json.dumps({"state": "REACHED_OUT"}).encode()
-    req = urllib.request.Request(
-        f"{BASE_URL}/api/leads/{lead_id}",
-        data=payload,
-        headers={
-            "Authorization": f"Bearer {token}",
-            "Content-Type": "application/json",
-        },
-        method="PATCH",
-    )
-
-    try:
-        with urllib.request.urlopen(req) as resp:
-            data = json.loads(resp.read())
-    except urllib.error.HTTPError as e:
-        detail = json.loads(e.read()).get("detail", "Unknown error")
-        print(f"\nFailed ({e.code}): {detail}")
+    token = load_token()
+    me = args.claimant or token_subject(token)
+    cache = open_cache(BASE_URL)
+
+    with AlmaClient(token=token, pool_size=CONCURRENCY) as client:
+        try:
+            sync(cache, partial(client.list_leads, include_archived=True))
+        except ApiError as e:
+            exit_on_error(e)
+
+        pending = []
+        claimed_by_others = 0
+        for lead in cached_leads(cache, state="PENDING"):
+            claimant = active_claimant(lead)
+            if claimant is not None and claimant != me:
+                claimed_by_others += 1
+            else:
+                pending.append({**lead, "yours": claimant is not None})
+        hidden = f" ({claimed_by_others} claimed by others not shown)" if claimed_by_others else ""
+        if not pending:
+            print(f"No pending leads to reach out to.{hidden}")
+            return
+
+        print(f"Pending leads{hidden}:\n")
+        print(f"  {'#':<4} {'Name':<25} {'Email':<30} {'Claimed':<7}")
+        print(f"  {'-'*68}")
+        for i, lead in enumerate(pending, 1):
+            name = f"{lead['first_name']} {lead['last_name']}"
+            print(f"  {i:<4} {name:<25} {lead['email']:<30} {'yours' if lead['yours'] else '':<7}")
+
+        print()
+        if args.selection:
+            choice = " ".join(args.selection)
+        else:
+            choice = input(
+                f"Select leads to mark as REACHED_OUT (e.g. 1,3-5 or all; 1-{len(pending)}): "
+            )
+
+        try:
+            selected = [pending[i] for i in parse_selection(choice, len(pending))]
+        except ValueError:
+            print("Invalid selection.")
+            sys.exit(1)
+
+        done = 0
+        failed = 0
+
+        def reach_out(lead: dict) -> dict:
+            return client.update_state(lead["id"], "REACHED_OUT")
+
+        with ThreadPoolExecutor(max_workers=CONCURRENCY) as pool:
+            futures = {pool.submit(reach_out, lead): lead for lead in selected}
+            for future in as_completed(futures):
+                lead = futures[future]
+                name = f"{lead['first_name']} {lead['last_name']}"
+                try:
+                    data = future.result()
+                except ApiError as e:
+                    failed += 1
+                    result = f"failed ({e.status}): {e.detail}"
+                except (OSError, http.client.HTTPException) as e:  # dropped or garbled response
+                    failed += 1
+                    result = f"failed: {e}"
+                else:
+                    done += 1
+                    store(cache, [data])
+                    result = "REACHED_OUT"
+                print(f"  [{done + failed}/{len(selected)}] {name:<25} {result}")
+
+    cache.commit()
+    print(f"\nDone! {done} lead(s) marked as REACHED_OUT.", end="")
+    print(f" {failed} failed." if failed else "")
+    if failed:
         sys.exit(1)
 
-    name = f"{data['first_name']} {data['last_name']}"
-    print(f"\nDone! {name} marked as REACHED_OUT.")
-
 
 if __name__ == "__main__":
     main()
@@ -14,10 +14,14 @@ TEST_PASSWORD = "testpassword"
 settings.INTERNAL_USER_PASSWORD_HASH = hash_password(TEST_PASSWORD)
 settings.INTERNAL_USER_USERNAME = "admin"
 settings.JWT_SECRET_KEY = "test-secret"
+# Tests submit many leads from one client; test_admission covers the limiter.
+settings.ADMISSION_RATE_PER_MINUTE = 0
 
 
 @pytest.fixture()
 async def db_session():
+    import app.main  # noqa: F401  (registers every model on Base.metadata)
+
     engine = create_async_engine("sqlite+aiosqlite://", echo=False)
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
@@ -31,6 +35,18 @@ async def db_session():
     await engine.dispose()
 
 
+@pytest.fixture()
+async def file_db(tmp_path):
+    """Session factory for a file-backed database, for code that opens its own sessions."""
+    import app.main  # noqa: F401
+
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'leads.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    yield async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    await engine.dispose()
+
+
 @pytest.fixture()
 async def client(db_session: AsyncSession, tmp_path):
     from app.core.database import get_db
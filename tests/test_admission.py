@@ -0,0 +1,118 @@
+import io
+
+import pytest
+from httpx import AsyncClient
+
+from app.core.admission import MULTIPART_OVERHEAD, AdmissionController, admission
+from app.core.config import settings
+from app.services.file_service import MAX_FILE_SIZE
+
+FAKE_PDF = b"%PDF-1.4 fake pdf content"
+
+
+def _controller(**overrides) -> AdmissionController:
+    options = {
+        "max_in_flight": 8,
+        "staff_reserved": 2,
+        "max_uploads": 4,
+        "rate_per_minute": 0,
+        "burst": 1,
+        "min_free_disk_mb": 0,
+    }
+    return AdmissionController(**{**options, **overrides})
+
+
+def test_rejects_missing_or_oversized_content_length():
+    controller = _controller()
+    assert controller.admit(True, "1.2.3.4", None).status == 411
+    assert controller.admit(True, "1.2.3.4", MAX_FILE_SIZE + MULTIPART_OVERHEAD + 1).status == 413
+    assert controller.admit(True, "1.2.3.4", 1024) is None
+
+
+def test_token_bucket_is_per_client():
+    controller = _controller(rate_per_minute=60, burst=2)
+    assert controller.admit(True, "1.1.1.1", 100) is None
+    assert controller.admit(True, "1.1.1.1", 100) is None
+    rejection = controller.admit(True, "1.1.1.1", 100)
+    assert (rejection.status, rejection.retry_after) == (429, 1)
+    assert controller.admit(True, "2.2.2.2", 100) is None
+    assert controller.stats()["shed"] == {"rate_limited": 1}
+
+
+def test_upload_cap_and_staff_reserve():
+    controller = _controller(max_in_flight=4, staff_reserved=2, max_uploads=3)
+    assert controller.admit(True, "ip", 100) is None
+    assert controller.admit(True, "ip", 100) is None
+    # Two slots are left, but both are reserved for non-submission routes.
+    assert controller.admit(True, "ip", 100).status == 503
+    assert controller.admit(False, "ip", None) is None
+    assert controller.admit(False, "ip", None) is None
+    assert controller.admit(False, "ip", None).status == 503
+
+    controller.release(False)
+    controller.release(False)
+    controller.release(True)
+    assert controller.admit(True, "ip", 100) is None
+    assert controller.stats()["uploads_in_flight"] == 2
+
+
+def test_rejects_when_upload_dir_is_nearly_full():
+    controller = _controller(min_free_disk_mb=10**12)
+    rejection = controller.admit(True, "ip", 100)
+    assert (rejection.status, rejection.reason, rejection.retry_after) == (503, "disk_full", 60)
+    assert controller.in_flight == 0
+
+
+def test_missing_upload_dir_is_not_an_error(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "UPLOAD_DIR", str(tmp_path / "not" / "created"))
+    assert _controller(min_free_disk_mb=1).admit(True, "ip", 100) is None
+    assert _controller(min_free_disk_mb=10**12).admit(True, "ip", 100).reason == "disk_full"
+
+
+def test_shed_submissions_keep_their_rate_limit_token():
+    controller = _controller(max_uploads=1, rate_per_minute=60, burst=1)
+    assert controller.admit(True, "busy", 100) is None
+    assert controller.admit(True, "ip", 100).reason == "overloaded"
+    controller.release(True)
+    # The overloaded attempt did not use up the client's only token.
+    assert controller.admit(True, "ip", 100) is None
+
+
+@pytest.mark.asyncio
+async def test_overloaded_submissions_are_shed_but_staff_routes_work(
+    client: AsyncClient, auth_headers: dict, monkeypatch
+):
+    monkeypatch.setattr(admission, "max_uploads", 0)
+    before = admission.shed["overloaded"]
+
+    resp = await client.post(
+        "/api/leads",
+        data={"first_name": "Jane", "last_name": "Doe", "email": "jane@example.com"},
+        files={"resume": ("resume.pdf", io.BytesIO(FAKE_PDF), "application/pdf")},
+    )
+    assert resp.status_code == 503
+    assert resp.headers["retry-after"] == "1"
+
+    assert (await client.get("/api/leads", headers=auth_headers)).status_code == 200
+    resp = await client.get("/api/metrics", headers=auth_headers)
+    assert resp.status_code == 200
+    assert resp.json()["admission"]["shed"]["overloaded"] == before + 1
+    assert admission.in_flight == 0
+
+
+@pytest.mark.asyncio
+async def test_rate_limited_submissions_get_retry_after(client: AsyncClient, monkeypatch):
+    monkeypatch.setattr(admission, "rate_per_minute", 1)
+    monkeypatch.setattr(admission, "burst", 1)
+    monkeypatch.setattr(admission, "_buckets", type(admission._buckets)())
+
+    statuses = []
+    for i in range(2):
+        resp = await client.post(
+            "/api/leads",
+            data={"first_name": "Jane", "last_name": "Doe", "email": f"jane{i}@example.com"},
+            files={"resume": ("resume.pdf", io.BytesIO(FAKE_PDF), "application/pdf")},
+        )
+        statuses.append(resp.status_code)
+    assert statuses == [201, 429]
+    assert int(resp.headers["retry-after"]) >= 1
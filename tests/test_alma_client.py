@@ -0,0 +1,101 @@
+import gzip
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+from alma_client import AlmaClient, token_subject
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive, so the client pools connections
+
+    def log_message(self, *args) -> None:
+        pass
+
+    def _respond(self) -> None:
+        length = int(self.headers.get("Content-Length") or 0)
+        self.rfile.read(length)
+        self.server.seen.append((self.command, self.path, self.headers.get("Idempotency-Key")))
+        data = json.dumps({"path": self.path}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        if "gzip" in self.headers.get("Accept-Encoding", ""):
+            data = gzip.compress(data)
+            self.send_header("Content-Encoding", "gzip")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+        # Simulate the server's keep-alive timeout closing the idle connection.
+        self.close_connection = self.server.drop_after_response
+
+    do_GET = do_POST = _respond
+
+
+@pytest.fixture()
+def server():
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    httpd.seen = []
+    httpd.drop_after_response = False
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield httpd
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def _client(server) -> AlmaClient:
+    return AlmaClient(f"http://127.0.0.1:{server.server_address[1]}", pool_size=1)
+
+
+def test_decodes_gzip_and_reuses_connections(server):
+    with _client(server) as client:
+        assert client.request("GET", "/a") == {"path": "/a"}
+        assert client.request("GET", "/b", params={"x": "1"}) == {"path": "/b?x=1"}
+    assert [path for _, path, _ in server.seen] == ["/a", "/b?x=1"]
+
+
+def test_list_leads_can_include_archived(server):
+    with _client(server) as client:
+        client.list_leads()
+        client.list_leads("2025-01-01T00:00:00", include_archived=True)
+    assert [path for _, path, _ in server.seen] == [
+        "/api/leads",
+        "/api/leads?updated_since=2025-01-01T00%3A00%3A00&include_archived=true",
+    ]
+
+
+def test_reconnects_idempotent_requests_after_a_dropped_connection(server):
+    server.drop_after_response = True
+    with _client(server) as client:
+        for _ in range(3):
+            assert client.request("GET", "/leads") == {"path": "/leads"}
+        assert client.request("POST", "/keyed", headers={"Idempotency-Key": "k"}) == {"path": "/keyed"}
+    assert len(server.seen) == 4
+
+
+def test_does_not_resend_unkeyed_posts(server):
+    server.drop_after_response = True
+    with _client(server) as client:
+        client.request("GET", "/leads")
+        with pytest.raises(ConnectionError):
+            client.request("POST", "/api/leads/claim", json_body={"count": 1})
+        # The failed connection is replaced for the next request.
+        assert client.request("GET", "/leads") == {"path": "/leads"}
+
+
+def test_submit_lead_sends_a_fresh_idempotency_key(server, tmp_path):
+    resume = tmp_path / "resume.pdf"
+    resume.write_bytes(b"%PDF-1.4")
+    with _client(server) as client:
+        client.submit_lead({"first_name": "Ann"}, str(resume))
+        client.submit_lead({"first_name": "Ann"}, str(resume))
+    keys = [key for _, _, key in server.seen]
+    assert all(keys) and keys[0] != keys[1]
+
+
+def test_token_subject():
+    from app.core.security import create_access_token
+
+    assert token_subject(create_access_token("jane")) == "jane"
+    assert token_subject("not-a-jwt") is None
@@ -0,0 +1,95 @@
+import io
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.lead import Lead, LeadArchive
+from app.services.archive_service import archive_leads
+
+FAKE_PDF = b"%PDF-1.4 fake pdf content"
+
+
+async def _create_lead(client, email):
+    resp = await client.post(
+        "/api/leads",
+        data={"first_name": "Ann", "last_name": "Archive", "email": email},
+        files={"resume": ("resume.pdf", io.BytesIO(FAKE_PDF), "application/pdf")},
+    )
+    assert resp.status_code == 201
+    return resp.json()
+
+
+async def _age(db: AsyncSession, lead_id: str, days: int) -> None:
+    await db.execute(
+        update(Lead)
+        .where(Lead.id == lead_id)
+        .values(updated_at=datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(days=days))
+    )
+    await db.commit()
+
+
+@pytest.fixture()
+async def leads(client: AsyncClient, auth_headers: dict, db_session: AsyncSession):
+    old = await _create_lead(client, "old@example.com")
+    recent = await _create_lead(client, "recent@example.com")
+    pending = await _create_lead(client, "pending@example.com")
+    for lead in (old, recent):
+        await client.patch(f"/api/leads/{lead['id']}", json={"state": "REACHED_OUT"}, headers=auth_headers)
+    await _age(db_session, old["id"], 200)
+    await _age(db_session, pending["id"], 200)
+    return {"old": old, "recent": recent, "pending": pending}
+
+
+@pytest.mark.asyncio
+async def test_archive_moves_only_old_reached_out(leads: dict, db_session: AsyncSession):
+    archived = await archive_leads(db_session, timedelta(days=90), batch_size=1)
+    assert archived == 1
+
+    hot = set((await db_session.execute(select(Lead.id))).scalars())
+    cold = set((await db_session.execute(select(LeadArchive.id))).scalars())
+    assert hot == {leads["recent"]["id"], leads["pending"]["id"]}
+    assert cold == {leads["old"]["id"]}
+
+
+@pytest.mark.asyncio
+async def test_archive_in_batches(client: AsyncClient, auth_headers: dict, db_session: AsyncSession):
+    for i in range(5):
+        lead = await _create_lead(client, f"lead{i}@example.com")
+        await client.patch(f"/api/leads/{lead['id']}", json={"state": "REACHED_OUT"}, headers=auth_headers)
+        await _age(db_session, lead["id"], 100)
+
+    assert await archive_leads(db_session, timedelta(days=90), batch_size=2) == 5
+    assert (await db_session.execute(select(func.count()).select_from(Lead))).scalar_one() == 0
+
+
+@pytest.mark.asyncio
+async def test_get_lead_falls_through_to_archive(
+    client: AsyncClient, auth_headers: dict, leads: dict, db_session: AsyncSession
+):
+    await archive_leads(db_session, timedelta(days=90))
+
+    resp = await client.get(f"/api/leads/{leads['old']['id']}", headers=auth_headers)
+    assert resp.status_code == 200
+    assert resp.json()["state"] == "REACHED_OUT"
+    assert resp.json()["archived_at"] is not None
+
+    resp = await client.get(f"/api/leads/{leads['recent']['id']}", headers=auth_headers)
+    assert resp.json()["archived_at"] is None
+
+
+@pytest.mark.asyncio
+async def test_list_leads_include_archived(
+    client: AsyncClient, auth_headers: dict, leads: dict, db_session: AsyncSession
+):
+    await archive_leads(db_session, timedelta(days=90))
+
+    resp = await client.get("/api/leads", headers=auth_headers)
+    assert leads["old"]["id"] not in {lead["id"] for lead in resp.json()}
+
+    resp = await client.get("/api/leads", params={"include_archived": True}, headers=auth_headers)
+    data = resp.json()
+    assert {lead["id"] for lead in data} == {lead["id"] for lead in leads.values()}
+    assert [lead["created_at"] for lead in data] == sorted((lead["created_at"] for lead in data), reverse=True)
@@ -0,0 +1,59 @@
+import httpx
+
+from benchmarks.harness import measure
+from benchmarks.stats import compare, percentile, summarize
+
+
+def test_percentile_nearest_rank():
+    samples = [float(i) for i in range(1, 101)]
+    assert percentile(samples, 50) == 50.0
+    assert percentile(samples, 95) == 95.0
+    assert percentile(samples, 99) == 99.0
+    assert percentile([], 50) == 0.0
+
+
+def test_summarize_reports_throughput_and_percentiles():
+    result = summarize([0.01] * 99 + [0.5], wall_seconds=2.0, errors=1)
+    assert result["requests"] == 100
+    assert result["errors"] == 1
+    assert result["throughput_rps"] == 50.0
+    assert result["p50_ms"] == 10.0
+    assert result["p99_ms"] == 10.0
+    assert result["mean_ms"] == 14.9
+
+
+def test_compare_flags_regressions_over_threshold():
+    baseline = {"get": {"p95_ms": 10.0, "throughput_rps": 100.0}}
+    within = {"get": {"p95_ms": 10.5, "throughput_rps": 95.0}}
+    worse = {"get": {"p95_ms": 15.0, "throughput_rps": 50.0}}
+
+    assert compare(within, baseline) == []
+    regressions = compare(worse, baseline, max_latency_regression=0.2)
+    assert len(regressions) == 2
+    assert all(line.startswith("get:") for line in regressions)
+
+
+def test_compare_flags_new_errors():
+    baseline = {"get": {"p95_ms": 10.0, "throughput_rps": 100.0, "errors": 1}}
+    failing = {"get": {"p95_ms": 5.0, "throughput_rps": 100.0, "errors": 40}}
+
+    assert compare(failing, baseline) == ["get: errors 1 -> 40"]
+    assert compare({"get": {**failing["get"], "errors": 1}}, baseline) == []
+
+
+def test_compare_ignores_new_scenarios():
+    assert compare({"new": {"p95_ms": 1.0, "throughput_rps": 1.0}}, {}) == []
+
+
+async def test_measure_counts_transport_errors():
+    async def ok():
+        return httpx.Response(200)
+
+    async def failed():
+        return httpx.Response(503)
+
+    async def timed_out():
+        raise httpx.ReadTimeout("timed out")
+
+    result = await measure([ok, failed, timed_out, ok], concurrency=2)
+    assert (result["requests"], result["errors"]) == (2, 2)
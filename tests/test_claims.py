@@ -0,0 +1,135 @@
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from app.core.database import ensure_schema, make_sessionmaker, shard_urls
+from app.models.lead import Lead, LeadState
+from app.services.claim_service import claim_leads
+
+START = datetime(2026, 1, 1)
+
+
+def _leads(count: int) -> list[Lead]:
+    return [
+        Lead(
+            first_name="Quinn",
+            last_name=f"Queue{i}",
+            email=f"quinn{i}@example.com",
+            resume_path=f"r{i}.pdf",
+            created_at=START + timedelta(minutes=i),
+        )
+        for i in range(count)
+    ]
+
+
+async def _add_leads(db: AsyncSession, count: int) -> list[str]:
+    leads = _leads(count)
+    db.add_all(leads)
+    await db.commit()
+    return [lead.id for lead in leads]
+
+
+@pytest.mark.asyncio
+async def test_claim_leases_oldest_pending_leads(client: AsyncClient, db_session, auth_headers):
+    ids = await _add_leads(db_session, 3)
+
+    resp = await client.post("/api/leads/claim", json={"count": 2}, headers=auth_headers)
+    assert resp.status_code == 200
+    claimed = resp.json()
+    assert [lead["id"] for lead in claimed] == ids[:2]
+    assert {lead["claimed_by"] for lead in claimed} == {"admin"}
+    assert all(lead["lease_expires_at"] for lead in claimed)
+
+    resp = await client.post("/api/leads/claim", json={"claimant": "attorney@example.com"}, headers=auth_headers)
+    assert [(lead["id"], lead["claimed_by"]) for lead in resp.json()] == [(ids[2], "attorney@example.com")]
+
+    resp = await client.post("/api/leads/claim", headers=auth_headers)
+    assert resp.status_code == 200
+    assert resp.json() == []
+
+
+@pytest.mark.asyncio
+async def test_claim_requires_auth_and_bounded_count(client: AsyncClient, auth_headers):
+    assert (await client.post("/api/leads/claim")).status_code in (401, 403)
+    resp = await client.post("/api/leads/claim", json={"count": 0}, headers=auth_headers)
+    assert resp.status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_reaching_out_releases_the_lease(client: AsyncClient, db_session, auth_headers):
+    [lead_id] = await _add_leads(db_session, 1)
+    await client.post("/api/leads/claim", headers=auth_headers)
+
+    resp = await client.patch(f"/api/leads/{lead_id}", json={"state": "REACHED_OUT"}, headers=auth_headers)
+    assert resp.status_code == 200
+    assert resp.json()["claimed_by"] is None
+    assert resp.json()["lease_expires_at"] is None
+
+
+@pytest.mark.asyncio
+async def test_expired_leases_are_reclaimed(db_session):
+    ids = await _add_leads(db_session, 2)
+    assert [lead.id for lead in await claim_leads(db_session, "first", count=2)] == ids
+
+    await db_session.execute(
+        update(Lead).where(Lead.id == ids[1]).values(lease_expires_at=datetime(2020, 1, 1))
+    )
+    claimed = await claim_leads(db_session, "second", count=2)
+    assert [(lead.id, lead.claimed_by) for lead in claimed] == [(ids[1], "second")]
+
+
+@pytest.mark.asyncio
+async def test_concurrent_claimers_never_share_a_lead(file_db):
+    async with file_db() as session:
+        ids = await _add_leads(session, 300)
+
+    claims: dict[str, list[str]] = {}
+
+    async def claimer(name: str) -> None:
+        claims[name] = []
+        while True:
+            async with file_db() as session:
+                leads = await claim_leads(session, name, count=3)
+                await session.commit()
+            if not leads:
+                return
+            claims[name] += [lead.id for lead in leads]
+
+    await asyncio.gather(*(claimer(f"attorney{i}") for i in range(40)))
+
+    claimed = [lead_id for owned in claims.values() for lead_id in owned]
+    assert len(claimed) == len(set(claimed))
+    assert sorted(claimed) == sorted(ids)
+    async with file_db() as session:
+        owners = dict((await session.execute(select(Lead.id, Lead.claimed_by))).all())
+    assert all(owners[lead_id] == name for name, owned in claims.items() for lead_id in owned)
+
+
+@pytest.mark.asyncio
+async def test_sharded_claim_takes_globally_oldest(tmp_path):
+    import app.main  # noqa: F401
+
+    engines = [create_async_engine(u) for u in shard_urls(f"sqlite+aiosqlite:///{tmp_path / 'alma.db'}", 3)]
+    try:
+        for engine in engines:
+            await ensure_schema(engine)
+        session_factory = make_sessionmaker(engines)
+        async with session_factory() as session:
+            ids = await _add_leads(session, 12)
+
+        async with session_factory() as session:
+            claimed = await claim_leads(session, "sharded", count=4)
+            await session.commit()
+        assert [lead.id for lead in claimed] == ids[:4]
+
+        async with session_factory() as session:
+            rows = (await session.execute(select(Lead.id).where(Lead.claimed_by.is_not(None)))).scalars()
+            assert sorted(rows) == sorted(ids[:4])
+            assert all(lead.state == LeadState.PENDING for lead in claimed)
+    finally:
+        for engine in engines:
+            await engine.dispose()
@@ -0,0 +1,118 @@
+import gzip
+import io
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+from starlette.applications import Starlette
+from starlette.responses import Response, StreamingResponse
+from starlette.routing import Route
+
+from app.core.compression import CompressionMiddleware, choose_encoding
+
+FAKE_PDF = b"%PDF-1.4 fake pdf content"
+
+
+def test_choose_encoding_honours_q_values_and_preference():
+    preference = ["zstd", "br", "gzip"]
+    assert choose_encoding("gzip, deflate, br", preference) == "br"
+    assert choose_encoding("gzip;q=1.0, br;q=0.5", preference) == "gzip"
+    assert choose_encoding("br;q=0, gzip", preference) == "gzip"
+    assert choose_encoding("*", ["gzip"]) == "gzip"
+    assert choose_encoding("*;q=0", ["gzip"]) is None
+    assert choose_encoding("identity", preference) is None
+    assert choose_encoding("", preference) is None
+
+
+def _raw_client(app) -> AsyncClient:
+    # Keep the compressed bytes: httpx would otherwise decode them.
+    return AsyncClient(transport=ASGITransport(app=app), base_url="http://test")
+
+
+async def _raw_get(client: AsyncClient, path: str, accept: str = "gzip"):
+    async with client.stream("GET", path, headers={"Accept-Encoding": accept}) as resp:
+        return resp, b"".join([chunk async for chunk in resp.aiter_raw()])
+
+
+def _app(**kwargs) -> CompressionMiddleware:
+    big = b'{"leads": [' + b'{"first_name": "Alice"},' * 2000 + b"{}]}"
+
+    async def stream():
+        for _ in range(50):
+            yield b"first_name,last_name,email\n" * 100
+
+    routes = [
+        Route("/big", lambda request: Response(big, media_type="application/json")),
+        Route("/small", lambda request: Response(b'{"ok": true}', media_type="application/json")),
+        Route("/pdf", lambda request: Response(b"%PDF" + b"\0" * 10_000, media_type="application/pdf")),
+        Route("/stream", lambda request: StreamingResponse(stream(), media_type="text/csv")),
+    ]
+    return CompressionMiddleware(Starlette(routes=routes), **kwargs)
+
+
+@pytest.mark.asyncio
+async def test_compresses_large_json_with_exact_length():
+    async with _raw_client(_app(minimum_size=1024)) as client:
+        resp, raw = await _raw_get(client, "/big")
+    assert resp.headers["content-encoding"] == "gzip"
+    assert resp.headers["vary"] == "Accept-Encoding"
+    assert int(resp.headers["content-length"]) == len(raw)
+    assert gzip.decompress(raw).startswith(b'{"leads": [')
+    assert len(raw) < 1000
+
+
+@pytest.mark.asyncio
+async def test_skips_small_bodies_binary_types_and_identity():
+    async with _raw_client(_app(minimum_size=1024)) as client:
+        small, small_raw = await _raw_get(client, "/small")
+        pdf, pdf_raw = await _raw_get(client, "/pdf")
+        identity, _ = await _raw_get(client, "/big", accept="identity")
+    assert "content-encoding" not in small.headers
+    assert small_raw == b'{"ok": true}'
+    assert "content-encoding" not in pdf.headers
+    assert pdf_raw.startswith(b"%PDF")
+    assert "content-encoding" not in identity.headers
+
+
+@pytest.mark.asyncio
+async def test_head_and_empty_bodies_are_not_encoded():
+    async def declared_but_empty(scope, receive, send):
+        headers = [(b"content-type", b"application/json"), (b"content-length", b"5000")]
+        await send({"type": "http.response.start", "status": 200, "headers": headers})
+        await send({"type": "http.response.body", "body": b""})
+
+    async with _raw_client(_app(minimum_size=1024)) as client:
+        get, raw = await _raw_get(client, "/big")
+        head = await client.head("/big", headers={"Accept-Encoding": "gzip"})
+    assert "content-encoding" not in head.headers
+    assert int(head.headers["content-length"]) == len(gzip.decompress(raw)) != int(get.headers["content-length"])
+
+    async with _raw_client(CompressionMiddleware(declared_but_empty, minimum_size=1024)) as client:
+        empty, body = await _raw_get(client, "/")
+    assert "content-encoding" not in empty.headers
+    assert (empty.headers["content-length"], body) == ("5000", b"")
+
+
+@pytest.mark.asyncio
+async def test_stream_compresses_streaming_responses_off_loop():
+    # thread_min_size=0 sends every chunk through asyncio.to_thread.
+    async with _raw_client(_app(minimum_size=1024, thread_min_size=0)) as client:
+        resp, raw = await _raw_get(client, "/stream")
+    assert resp.headers["content-encoding"] == "gzip"
+    assert "content-length" not in resp.headers
+    assert gzip.decompress(raw) == b"first_name,last_name,email\n" * 5000
+
+
+@pytest.mark.asyncio
+async def test_lead_listing_is_gzipped(client: AsyncClient, auth_headers: dict):
+    for i in range(20):
+        resp = await client.post(
+            "/api/leads",
+            data={"first_name": "Zip", "last_name": f"Lead{i}", "email": f"zip{i}@example.com"},
+            files={"resume": ("resume.pdf", io.BytesIO(FAKE_PDF), "application/pdf")},
+        )
+        assert resp.status_code == 201
+
+    resp = await client.get("/api/leads", headers={**auth_headers, "Accept-Encoding": "gzip"})
+    assert resp.headers["content-encoding"] == "gzip"
+    assert int(resp.headers["content-length"]) < len(resp.content)
+    assert len(resp.json()) == 20
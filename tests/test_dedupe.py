@@ -0,0 +1,193 @@
+import io
+from datetime import datetime, timedelta
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.lead import Lead, LeadArchive, LeadState
+from app.services.dedupe_service import (
+    MAX_CANDIDATES,
+    assign_keys_and_link,
+    canonical_email,
+    dedupe_existing,
+    get_duplicate_ids,
+    name_key,
+    soundex,
+)
+
+FAKE_PDF = b"%PDF-1.4 fake pdf content"
+
+
+async def _create_lead(client, first_name, last_name, email):
+    resp = await client.post(
+        "/api/leads",
+        data={"first_name": first_name, "last_name": last_name, "email": email},
+        files={"resume": ("resume.pdf", io.BytesIO(FAKE_PDF), "application/pdf")},
+    )
+    assert resp.status_code == 201
+    return resp.json()
+
+
+@pytest.mark.parametrize(
+    "name,code",
+    [("Robert", "R163"), ("Rupert", "R163"), ("Ashcraft", "A261"), ("Tymczak", "T522"), ("Pfister", "P236"), ("Müller", "M460"), ("", "")],
+)
+def test_soundex(name, code):
+    assert soundex(name) == code
+
+
+def test_canonical_email():
+    assert canonical_email(" J.Doe+promo@GoogleMail.com ") == "jdoe@gmail.com"
+    assert canonical_email("J.Doe+promo@Example.com") == "j.doe@example.com"
+
+
+def test_name_key():
+    assert name_key("jon", "Smyth") == name_key("John", "Smith") == "S530:J"
+    assert name_key("123", "Smith") is None
+
+
+@pytest.mark.asyncio
+async def test_email_variants_are_linked(client: AsyncClient, auth_headers: dict):
+    first = await _create_lead(client, "Jane", "Doe", "jane.doe@gmail.com")
+    second = await _create_lead(client, "jane", "doe", "Jane.Doe+retry@Gmail.com")
+    other = await _create_lead(client, "Janet", "Roe", "janet@example.com")
+
+    resp = await client.get(f"/api/leads/{second['id']}", headers=auth_headers)
+    assert resp.json()["canonical_lead_id"] == first["id"]
+    assert resp.json()["duplicate_ids"] == [first["id"]]
+
+    resp = await client.get(f"/api/leads/{first['id']}", headers=auth_headers)
+    assert resp.json()["canonical_lead_id"] is None
+    assert resp.json()["duplicate_ids"] == [second["id"]]
+
+    resp = await client.get(f"/api/leads/{other['id']}", headers=auth_headers)
+    assert resp.json()["duplicate_ids"] == []
+
+
+@pytest.mark.asyncio
+async def test_similar_names_are_linked(client: AsyncClient, auth_headers: dict):
+    jon = await _create_lead(client, "Jon", "Smith", "jon@example.com")
+    john = await _create_lead(client, "John", "Smyth", "john.smyth@example.org")
+    mary = await _create_lead(client, "Mary", "Smith", "mary@example.com")
+    jane = await _create_lead(client, "Jane", "Smith", "jane@example.com")
+
+    resp = await client.get(f"/api/leads/{john['id']}", headers=auth_headers)
+    assert resp.json()["canonical_lead_id"] == jon["id"]
+    for lead in (mary, jane):
+        resp = await client.get(f"/api/leads/{lead['id']}", headers=auth_headers)
+        assert resp.json()["canonical_lead_id"] is None
+
+
+@pytest.mark.asyncio
+async def test_dedupe_existing_groups_history(db_session: AsyncSession):
+    base = datetime(2025, 1, 1)
+    rows = [
+        ("a", "Ann", "Lee", "ann.lee@gmail.com"),
+        ("b", "Ann", "Lee", "annlee+1@gmail.com"),
+        ("c", "Anne", "Lea", "anne@example.com"),
+        ("d", "Bob", "Stone", "bob@example.com"),
+        ("e", "Bob", "Stone", "BOB@example.com"),
+        ("f", "Zed", "Quinn", "zed@example.com"),
+    ]
+    for i, (lead_id, first, last, email) in enumerate(rows):
+        stamp = base + timedelta(days=i)
+        db_session.add(
+            Lead(id=lead_id, first_name=first, last_name=last, email=email,
+                 resume_path="uploads/x.pdf", created_at=stamp, updated_at=stamp)
+        )
+    await db_session.commit()
+
+    assert await dedupe_existing(db_session, batch_size=2) == 3
+    db_session.expire_all()
+    leads = {lead.id: lead for lead in (await db_session.execute(select(Lead))).scalars()}
+    assert {k: v.canonical_lead_id for k, v in leads.items()} == {
+        "a": None, "b": "a", "c": "a", "d": None, "e": "d", "f": None,
+    }
+    assert leads["b"].email_key == "annlee@gmail.com"
+    # Key maintenance must not look like a lead change to delta sync or archival.
+    assert leads["f"].updated_at == base + timedelta(days=5)
+
+    assert await dedupe_existing(db_session) == 0
+
+
+@pytest.mark.asyncio
+async def test_duplicate_ids_include_archived_leads(db_session: AsyncSession):
+    stamp = datetime(2025, 1, 1)
+    db_session.add(
+        LeadArchive(id="old", first_name="Ann", last_name="Lee", email="ann@example.com",
+                    resume_path="uploads/a.pdf", state=LeadState.REACHED_OUT,
+                    created_at=stamp, updated_at=stamp)
+    )
+    db_session.add(
+        Lead(id="new", first_name="Ann", last_name="Lee", email="ann@example.com", resume_path="uploads/b.pdf",
+             canonical_lead_id="old", created_at=stamp + timedelta(days=1), updated_at=stamp)
+    )
+    await db_session.commit()
+
+    assert await get_duplicate_ids(db_session, await db_session.get(Lead, "new")) == ["old"]
+    assert await get_duplicate_ids(db_session, await db_session.get(LeadArchive, "old")) == ["new"]
+
+
+@pytest.mark.asyncio
+async def test_dedupe_existing_keeps_archived_canonicals(db_session: AsyncSession):
+    stamp = datetime(2025, 1, 1)
+    # Archived before blocking keys existed, so "old" has none yet.
+    for lead_id, email, days in (("old", "ann@example.com", 0), ("late", "Ann+2@example.com", 2)):
+        db_session.add(
+            LeadArchive(id=lead_id, first_name="Ann", last_name="Lee", email=email,
+                        resume_path=f"uploads/{lead_id}.pdf", state=LeadState.REACHED_OUT,
+                        created_at=stamp + timedelta(days=days), updated_at=stamp)
+        )
+    db_session.add(
+        Lead(id="new", first_name="Ann", last_name="Lee", email="ann@example.com", resume_path="uploads/b.pdf",
+             canonical_lead_id="old", created_at=stamp + timedelta(days=1), updated_at=stamp)
+    )
+    await db_session.commit()
+
+    assert await dedupe_existing(db_session, batch_size=2) == 1
+    db_session.expire_all()
+    assert (await db_session.get(Lead, "new")).canonical_lead_id == "old"
+    old, late = await db_session.get(LeadArchive, "old"), await db_session.get(LeadArchive, "late")
+    assert (old.canonical_lead_id, late.canonical_lead_id) == (None, "old")
+    assert old.email_key == "ann@example.com"
+    assert await dedupe_existing(db_session) == 0
+
+
+@pytest.mark.asyncio
+async def test_email_match_is_found_in_a_crowded_name_bucket(db_session: AsyncSession):
+    stamp = datetime(2025, 1, 1)
+    for i in range(MAX_CANDIDATES + 5):
+        lead = Lead(id=f"smith{i:03}", first_name="Bob", last_name="Smith", email=f"bob{i}@example.com",
+                    resume_path="uploads/x.pdf", created_at=stamp + timedelta(minutes=i), updated_at=stamp)
+        await assign_keys_and_link(db_session, lead)
+        db_session.add(lead)
+    # Same name key as the crowd, but a first name too different to match by name.
+    target = Lead(id="target", first_name="Bill", last_name="Smith", email="target@example.com",
+                  resume_path="uploads/x.pdf", created_at=stamp + timedelta(days=1), updated_at=stamp)
+    await assign_keys_and_link(db_session, target)
+    db_session.add(target)
+    await db_session.commit()
+
+    lead = Lead(first_name="Bill", last_name="Smith", email="Target+again@example.com", resume_path="uploads/y.pdf")
+    await assign_keys_and_link(db_session, lead)
+    assert lead.canonical_lead_id == "target"
+
+
+@pytest.mark.asyncio
+async def test_dedupe_existing_keeps_links_made_on_submission(db_session: AsyncSession):
+    stamp = datetime(2025, 1, 1)
+    leads = {}
+    for i, first in enumerate(("Kate", "Katie", "Katherine")):
+        lead = Lead(id=first.lower(), first_name=first, last_name="Smith", email=f"{first}@example.com",
+                    resume_path="uploads/x.pdf", created_at=stamp + timedelta(minutes=i), updated_at=stamp)
+        await assign_keys_and_link(db_session, lead)
+        db_session.add(lead)
+        await db_session.flush()
+        leads[lead.id] = lead.canonical_lead_id
+    await db_session.commit()
+    # Katie is close to Kate; Katherine is close to neither.
+    assert leads == {"kate": None, "katie": "kate", "katherine": None}
+
+    assert await dedupe_existing(db_session) == 0
@@ -0,0 +1,220 @@
+import asyncio
+import io
+import os
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi import HTTPException
+from httpx import AsyncClient
+from sqlalchemy import func, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.core.config import settings
+from app.core.database import on_commit
+from app.models.base import Base, utcnow
+from app.models.idempotency import IdempotencyKey
+from app.models.lead import Lead
+from app.services.email_service import EmailService, get_email_service
+from app.services.idempotency_service import run_once
+
+FAKE_PDF = b"%PDF-1.4 fake pdf content"
+
+
+class RecordingEmailService(EmailService):
+    def __init__(self):
+        self.sent: list[str] = []
+
+    async def send_email(self, to: str, subject: str, body: str) -> None:
+        self.sent.append(to)
+
+
+@pytest.fixture()
+def emails():
+    from app.main import app
+
+    service = RecordingEmailService()
+    app.dependency_overrides[get_email_service] = lambda: service
+    return service
+
+
+async def _submit(client: AsyncClient, key: str | None):
+    headers = {"Idempotency-Key": key} if key else {}
+    return await client.post(
+        "/api/leads",
+        data={"first_name": "Ida", "last_name": "Retry", "email": "ida@example.com"},
+        files={"resume": ("resume.pdf", io.BytesIO(FAKE_PDF), "application/pdf")},
+        headers=headers,
+    )
+
+
+async def _lead_count(db: AsyncSession) -> int:
+    return (await db.execute(select(func.count()).select_from(Lead))).scalar_one()
+
+
+@pytest.mark.asyncio
+async def test_retry_replays_stored_response(client: AsyncClient, db_session: AsyncSession, emails):
+    first = await _submit(client, "key-1")
+    retry = await _submit(client, "key-1")
+
+    assert first.status_code == retry.status_code == 201
+    assert retry.json() == first.json()
+    assert retry.headers["Idempotent-Replayed"] == "true"
+    assert "Idempotent-Replayed" not in first.headers
+    assert await _lead_count(db_session) == 1
+    assert len(emails.sent) == 2
+    assert len(os.listdir(settings.UPLOAD_DIR)) == 1
+
+
+@pytest.mark.asyncio
+async def test_distinct_keys_create_distinct_leads(client: AsyncClient, db_session: AsyncSession):
+    first = await _submit(client, "key-a")
+    second = await _submit(client, "key-b")
+    assert first.json()["id"] != second.json()["id"]
+    assert await _lead_count(db_session) == 2
+
+
+@pytest.mark.asyncio
+async def test_expired_key_is_processed_again(client: AsyncClient, db_session: AsyncSession):
+    first = await _submit(client, "key-ttl")
+    await db_session.execute(
+        update(IdempotencyKey).values(expires_at=datetime(2000, 1, 1))
+    )
+    await db_session.commit()
+
+    retry = await _submit(client, "key-ttl")
+    assert retry.json()["id"] != first.json()["id"]
+    assert await _lead_count(db_session) == 2
+
+
+@pytest.mark.asyncio
+async def test_failed_request_is_not_stored(client: AsyncClient, db_session: AsyncSession):
+    resp = await client.post(
+        "/api/leads",
+        data={"first_name": "Ida", "last_name": "Retry", "email": "ida@example.com"},
+        files={"resume": ("malware.exe", io.BytesIO(b"bad"), "application/octet-stream")},
+        headers={"Idempotency-Key": "key-bad"},
+    )
+    assert resp.status_code == 400
+    assert await db_session.get(IdempotencyKey, "key-bad") is None
+
+
+@pytest.mark.asyncio
+async def test_concurrent_duplicates_run_once(tmp_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'idem.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    sessions = async_sessionmaker(engine, expire_on_commit=False)
+
+    calls = 0
+    release = asyncio.Event()
+
+    async def operation() -> dict:
+        nonlocal calls
+        calls += 1
+        await release.wait()
+        return {"id": "lead-1"}
+
+    async def request() -> tuple[dict, bool]:
+        async with sessions() as session:
+            return await run_once(session, "key-concurrent", operation)
+
+    tasks = [asyncio.create_task(request()) for _ in range(5)]
+    await asyncio.sleep(0.05)
+    release.set()
+    results = await asyncio.gather(*tasks)
+
+    assert calls == 1
+    assert all(body == {"id": "lead-1"} for body, _ in results)
+    assert sorted(replayed for _, replayed in results) == [False, True, True, True, True]
+
+    async with sessions() as session:
+        later, replayed = await run_once(session, "key-concurrent", operation)
+    assert (later, replayed) == ({"id": "lead-1"}, True)
+    assert calls == 1
+    await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_reused_key_with_different_request_is_rejected(client: AsyncClient, db_session: AsyncSession):
+    first = await _submit(client, "key-reused")
+    assert first.status_code == 201
+
+    other = await client.post(
+        "/api/leads",
+        data={"first_name": "Ida", "last_name": "Retry", "email": "someone.else@example.com"},
+        files={"resume": ("resume.pdf", io.BytesIO(FAKE_PDF), "application/pdf")},
+        headers={"Idempotency-Key": "key-reused"},
+    )
+    assert other.status_code == 422
+    other_resume = await client.post(
+        "/api/leads",
+        data={"first_name": "Ida", "last_name": "Retry", "email": "ida@example.com"},
+        files={"resume": ("resume.pdf", io.BytesIO(FAKE_PDF + b"v2"), "application/pdf")},
+        headers={"Idempotency-Key": "key-reused"},
+    )
+    assert other_resume.status_code == 422
+    assert await _lead_count(db_session) == 1
+
+    retry = await _submit(client, "key-reused")
+    assert retry.status_code == 201
+    assert retry.json() == first.json()
+
+
+@pytest.mark.asyncio
+async def test_in_flight_key_with_different_fingerprint_is_rejected(tmp_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'idem.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    sessions = async_sessionmaker(engine, expire_on_commit=False)
+    release = asyncio.Event()
+
+    async def operation() -> dict:
+        await release.wait()
+        return {"id": "lead-1"}
+
+    async def request(fingerprint: str) -> tuple[dict, bool]:
+        async with sessions() as session:
+            return await run_once(session, "key-in-flight", operation, fingerprint)
+
+    first = asyncio.create_task(request("a" * 64))
+    await asyncio.sleep(0.05)
+    with pytest.raises(HTTPException) as exc_info:
+        await request("b" * 64)
+    assert exc_info.value.status_code == 422
+    release.set()
+    assert await first == ({"id": "lead-1"}, False)
+    await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_lost_race_drops_commit_hooks(tmp_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'idem.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    sessions = async_sessionmaker(engine, expire_on_commit=False)
+    queued = []
+
+    async with sessions() as session:
+        commit = session.commit
+
+        async def commit_after_other_worker() -> None:
+            session.commit = commit
+            raise IntegrityError("INSERT INTO idempotency_keys", {}, Exception("UNIQUE constraint failed"))
+
+        async def operation() -> dict:
+            # Another worker process stores the same key while this one runs.
+            async with sessions() as other:
+                other.add(
+                    IdempotencyKey(key="key-race", response_body='{"id": "lead-0"}',
+                                   expires_at=utcnow() + timedelta(hours=1))
+                )
+                await other.commit()
+            on_commit(session, lambda: queued.append("lead-1"))
+            session.commit = commit_after_other_worker
+            return {"id": "lead-1"}
+
+        assert await run_once(session, "key-race", operation) == ({"id": "lead-0"}, True)
+        await session.commit()
+    assert queued == []
+    await engine.dispose()
@@ -0,0 +1,107 @@
+from datetime import datetime
+
+import lead_cache
+import pytest
+from lead_cache import active_claimant, cached_leads, open_cache, reset, sync
+
+
+def _lead(lead_id: str, updated_at: str, state: str = "PENDING", created_at: str = "2025-01-01T00:00:00") -> dict:
+    return {
+        "id": lead_id,
+        "first_name": "Ann",
+        "last_name": lead_id.upper(),
+        "email": f"{lead_id}@example.com",
+        "resume_path": f"uploads/{lead_id}.pdf",
+        "state": state,
+        "created_at": created_at,
+        "updated_at": updated_at,
+        "claimed_by": None,
+        "lease_expires_at": None,
+    }
+
+
+class FakeServer:
+    def __init__(self, *batches: list[dict]):
+        self.batches = list(batches)
+        self.calls: list[str | None] = []
+
+    def __call__(self, updated_since: str | None) -> list[dict]:
+        self.calls.append(updated_since)
+        return self.batches.pop(0)
+
+
+@pytest.fixture()
+def cache(tmp_path, monkeypatch):
+    monkeypatch.setattr(lead_cache, "CACHE_PATH", str(tmp_path / "cache.db"))
+    conn = open_cache("http://api")
+    yield conn
+    conn.close()
+
+
+def test_sync_fetches_deltas_from_the_high_water_mark(cache):
+    fetch = FakeServer(
+        [_lead("a", "2025-01-01T00:00:10"), _lead("b", "2025-01-01T00:00:20")],
+        # The overlap window re-sends "b"; "a" changed state.
+        [_lead("b", "2025-01-01T00:00:20"), _lead("a", "2025-01-01T00:00:30", state="REACHED_OUT")],
+        [],
+    )
+
+    assert sync(cache, fetch) == 2
+    assert sync(cache, fetch) == 2
+    assert sync(cache, fetch) == 0
+
+    assert fetch.calls == [None, "2025-01-01T00:00:15", "2025-01-01T00:00:25"]
+    leads = {lead["id"]: lead for lead in cached_leads(cache)}
+    assert len(leads) == 2
+    assert leads["a"]["state"] == "REACHED_OUT"
+    assert [lead["id"] for lead in cached_leads(cache, state="PENDING")] == ["b"]
+
+
+def test_sync_never_moves_the_mark_backwards(cache):
+    fetch = FakeServer([_lead("a", "2025-01-01T00:01:00")], [_lead("b", "2025-01-01T00:00:58")], [])
+
+    sync(cache, fetch)
+    sync(cache, fetch)
+    sync(cache, fetch)
+
+    assert fetch.calls[-1] == "2025-01-01T00:00:55"
+
+
+def test_reset_and_server_change_force_a_full_sync(cache):
+    fetch = FakeServer([_lead("a", "2025-01-01T00:00:10")], [_lead("a", "2025-01-01T00:00:10")])
+    sync(cache, fetch)
+    reset(cache)
+    sync(cache, fetch)
+    assert fetch.calls == [None, None]
+
+    cache.close()
+    other = open_cache("http://other")
+    try:
+        assert cached_leads(other) == []
+    finally:
+        other.close()
+
+
+def test_outdated_cache_is_dropped(cache, monkeypatch):
+    sync(cache, FakeServer([_lead("a", "2025-01-01T00:00:10")]))
+    cache.close()
+
+    monkeypatch.setattr(lead_cache, "CACHE_VERSION", lead_cache.CACHE_VERSION + 1)
+    fetch = FakeServer([])
+    upgraded = open_cache("http://api")
+    try:
+        assert cached_leads(upgraded) == []
+        sync(upgraded, fetch)
+        assert fetch.calls == [None]
+    finally:
+        upgraded.close()
+
+
+def test_claims_are_cached_until_their_lease_runs_out(cache):
+    claimed = {**_lead("a", "2025-01-01T00:00:10"), "claimed_by": "jane", "lease_expires_at": "2025-01-01T00:30:00"}
+    sync(cache, FakeServer([claimed, _lead("b", "2025-01-01T00:00:20")]))
+
+    leads = {lead["id"]: lead for lead in cached_leads(cache)}
+    assert active_claimant(leads["a"], now=datetime(2025, 1, 1, 0, 10)) == "jane"
+    assert active_claimant(leads["a"], now=datetime(2025, 1, 1, 0, 31)) is None
+    assert active_claimant(leads["b"], now=datetime(2025, 1, 1, 0, 10)) is None
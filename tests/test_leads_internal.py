@@ -80,3 +80,35 @@ async def test_update_lead_state_invalid_transition(client: AsyncClient, auth_he
         headers=auth_headers,
     )
     assert resp.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_list_leads_updated_since(client: AsyncClient, auth_headers: dict):
+    old = await _create_lead(client, "Old", "Lead", "old@example.com")
+    recent = await _create_lead(client, "New", "Lead", "new@example.com")
+
+    resp = await client.get(
+        "/api/leads",
+        params={"updated_since": "2000-01-01T00:00:00Z"},
+        headers=auth_headers,
+    )
+    assert {lead["id"] for lead in resp.json()} == {old["id"], recent["id"]}
+
+    resp = await client.get(
+        "/api/leads",
+        params={"updated_since": "2999-01-01T00:00:00Z"},
+        headers=auth_headers,
+    )
+    assert resp.status_code == 200
+    assert resp.json() == []
+
+
+@pytest.mark.asyncio
+async def test_list_leads_updated_since_includes_same_second(client: AsyncClient, auth_headers: dict):
+    lead = await _create_lead(client)
+    resp = await client.get(
+        "/api/leads",
+        params={"updated_since": lead["created_at"]},
+        headers=auth_headers,
+    )
+    assert [row["id"] for row in resp.json()] == [lead["id"]]
@@ -0,0 +1,16 @@
+import pytest
+from reach_out import parse_selection
+
+
+@pytest.mark.parametrize(
+    "choice,expected",
+    [("3", [2]), ("1,3-5", [0, 2, 3, 4]), (" 5-5 , 1,1 ", [0, 4]), ("all", [0, 1, 2, 3, 4]), ("*", [0, 1, 2, 3, 4])],
+)
+def test_parse_selection(choice, expected):
+    assert parse_selection(choice, 5) == expected
+
+
+@pytest.mark.parametrize("choice", ["", ",", "0", "6", "4-2", "2-9", "x", "1-", "-1"])
+def test_parse_selection_rejects_invalid_input(choice):
+    with pytest.raises(ValueError):
+        parse_selection(choice, 5)
@@ -0,0 +1,145 @@
+import io
+import os
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import select
+
+from app.core.config import settings
+from app.models.lead import Lead
+from app.services import resume_storage
+from app.services.resume_storage import (
+    ResumeTooLarge,
+    codec_for_path,
+    read_resume,
+    resolve_codec,
+    store_resume,
+)
+from app.services.resume_storage_service import (
+    compress_existing_resumes,
+    storage_report,
+)
+from app.services.resume_text import extract_text
+
+# Uncompressed PDF text streams compress well; random bytes do not.
+TEXT_PDF = (
+    b"%PDF-1.4\n1 0 obj\n<< /Length 60 >>\nstream\n"
+    + b"BT /F1 12 Tf (Jane Doe, Python developer) Tj ET\n" * 400
+    + b"endstream\nendobj\n%%EOF\n"
+)
+RANDOM_PDF = b"%PDF-1.4\n" + os.urandom(64 * 1024)
+
+
+def test_resolve_codec_falls_back_to_gzip():
+    assert resolve_codec("none") is None
+    assert resolve_codec("gzip") == "gzip"
+    assert resolve_codec("zstd") in ("zstd", "gzip")
+
+
+def test_store_resume_compresses_only_when_it_helps(tmp_path):
+    codec = resolve_codec("zstd")
+    compressed, stored_codec, size = store_resume(io.BytesIO(TEXT_PDF), str(tmp_path / "a.pdf"), codec)
+    assert stored_codec == codec
+    assert codec_for_path(compressed) == codec
+    assert size == len(TEXT_PDF)
+    assert os.path.getsize(compressed) < size / 10
+    assert read_resume(compressed) == TEXT_PDF
+
+    raw, stored_codec, size = store_resume(io.BytesIO(RANDOM_PDF), str(tmp_path / "b.pdf"), codec)
+    assert (raw, stored_codec, size) == (str(tmp_path / "b.pdf"), None, len(RANDOM_PDF))
+    # No temporary or discarded compressed copies are left behind.
+    assert sorted(os.listdir(tmp_path)) == sorted([os.path.basename(compressed), "b.pdf"])
+
+
+def test_incompressible_resume_is_written_once(tmp_path, monkeypatch):
+    writes = []
+    real_write = resume_storage._write
+
+    def write(src, dest, codec, max_size):
+        writes.append(codec)
+        return real_write(src, dest, codec, max_size)
+
+    monkeypatch.setattr(resume_storage, "_write", write)
+    store_resume(io.BytesIO(RANDOM_PDF), str(tmp_path / "b.pdf"), "gzip")
+    assert writes == [None]
+    store_resume(io.BytesIO(TEXT_PDF), str(tmp_path / "a.pdf"), "gzip")
+    assert writes == [None, "gzip"]
+
+
+def test_store_resume_enforces_max_size(tmp_path):
+    with pytest.raises(ResumeTooLarge):
+        store_resume(io.BytesIO(TEXT_PDF), str(tmp_path / "big.pdf"), "gzip", max_size=1024)
+    assert os.listdir(tmp_path) == []
+
+
+def test_extract_text_reads_compressed_resume(tmp_path):
+    path, codec, _size = store_resume(io.BytesIO(TEXT_PDF), str(tmp_path / "r.pdf"), "gzip")
+    assert codec == "gzip"
+    assert extract_text(path).splitlines()[0] == "Jane Doe, Python developer"
+
+
+@pytest.mark.asyncio
+async def test_upload_is_stored_compressed_and_downloaded_raw(
+    client: AsyncClient, auth_headers: dict, db_session, monkeypatch
+):
+    monkeypatch.setattr(settings, "RESUME_COMPRESSION", "gzip")
+    resp = await client.post(
+        "/api/leads",
+        data={"first_name": "Zed", "last_name": "Zip", "email": "zed@example.com"},
+        files={"resume": ("resume.pdf", io.BytesIO(TEXT_PDF), "application/pdf")},
+    )
+    assert resp.status_code == 201
+    lead = await db_session.get(Lead, resp.json()["id"])
+    assert lead.resume_path.endswith(".pdf.gz")
+    assert (lead.resume_codec, lead.resume_size) == ("gzip", len(TEXT_PDF))
+
+    resp = await client.get(f"/api/leads/{lead.id}/resume", headers={**auth_headers, "Accept-Encoding": "gzip"})
+    assert resp.status_code == 200
+    assert resp.content == TEXT_PDF
+    assert resp.headers["content-type"] == "application/pdf"
+    assert "content-encoding" not in resp.headers
+    assert 'filename="' in resp.headers["content-disposition"]
+    assert resp.headers["content-disposition"].endswith('.pdf"')
+
+    resp = await client.get("/api/leads/nonexistent/resume", headers=auth_headers)
+    assert resp.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_compress_existing_resumes_and_report(file_db, tmp_path):
+    raw = {"text": tmp_path / "text.pdf", "random": tmp_path / "random.pdf"}
+    raw["text"].write_bytes(TEXT_PDF)
+    raw["random"].write_bytes(RANDOM_PDF)
+    async with file_db() as session:
+        session.add_all(
+            [
+                Lead(first_name="A", last_name="A", email="a@example.com", resume_path=str(raw["text"])),
+                Lead(first_name="B", last_name="B", email="b@example.com", resume_path=str(raw["text"])),
+                Lead(first_name="C", last_name="C", email="c@example.com", resume_path=str(raw["random"])),
+                Lead(first_name="D", last_name="D", email="d@example.com", resume_path=str(tmp_path / "gone.pdf")),
+            ]
+        )
+        await session.commit()
+
+    result = await compress_existing_resumes(file_db, codec="gzip", workers=1, batch_size=2)
+    assert (result.examined, result.compressed) == (2, 1)
+    assert result.bytes_after < result.bytes_before
+    assert not raw["text"].exists()
+    assert raw["random"].exists()
+
+    async with file_db() as session:
+        rows = {row.email: row for row in (await session.execute(select(Lead))).scalars()}
+    assert rows["a@example.com"].resume_path == rows["b@example.com"].resume_path == f"{raw['text']}.gz"
+    assert rows["a@example.com"].resume_codec == "gzip"
+    assert (rows["c@example.com"].resume_codec, rows["c@example.com"].resume_size) == (None, len(RANDOM_PDF))
+    assert rows["d@example.com"].resume_size is None
+
+    again = await compress_existing_resumes(file_db, codec="gzip", workers=1)
+    assert again.examined == 0
+
+    report = await storage_report(file_db)
+    assert report["files"] == 3
+    assert report["compressed_files"] == 2
+    assert report["original_bytes"] == 2 * len(TEXT_PDF) + len(RANDOM_PDF)
+    assert report["saved_bytes"] > len(TEXT_PDF)
+    assert report["read_sample_files"] == 2
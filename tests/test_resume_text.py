@@ -0,0 +1,225 @@
+import asyncio
+import io
+import os
+import time
+import zipfile
+import zlib
+from datetime import datetime
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import select
+
+from app.models.lead import Lead, LeadArchive, LeadState
+from app.models.resume_text import LeadResumeText, ResumeTextStatus
+from app.services.resume_text import (
+    extract_doc,
+    extract_docx,
+    extract_pdf,
+    extract_text,
+)
+from app.services.resume_text_service import ResumeTextPipeline, backfill
+
+FAKE_PDF = b"%PDF-1.4 fake pdf content"
+
+
+def _docx(*paragraphs: str) -> bytes:
+    body = "".join(f"<w:p><w:r><w:t>{p}</w:t></w:r></w:p>" for p in paragraphs)
+    xml = (
+        '<w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main">'
+        f"<w:body>{body}</w:body></w:document>"
+    )
+    buf = io.BytesIO()
+    with zipfile.ZipFile(buf, "w") as archive:
+        archive.writestr("word/document.xml", xml)
+    return buf.getvalue()
+
+
+def _pdf(content: bytes, compress: bool = False) -> bytes:
+    header = b"<< /Length %d >>" % len(content)
+    if compress:
+        content = zlib.compress(content)
+        header = b"<< /Length %d /Filter /FlateDecode >>" % len(content)
+    return b"%PDF-1.4\n1 0 obj\n" + header + b"\nstream\n" + content + b"\nendstream\nendobj\n%%EOF\n"
+
+
+def slow_extractor(path: str) -> str:
+    time.sleep(10)
+    return ""
+
+
+def mixed_extractor(path: str) -> str:
+    time.sleep(10 if "slow" in path else 0.4)
+    return "text"
+
+
+def test_extract_docx():
+    assert extract_docx(_docx("Jane Doe", "Python developer")).split() == ["Jane", "Doe", "Python", "developer"]
+
+
+@pytest.mark.parametrize("compress", [False, True])
+def test_extract_pdf(compress: bool):
+    content = b"BT /F1 12 Tf (Jane Doe) Tj T* [(Senior ) -20 (Engineer \\(Python\\))] TJ ET"
+    text = extract_pdf(_pdf(content, compress))
+    assert text.splitlines() == ["Jane Doe", "Senior Engineer (Python)"]
+
+
+def test_extract_doc():
+    data = b"\xd0\xcf\x11\xe0" + b"\x00" * 64 + "Jane Doe, Python developer".encode("utf-16-le") + b"\x00" * 8
+    assert "Jane Doe, Python developer" in extract_doc(data)
+
+
+def test_extract_text_rejects_unknown_type(tmp_path):
+    path = tmp_path / "resume.txt"
+    path.write_text("hello")
+    with pytest.raises(ValueError):
+        extract_text(str(path))
+
+
+async def _add_lead(session_factory, resume_path: str) -> str:
+    async with session_factory() as session:
+        lead = Lead(first_name="Jane", last_name="Doe", email=f"{resume_path}@example.com", resume_path=resume_path)
+        session.add(lead)
+        await session.commit()
+        return lead.id
+
+
+@pytest.mark.asyncio
+async def test_backfill_extracts_and_records_failures(file_db, tmp_path):
+    good = tmp_path / "good.docx"
+    good.write_bytes(_docx("Jane Doe", "Python developer"))
+    broken = tmp_path / "broken.docx"
+    broken.write_bytes(b"not a zip file")
+    good_id = await _add_lead(file_db, str(good))
+    broken_id = await _add_lead(file_db, str(broken))
+
+    assert await backfill(file_db, runner=ResumeTextPipeline(workers=1, session_factory=file_db)) == 2
+
+    async with file_db() as session:
+        rows = {r.lead_id: r for r in (await session.execute(select(LeadResumeText))).scalars()}
+    assert rows[good_id].status == ResumeTextStatus.DONE
+    assert rows[good_id].text == "Jane Doe\nPython developer"
+    assert rows[broken_id].status == ResumeTextStatus.FAILED
+    assert "BadZipFile" in rows[broken_id].error
+
+    # Done and failed rows are skipped unless failures are retried.
+    assert await backfill(file_db, runner=ResumeTextPipeline(workers=1, session_factory=file_db)) == 0
+    assert (
+        await backfill(file_db, retry_failed=True, runner=ResumeTextPipeline(workers=1, session_factory=file_db))
+        == 1
+    )
+
+
+@pytest.mark.asyncio
+async def test_pipeline_times_out_and_recovers(file_db, tmp_path):
+    path = tmp_path / "slow.pdf"
+    path.write_bytes(FAKE_PDF)
+    lead_id = await _add_lead(file_db, str(path))
+
+    pipeline = ResumeTextPipeline(workers=1, timeout=0.5, session_factory=file_db, extractor=slow_extractor)
+    start = time.perf_counter()
+    await backfill(file_db, runner=pipeline)
+    assert time.perf_counter() - start < 8
+
+    async with file_db() as session:
+        row = await session.get(LeadResumeText, lead_id)
+    assert row.status == ResumeTextStatus.FAILED
+    assert row.error.startswith("Timed out")
+
+
+@pytest.mark.asyncio
+async def test_timeout_restart_does_not_fail_neighbouring_jobs(file_db, tmp_path):
+    slow = tmp_path / "slow.pdf"
+    slow.write_bytes(FAKE_PDF)
+    slow_id = await _add_lead(file_db, str(slow))
+    fast_ids = []
+    for i in range(6):
+        path = tmp_path / f"fast{i}.pdf"
+        path.write_bytes(FAKE_PDF)
+        fast_ids.append(await _add_lead(file_db, str(path)))
+
+    pipeline = ResumeTextPipeline(workers=2, timeout=1.0, session_factory=file_db, extractor=mixed_extractor)
+    await backfill(file_db, runner=pipeline)
+
+    async with file_db() as session:
+        rows = {row.lead_id: row for row in (await session.execute(select(LeadResumeText))).scalars()}
+    assert rows[slow_id].status == ResumeTextStatus.FAILED
+    assert rows[slow_id].error.startswith("Timed out")
+    assert {rows[lead_id].status for lead_id in fast_ids} == {ResumeTextStatus.DONE}
+
+
+@pytest.mark.asyncio
+async def test_pipeline_picks_up_leads_queued_by_other_processes(file_db, tmp_path):
+    path = tmp_path / "resume.docx"
+    path.write_bytes(_docx("Jane Doe"))
+    lead_id = await _add_lead(file_db, str(path))
+    # What a worker without a pipeline leaves behind for the one that has it.
+    async with file_db() as session:
+        session.add(LeadResumeText(lead_id=lead_id, status=ResumeTextStatus.PENDING))
+        await session.commit()
+
+    pipeline = ResumeTextPipeline(workers=1, session_factory=file_db, poll_interval=0.05)
+    await pipeline.start()
+    try:
+        for _ in range(200):
+            async with file_db() as session:
+                row = await session.get(LeadResumeText, lead_id)
+            if row.status != ResumeTextStatus.PENDING:
+                break
+            await asyncio.sleep(0.05)
+        assert await pipeline.queue_pending() == 0
+    finally:
+        await pipeline.stop()
+    assert (row.status, row.text) == (ResumeTextStatus.DONE, "Jane Doe")
+
+
+async def _add_archived_lead(session_factory, resume_path: str, pending: bool) -> str:
+    stamp = datetime(2025, 1, 1)
+    async with session_factory() as session:
+        lead = LeadArchive(id=f"archived-{os.path.basename(resume_path)}", first_name="Jane", last_name="Doe",
+                           email="jane@example.com", resume_path=resume_path, state=LeadState.REACHED_OUT,
+                           created_at=stamp, updated_at=stamp)
+        session.add(lead)
+        if pending:
+            session.add(LeadResumeText(lead_id=lead.id, status=ResumeTextStatus.PENDING))
+        await session.commit()
+        return lead.id
+
+
+@pytest.mark.asyncio
+async def test_archived_leads_are_extracted(file_db, tmp_path):
+    queued = tmp_path / "queued.docx"
+    queued.write_bytes(_docx("Queued"))
+    missing = tmp_path / "missing.docx"
+    missing.write_bytes(_docx("Missing"))
+    # Archived while its extraction was still PENDING, and before extraction existed.
+    queued_id = await _add_archived_lead(file_db, str(queued), pending=True)
+    missing_id = await _add_archived_lead(file_db, str(missing), pending=False)
+
+    pipeline = ResumeTextPipeline(workers=1, session_factory=file_db, poll_interval=0)
+    await pipeline.start()
+    try:
+        assert await pipeline.queue_pending() == 1
+        await pipeline.join()
+    finally:
+        await pipeline.stop()
+    assert await backfill(file_db, runner=ResumeTextPipeline(workers=1, session_factory=file_db)) == 1
+
+    async with file_db() as session:
+        rows = {row.lead_id: row for row in (await session.execute(select(LeadResumeText))).scalars()}
+    assert (rows[queued_id].status, rows[queued_id].text) == (ResumeTextStatus.DONE, "Queued")
+    assert (rows[missing_id].status, rows[missing_id].text) == (ResumeTextStatus.DONE, "Missing")
+
+
+@pytest.mark.asyncio
+async def test_submitted_lead_reports_pending_extraction(client: AsyncClient, auth_headers: dict):
+    resp = await client.post(
+        "/api/leads",
+        data={"first_name": "Jane", "last_name": "Doe", "email": "jane@example.com"},
+        files={"resume": ("resume.pdf", io.BytesIO(FAKE_PDF), "application/pdf")},
+    )
+    assert resp.status_code == 201
+
+    resp = await client.get(f"/api/leads/{resp.json()['id']}", headers=auth_headers)
+    assert resp.status_code == 200
+    assert resp.json()["resume_text_status"] == "PENDING"
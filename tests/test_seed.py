@@ -0,0 +1,84 @@
+import os
+from datetime import datetime, timezone
+
+from sqlalchemy import create_engine, func, select
+
+from app.core.database import schema_fingerprint_table, shard_for, shard_urls
+from app.models.lead import Lead, LeadState
+from app.seed import generate, sync_database_url
+
+END = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+
+def _rows(url: str) -> list[tuple]:
+    engine = create_engine(sync_database_url(url))
+    with engine.connect() as conn:
+        rows = conn.execute(select(Lead.__table__).order_by(Lead.id)).all()
+    engine.dispose()
+    return [tuple(row) for row in rows]
+
+
+def test_sync_database_url():
+    assert sync_database_url("sqlite+aiosqlite:///./alma.db") == "sqlite:///./alma.db"
+
+
+def test_generate_is_deterministic(tmp_path):
+    urls = [f"sqlite+aiosqlite:///{tmp_path / name}" for name in ("a.db", "b.db")]
+    for url in urls:
+        generate(500, seed=7, end=END, database_url=url, upload_dir="uploads", batch_size=128)
+
+    first, second = (_rows(url) for url in urls)
+    assert len(first) == 500
+    assert first == second
+
+
+def test_generate_spreads_states_and_dates(tmp_path):
+    url = f"sqlite+aiosqlite:///{tmp_path / 'leads.db'}"
+    generate(2_000, seed=1, end=END, database_url=url, upload_dir="uploads")
+
+    engine = create_engine(sync_database_url(url))
+    with engine.connect() as conn:
+        states = dict(conn.execute(select(Lead.state, func.count()).group_by(Lead.state)).all())
+        oldest, newest = conn.execute(select(func.min(Lead.created_at), func.max(Lead.created_at))).one()
+        unkeyed = conn.execute(
+            select(func.count()).where(Lead.email_key.is_(None) | Lead.name_key.is_(None))
+        ).scalar()
+    engine.dispose()
+
+    assert states[LeadState.PENDING] > 0
+    assert states[LeadState.REACHED_OUT] > 0
+    assert unkeyed == 0
+    assert newest <= END.replace(tzinfo=None)
+    assert (newest - oldest).days > 180
+
+
+def test_generate_writes_resumes(tmp_path):
+    url = f"sqlite+aiosqlite:///{tmp_path / 'leads.db'}"
+    upload_dir = str(tmp_path / "uploads")
+    generate(50, resumes=10, seed=3, end=END, database_url=url, upload_dir=upload_dir)
+
+    files = os.listdir(upload_dir)
+    assert len(files) == 10
+    engine = create_engine(sync_database_url(url))
+    with engine.connect() as conn:
+        paths = set(conn.execute(select(Lead.resume_path)).scalars())
+    engine.dispose()
+    assert paths == {os.path.join(upload_dir, name) for name in files}
+
+
+def test_generate_writes_each_lead_to_its_shard(tmp_path):
+    url = f"sqlite+aiosqlite:///{tmp_path / 'leads.db'}"
+    generate(300, seed=5, end=END, database_url=url, upload_dir="uploads", shards=3)
+
+    total = 0
+    for index, shard_url in enumerate(shard_urls(url, 3)):
+        engine = create_engine(sync_database_url(shard_url))
+        with engine.connect() as conn:
+            ids = list(conn.execute(select(Lead.id)).scalars())
+            fingerprints = conn.execute(select(schema_fingerprint_table)).all()
+        engine.dispose()
+        assert ids
+        assert all(shard_for(lead_id, 3) == index for lead_id in ids)
+        assert len(fingerprints) == 1  # created through ensure_schema
+        total += len(ids)
+    assert total == 300
@@ -0,0 +1,92 @@
+import os
+import signal
+import sys
+import time
+
+import httpx
+
+from app.serve import Supervisor, _strip_internal, uvicorn_options
+from benchmarks.harness import start_server
+from benchmarks.startup import scratch_env
+
+
+def _workers(pid: int) -> set[int]:
+    try:
+        with open(f"/proc/{pid}/task/{pid}/children") as f:
+            return {int(child) for child in f.read().split()}
+    except FileNotFoundError:  # exited meanwhile
+        return set()
+
+
+def _primaries(pid: int) -> set[int]:
+    # Only the primary worker runs the resume extraction pool's processes.
+    return {worker for worker in _workers(pid) if _workers(worker)}
+
+
+def _wait_for(predicate, timeout: float = 30) -> bool:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.1)
+    return False
+
+
+def test_worker_options_come_from_settings(monkeypatch):
+    from app.core.config import settings
+
+    monkeypatch.setattr(settings, "SERVER_BACKLOG", 512)
+    monkeypatch.setattr(settings, "SERVER_LIMIT_CONCURRENCY", 0)
+    options = uvicorn_options()
+    assert options["backlog"] == 512
+    assert options["limit_concurrency"] is None
+    assert options["loop"] in ("uvloop", "asyncio")
+    assert options["http"] in ("httptools", "h11")
+
+
+def test_reload_drops_internal_arguments():
+    argv = ["--workers", "2", "--fd", "3", "--retire=10,11", "--port", "9000"]
+    assert _strip_internal(argv) == ["--workers", "2", "--port", "9000"]
+
+
+def test_waiting_for_workers_gives_way_to_signals(monkeypatch):
+    supervisor = Supervisor(None, 1, "warning", [])
+    ready_r, ready_w = os.pipe()  # a worker that never reports ready
+    monkeypatch.setattr(supervisor, "spawn", lambda: (0, ready_r))
+    supervisor._pending = signal.SIGTERM
+    start = time.monotonic()
+    try:
+        assert supervisor.spawn_ready(1) is False
+    finally:
+        os.close(ready_w)
+    assert time.monotonic() - start < 1
+
+
+def test_reload_replaces_workers_without_dropping_requests(tmp_path):
+    command = [sys.executable, "-m", "app.serve", "--port", "{port}", "--workers", "2", "--log-level", "warning"]
+    proc, base_url = start_server(command, scratch_env(tmp_path))
+    try:
+        assert _wait_for(lambda: len(_workers(proc.pid)) == 2)
+        old = _workers(proc.pid)
+        assert _wait_for(lambda: len(_primaries(proc.pid)) == 1)
+
+        proc.send_signal(signal.SIGHUP)
+        failures = 0
+        replaced = False
+        deadline = time.monotonic() + 60
+        while not replaced and time.monotonic() < deadline:
+            try:
+                httpx.get(f"{base_url}/openapi.json", timeout=10).raise_for_status()
+            except httpx.HTTPError:
+                failures += 1
+            workers = _workers(proc.pid)
+            replaced = len(workers) == 2 and not workers & old
+
+        assert replaced
+        assert failures == 0
+        assert _wait_for(lambda: len(_primaries(proc.pid)) == 1 and not _primaries(proc.pid) & old)
+        assert proc.poll() is None  # same supervisor PID after the re-exec
+        httpx.get(f"{base_url}/openapi.json", timeout=10).raise_for_status()
+    finally:
+        proc.send_signal(signal.SIGTERM)
+        assert proc.wait(timeout=60) == 0
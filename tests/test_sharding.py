@@ -0,0 +1,242 @@
+import io
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi import HTTPException
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import event, select, update
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.core.database import (
+    ensure_schema,
+    first_page,
+    make_sessionmaker,
+    shard_for,
+    shard_urls,
+)
+from app.models.idempotency import IdempotencyKey
+from app.models.lead import Lead, LeadArchive, LeadState
+from app.models.resume_text import LeadResumeText, ResumeTextStatus
+from app.services.archive_service import archive_leads
+from app.services.lead_service import get_lead, list_leads, update_lead_state
+from app.services.reshard_service import reshard
+
+FAKE_PDF = b"%PDF-1.4 fake pdf content"
+SHARDS = 3
+
+
+async def _ids(engine, model) -> set[str]:
+    async with engine.connect() as conn:
+        return set((await conn.execute(select(model.__table__.c[0]))).scalars())
+
+
+@pytest.fixture()
+async def shards(tmp_path):
+    """(database_url, engines, session factory) for a fresh three-shard layout."""
+    import app.main  # noqa: F401
+
+    url = f"sqlite+aiosqlite:///{tmp_path / 'alma.db'}"
+    engines = [create_async_engine(u) for u in shard_urls(url, SHARDS)]
+    for engine in engines:
+        await ensure_schema(engine)
+    yield url, engines, make_sessionmaker(engines)
+    for engine in engines:
+        await engine.dispose()
+
+
+async def _add_leads(session_factory, count: int) -> list[str]:
+    start = datetime(2026, 1, 1)
+    async with session_factory() as session:
+        leads = [
+            Lead(
+                first_name="Sam",
+                last_name=f"Shard{i}",
+                email=f"sam{i}@example.com",
+                resume_path=f"r{i}.pdf",
+                created_at=start + timedelta(minutes=i),
+                updated_at=start + timedelta(minutes=i),
+            )
+            for i in range(count)
+        ]
+        session.add_all(leads)
+        await session.flush()
+        session.add_all(LeadResumeText(lead_id=lead.id, status=ResumeTextStatus.PENDING) for lead in leads)
+        await session.commit()
+        return [lead.id for lead in leads]
+
+
+def test_shard_urls():
+    assert shard_urls("sqlite+aiosqlite:///./alma.db", 1) == ["sqlite+aiosqlite:///./alma.db"]
+    assert shard_urls("sqlite+aiosqlite:///./alma.db", 3) == [
+        "sqlite+aiosqlite:///./alma.db",
+        "sqlite+aiosqlite:///./alma.shard1.db",
+        "sqlite+aiosqlite:///./alma.shard2.db",
+    ]
+    with pytest.raises(ValueError):
+        shard_urls("sqlite+aiosqlite://", 2)
+
+
+def test_first_page_merges_per_shard_pages():
+    # Three shards each answered "ORDER BY key LIMIT 2".
+    pages = [1, 4], [2, 3], [5, 6]
+    assert first_page((row for page in pages for row in page), lambda row: row, 2) == [1, 2]
+    assert first_page([], lambda row: row, 2) == []
+
+
+@pytest.mark.asyncio
+async def test_rows_land_on_owning_shard(shards):
+    _url, engines, session_factory = shards
+    ids = await _add_leads(session_factory, 30)
+
+    for index, engine in enumerate(engines):
+        placed = await _ids(engine, Lead)
+        assert placed == {i for i in ids if shard_for(i, SHARDS) == index}
+        assert await _ids(engine, LeadResumeText) == placed
+        assert placed  # 30 ids spread over every shard
+
+
+@pytest.mark.asyncio
+async def test_get_and_update_reach_owning_shard(shards):
+    _url, engines, session_factory = shards
+    ids = await _add_leads(session_factory, 10)
+
+    async with session_factory() as session:
+        lead = await update_lead_state(session, ids[7], LeadState.REACHED_OUT)
+        await session.commit()
+    assert lead.state == LeadState.REACHED_OUT
+
+    owner = engines[shard_for(ids[7], SHARDS)]
+    async with owner.connect() as conn:
+        state = (await conn.execute(select(Lead.state).where(Lead.id == ids[7]))).scalar_one()
+    assert state == LeadState.REACHED_OUT
+    async with session_factory() as session:
+        assert (await get_lead(session, ids[3])).id == ids[3]
+
+
+@pytest.mark.asyncio
+async def test_lookups_by_id_query_only_the_owning_shard(shards):
+    _url, engines, session_factory = shards
+    ids = await _add_leads(session_factory, 10)
+    queried: list[int] = []
+    listeners = []
+    for index, engine in enumerate(engines):
+
+        def record(*_args, index=index, **_kw):
+            queried.append(index)
+
+        event.listen(engine.sync_engine, "before_cursor_execute", record)
+        listeners.append((engine.sync_engine, record))
+    try:
+        owner = shard_for(ids[4], SHARDS)
+        async with session_factory() as session:
+            await get_lead(session, ids[4])
+        assert set(queried) == {owner}
+
+        queried.clear()
+        async with session_factory() as session:
+            await update_lead_state(session, ids[4], LeadState.REACHED_OUT)
+            await session.commit()
+        assert set(queried) == {owner}
+
+        # A miss falls through to the archive, still on the one shard.
+        queried.clear()
+        async with session_factory() as session:
+            with pytest.raises(HTTPException):
+                await get_lead(session, "no-such-lead")
+        assert set(queried) == {shard_for("no-such-lead", SHARDS)}
+    finally:
+        for sync_engine, record in listeners:
+            event.remove(sync_engine, "before_cursor_execute", record)
+
+
+@pytest.mark.asyncio
+async def test_list_leads_merges_shards_newest_first(shards):
+    _url, _engines, session_factory = shards
+    ids = await _add_leads(session_factory, 20)
+    async with session_factory() as session:
+        await session.execute(
+            update(Lead)
+            .where(Lead.id.in_(ids[:5]))
+            .values(state=LeadState.REACHED_OUT, updated_at=datetime(2026, 1, 1))
+        )
+        await session.commit()
+        assert await archive_leads(session, timedelta(days=1), batch_size=2) == 5
+
+    async with session_factory() as session:
+        hot = await list_leads(session)
+        everything = await list_leads(session, include_archived=True)
+        since = await list_leads(session, updated_since=datetime(2026, 1, 1, 0, 15))
+    assert [lead.id for lead in hot] == ids[:4:-1]
+    assert [lead.id for lead in everything] == ids[::-1]
+    assert {type(lead) for lead in everything[-5:]} == {LeadArchive}
+    assert [lead.id for lead in since] == ids[:14:-1]
+
+
+@pytest.mark.asyncio
+async def test_api_on_sharded_session(shards, tmp_path, auth_headers):
+    from app.core.config import settings
+    from app.core.database import get_db
+    from app.main import app
+
+    _url, engines, session_factory = shards
+    settings.UPLOAD_DIR = str(tmp_path / "uploads")
+
+    async def sharded_get_db():
+        async with session_factory() as session:
+            yield session
+            await session.commit()
+
+    app.dependency_overrides[get_db] = sharded_get_db
+    try:
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
+            created = []
+            for i in range(6):
+                resp = await ac.post(
+                    "/api/leads",
+                    data={"first_name": "Api", "last_name": f"User{i}", "email": f"api{i}@example.com"},
+                    files={"resume": ("resume.pdf", io.BytesIO(FAKE_PDF), "application/pdf")},
+                    headers={"Idempotency-Key": f"key-{i}"},
+                )
+                assert resp.status_code == 201
+                created.append(resp.json()["id"])
+
+            resp = await ac.get(f"/api/leads/{created[2]}", headers=auth_headers)
+            assert resp.status_code == 200
+            assert resp.json()["resume_text_status"] == "PENDING"
+            resp = await ac.patch(f"/api/leads/{created[2]}", json={"state": "REACHED_OUT"}, headers=auth_headers)
+            assert resp.status_code == 200
+            resp = await ac.get("/api/leads", headers=auth_headers)
+            assert {lead["id"] for lead in resp.json()} == set(created)
+    finally:
+        app.dependency_overrides.clear()
+
+    # Global tables stay on shard 0.
+    assert len(await _ids(engines[0], IdempotencyKey)) == 6
+    assert not await _ids(engines[1], IdempotencyKey)
+
+
+@pytest.mark.asyncio
+async def test_reshard_round_trip(tmp_path):
+    import app.main  # noqa: F401
+
+    url = f"sqlite+aiosqlite:///{tmp_path / 'alma.db'}"
+    single = create_async_engine(url)
+    await ensure_schema(single)
+    ids = await _add_leads(make_sessionmaker([single]), 25)
+    await single.dispose()
+
+    assert await reshard(url, 1, SHARDS, batch_size=4) == 2 * sum(shard_for(i, SHARDS) != 0 for i in ids)
+    engines = [create_async_engine(u) for u in shard_urls(url, SHARDS)]
+    try:
+        for index, engine in enumerate(engines):
+            assert await _ids(engine, Lead) == {i for i in ids if shard_for(i, SHARDS) == index}
+        async with make_sessionmaker(engines)() as session:
+            assert len(await list_leads(session)) == 25
+
+        await reshard(url, SHARDS, 1)
+        assert await _ids(engines[0], Lead) == set(ids)
+        assert await _ids(engines[0], LeadResumeText) == set(ids)
+        assert not await _ids(engines[1], Lead)
+    finally:
+        for engine in engines:
+            await engine.dispose()
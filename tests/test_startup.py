@@ -0,0 +1,59 @@
+import pytest
+from sqlalchemy import inspect, text, update
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.core.database import ensure_schema, schema_fingerprint_table
+from benchmarks.startup import (
+    FIRST_REQUEST_BUDGET_MS,
+    IMPORT_BUDGET_MS,
+    eagerly_imported,
+    import_time_ms,
+    scratch_env,
+    time_to_first_request_ms,
+)
+
+
+@pytest.mark.asyncio
+async def test_ensure_schema_skips_ddl_when_fingerprint_matches(tmp_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'schema.db'}")
+    try:
+        assert await ensure_schema(engine) is True
+        assert await ensure_schema(engine) is False
+
+        async with engine.begin() as conn:
+            await conn.execute(update(schema_fingerprint_table).values(fingerprint="stale"))
+        assert await ensure_schema(engine) is True
+        assert await ensure_schema(engine) is False
+    finally:
+        await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_ensure_schema_adds_new_nullable_columns(tmp_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'schema.db'}")
+    try:
+        await ensure_schema(engine)
+        async with engine.begin() as conn:
+            await conn.execute(text("ALTER TABLE leads DROP COLUMN resume_codec"))
+            await conn.execute(update(schema_fingerprint_table).values(fingerprint="stale"))
+
+        assert await ensure_schema(engine) is True
+        async with engine.connect() as conn:
+            columns = await conn.run_sync(lambda sync: inspect(sync).get_columns("leads"))
+        assert "resume_codec" in {column["name"] for column in columns}
+    finally:
+        await engine.dispose()
+
+
+def test_auth_and_webhook_libraries_load_lazily():
+    assert eagerly_imported() == []
+
+
+def test_import_time_within_budget():
+    assert min(import_time_ms() for _ in range(3)) < IMPORT_BUDGET_MS
+
+
+def test_first_request_within_budget(tmp_path):
+    env = scratch_env(tmp_path)
+    time_to_first_request_ms(env)  # first boot creates the schema
+    assert time_to_first_request_ms(env) < FIRST_REQUEST_BUDGET_MS
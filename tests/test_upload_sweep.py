@@ -0,0 +1,155 @@
+import fcntl
+import os
+import time
+from datetime import datetime
+
+import pytest
+
+from app.models.lead import Lead, LeadArchive, LeadState
+from app.services import upload_sweep_service
+from app.services.upload_sweep_service import (
+    CHECKPOINT_FILE,
+    QUARANTINE_DIR,
+    find_missing_files,
+    iter_upload_tree,
+    sweep_uploads,
+)
+
+OLD = time.time() - 86_400
+
+
+def _touch(root, *parts, mtime=OLD) -> str:
+    path = os.path.join(root, *parts)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "wb") as f:
+        f.write(b"%PDF-1.4")
+    os.utime(path, (mtime, mtime))
+    return path
+
+
+async def _add_lead(session_factory, resume_path: str, archived: bool = False) -> str:
+    fields = {"first_name": "Jane", "last_name": "Doe", "email": "jane@example.com", "resume_path": resume_path}
+    async with session_factory() as session:
+        if archived:
+            now = datetime(2024, 1, 1)
+            lead = LeadArchive(id=resume_path, state=LeadState.REACHED_OUT, created_at=now, updated_at=now, **fields)
+        else:
+            lead = Lead(**fields)
+        session.add(lead)
+        await session.commit()
+        return lead.id
+
+
+def test_iter_upload_tree_pages_in_order_and_resumes(tmp_path):
+    root = str(tmp_path)
+    for parts in (("b.pdf",), ("a.pdf",), ("sub", "d.pdf"), ("sub", "c.pdf"), ("z.pdf",), (".hidden",)):
+        _touch(root, *parts)
+    expected = [("a.pdf",), ("b.pdf",), ("sub", "c.pdf"), ("sub", "d.pdf"), ("z.pdf",)]
+
+    assert list(iter_upload_tree(root, page_size=2)) == expected
+    assert list(iter_upload_tree(root, after=("sub", "c.pdf"), page_size=2)) == expected[3:]
+    assert list(iter_upload_tree(root, after=("b.pdf",), page_size=1)) == expected[2:]
+
+
+@pytest.mark.asyncio
+async def test_sweep_quarantines_old_orphans_only(file_db, tmp_path):
+    root = str(tmp_path / "uploads")
+    live = _touch(root, "live.pdf")
+    archived = _touch(root, "archived.pdf")
+    orphan = _touch(root, "orphan.pdf")
+    recent = _touch(root, "recent.pdf", mtime=time.time())
+    await _add_lead(file_db, live)
+    await _add_lead(file_db, archived, archived=True)
+
+    result = await sweep_uploads(file_db, upload_dir=root, grace_seconds=3600, delete=False)
+
+    assert (result.scanned, result.orphaned, result.removed, result.too_recent) == (4, 2, 1, 1)
+    assert result.finished
+    assert result.removed_paths == [orphan]
+    assert os.path.exists(live) and os.path.exists(archived) and os.path.exists(recent)
+    assert not os.path.exists(orphan)
+    assert os.path.exists(os.path.join(root, QUARANTINE_DIR, "orphan.pdf"))
+    assert not os.path.exists(os.path.join(root, CHECKPOINT_FILE))
+
+    # Quarantined files are not swept again.
+    assert (await sweep_uploads(file_db, upload_dir=root, grace_seconds=3600)).scanned == 3
+
+
+@pytest.mark.asyncio
+async def test_sweep_resumes_from_checkpoint(file_db, tmp_path):
+    root = str(tmp_path / "uploads")
+    paths = [_touch(root, f"{i}.pdf") for i in range(5)]
+
+    first = await sweep_uploads(file_db, upload_dir=root, grace_seconds=0, delete=True, max_files=2)
+    assert (first.scanned, first.removed, first.finished) == (2, 2, False)
+    assert os.path.exists(os.path.join(root, CHECKPOINT_FILE))
+
+    second = await sweep_uploads(file_db, upload_dir=root, grace_seconds=0, delete=True)
+    assert (second.scanned, second.removed, second.finished) == (3, 3, True)
+    assert not any(os.path.exists(p) for p in paths)
+    assert os.listdir(root) == []
+
+
+@pytest.mark.asyncio
+async def test_unbounded_sweep_walks_in_bounded_pages(file_db, tmp_path, monkeypatch):
+    root = str(tmp_path / "uploads")
+    for i in range(5):
+        _touch(root, f"{i}.pdf")
+    monkeypatch.setattr(upload_sweep_service, "WALK_PAGE_SIZE", 2)
+
+    result = await sweep_uploads(file_db, upload_dir=root, grace_seconds=0, dry_run=True)
+    assert (result.scanned, result.removed, result.finished) == (5, 5, True)
+
+
+@pytest.mark.asyncio
+async def test_dry_run_touches_nothing(file_db, tmp_path):
+    root = str(tmp_path / "uploads")
+    orphan = _touch(root, "orphan.pdf")
+
+    result = await sweep_uploads(file_db, upload_dir=root, grace_seconds=0, dry_run=True, max_files=1)
+    assert result.removed_paths == [orphan]
+    assert os.path.exists(orphan)
+    assert not os.path.exists(os.path.join(root, CHECKPOINT_FILE))
+
+
+@pytest.mark.asyncio
+async def test_find_missing_files(file_db, tmp_path):
+    root = str(tmp_path / "uploads")
+    present = _touch(root, "present.pdf")
+    await _add_lead(file_db, present)
+    gone = await _add_lead(file_db, os.path.join(root, "gone.pdf"))
+
+    assert await find_missing_files(file_db) == [(gone, os.path.join(root, "gone.pdf"))]
+
+
+@pytest.mark.asyncio
+async def test_sweep_lists_each_directory_once_per_run(file_db, tmp_path, monkeypatch):
+    root = str(tmp_path / "uploads")
+    for i in range(10):
+        _touch(root, f"{i}.pdf")
+    scans = []
+    real_scandir = os.scandir
+    monkeypatch.setattr(os, "scandir", lambda path: scans.append(path) or real_scandir(path))
+
+    first = await sweep_uploads(file_db, upload_dir=root, grace_seconds=0, delete=True, max_files=4)
+    assert (first.scanned, len(scans)) == (4, 1)
+    second = await sweep_uploads(file_db, upload_dir=root, grace_seconds=0, delete=True)
+    assert (second.scanned, second.finished, len(scans)) == (6, True, 2)
+
+
+@pytest.mark.asyncio
+async def test_only_one_process_sweeps_at_a_time(file_db, tmp_path):
+    root = str(tmp_path / "uploads")
+    orphan = _touch(root, "orphan.pdf")
+
+    fd = os.open(root, os.O_RDONLY)  # another process's sweep holds the lock
+    try:
+        fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        result = await sweep_uploads(file_db, upload_dir=root, grace_seconds=0, delete=True)
+        assert (result.locked, result.scanned) == (True, 0)
+        assert os.path.exists(orphan)
+    finally:
+        os.close(fd)
+
+    result = await sweep_uploads(file_db, upload_dir=root, grace_seconds=0, delete=True)
+    assert (result.locked, result.removed) == (False, 1)
@@ -0,0 +1,252 @@
+import asyncio
+import io
+import json
+import threading
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import WebhookSubscriber, settings
+from app.models.lead import Lead
+from app.models.webhook import WebhookDelivery, WebhookDeliveryStatus
+from app.services.webhook_service import (
+    LEAD_CREATED,
+    SIGNATURE_HEADER,
+    TIMESTAMP_HEADER,
+    WebhookDispatcher,
+    emit_event,
+    sign,
+)
+
+FAKE_PDF = b"%PDF-1.4 fake pdf content"
+
+
+class StubReceiver:
+    """Local HTTP endpoint that records webhook requests and answers with ``status``."""
+
+    def __init__(self):
+        self.status = 200
+        self.requests: list[tuple[dict, bytes]] = []
+        receiver = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers["Content-Length"]))
+                receiver.requests.append((dict(self.headers), body))
+                self.send_response(receiver.status)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_port}/hook"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def events(self) -> list[dict]:
+        return [event for _headers, body in self.requests for event in json.loads(body)["events"]]
+
+
+@pytest.fixture()
+def receiver():
+    stub = StubReceiver()
+    yield stub
+    stub.server.shutdown()
+    stub.server.server_close()
+
+
+@pytest.fixture()
+def subscriber(receiver: StubReceiver, monkeypatch):
+    sub = WebhookSubscriber(name="crm", url=receiver.url, secret="s3cret", max_concurrency=2)
+    monkeypatch.setattr(settings, "WEBHOOK_SUBSCRIBERS", [sub])
+    return sub
+
+
+async def _queue_events(session_factory, count: int) -> None:
+    async with session_factory() as session:
+        for i in range(count):
+            lead = Lead(first_name="Jane", last_name="Doe", email=f"jane{i}@example.com", resume_path="r.pdf")
+            session.add(lead)
+            await session.flush()
+            await session.refresh(lead)
+            emit_event(session, LEAD_CREATED, lead)
+        await session.commit()
+
+
+async def _statuses(session_factory) -> list[WebhookDeliveryStatus]:
+    async with session_factory() as session:
+        return list((await session.execute(select(WebhookDelivery.status))).scalars())
+
+
+@pytest.mark.asyncio
+async def test_lead_changes_queue_events(
+    client: AsyncClient, auth_headers: dict, db_session: AsyncSession, subscriber: WebhookSubscriber
+):
+    resp = await client.post(
+        "/api/leads",
+        data={"first_name": "Jane", "last_name": "Doe", "email": "jane@example.com"},
+        files={"resume": ("resume.pdf", io.BytesIO(FAKE_PDF), "application/pdf")},
+    )
+    lead_id = resp.json()["id"]
+    await client.patch(f"/api/leads/{lead_id}", json={"state": "REACHED_OUT"}, headers=auth_headers)
+
+    rows = (await db_session.execute(select(WebhookDelivery).order_by(WebhookDelivery.created_at))).scalars().all()
+    payloads = {row.event_type: json.loads(row.payload) for row in rows}
+    assert {row.subscriber for row in rows} == {"crm"}
+    assert payloads["lead.created"]["data"]["lead"]["id"] == lead_id
+    assert payloads["lead.state_changed"]["data"]["lead"]["state"] == "REACHED_OUT"
+    assert payloads["lead.state_changed"]["data"]["previous_state"] == "PENDING"
+
+
+@pytest.mark.asyncio
+async def test_dispatch_batches_and_signs(file_db, receiver: StubReceiver, subscriber: WebhookSubscriber):
+    await _queue_events(file_db, 5)
+
+    async with WebhookDispatcher([subscriber], session_factory=file_db, batch_size=2) as dispatcher:
+        # One round fills each of the subscriber's 2 slots with a batch of 2.
+        assert await dispatcher.run_once() == 4
+        assert await dispatcher.run_once() == 1
+        assert await dispatcher.run_once() == 0
+
+    assert sorted(len(json.loads(body)["events"]) for _h, body in receiver.requests) == [1, 2, 2]
+    assert len({event["id"] for event in receiver.events()}) == 5
+    for headers, body in receiver.requests:
+        assert headers[SIGNATURE_HEADER] == sign("s3cret", headers[TIMESTAMP_HEADER], body)
+    assert await _statuses(file_db) == [WebhookDeliveryStatus.DELIVERED] * 5
+
+
+@pytest.mark.asyncio
+async def test_background_worker_delivers_when_woken(
+    file_db, receiver: StubReceiver, subscriber: WebhookSubscriber
+):
+    dispatcher = WebhookDispatcher([subscriber], session_factory=file_db, poll_interval=60)
+    await dispatcher.start()
+    try:
+        await _queue_events(file_db, 3)
+        dispatcher.wake()
+        for _ in range(100):
+            if await _statuses(file_db) == [WebhookDeliveryStatus.DELIVERED] * 3:
+                break
+            await asyncio.sleep(0.02)
+    finally:
+        await dispatcher.stop()
+    assert len(receiver.events()) == 3
+
+
+@pytest.mark.asyncio
+async def test_failed_deliveries_retry_then_dead_letter(
+    file_db, receiver: StubReceiver, subscriber: WebhookSubscriber
+):
+    receiver.status = 500
+    await _queue_events(file_db, 1)
+
+    async with WebhookDispatcher(
+        [subscriber], session_factory=file_db, max_attempts=2, backoff_base=0
+    ) as dispatcher:
+        assert await dispatcher.run_once() == 1
+        assert await _statuses(file_db) == [WebhookDeliveryStatus.PENDING]
+        assert await dispatcher.run_once() == 1
+        assert await dispatcher.run_once() == 0
+
+    async with file_db() as session:
+        delivery = (await session.execute(select(WebhookDelivery))).scalar_one()
+    assert delivery.status == WebhookDeliveryStatus.DEAD
+    assert delivery.attempts == 2
+    assert delivery.last_error == "HTTP 500"
+    assert len(receiver.requests) == 2
+
+
+@pytest.mark.asyncio
+async def test_dead_letters_can_be_listed_and_retried(
+    client: AsyncClient, auth_headers: dict, db_session: AsyncSession
+):
+    lead = Lead(first_name="Jane", last_name="Doe", email="jane@example.com", resume_path="r.pdf")
+    db_session.add(lead)
+    await db_session.flush()
+    delivery = WebhookDelivery(
+        subscriber="crm",
+        event_type=LEAD_CREATED,
+        payload=json.dumps({"type": LEAD_CREATED}),
+        status=WebhookDeliveryStatus.DEAD,
+        attempts=8,
+        last_error="HTTP 500",
+        next_attempt_at=lead.created_at,
+    )
+    db_session.add(delivery)
+    await db_session.commit()
+
+    resp = await client.get("/api/webhooks/dead-letters", headers=auth_headers)
+    assert resp.status_code == 200
+    assert [(d["id"], d["payload"]["type"]) for d in resp.json()] == [(delivery.id, LEAD_CREATED)]
+
+    resp = await client.post(f"/api/webhooks/dead-letters/{delivery.id}/retry", headers=auth_headers)
+    assert resp.status_code == 200
+    assert resp.json()["status"] == "PENDING"
+    assert resp.json()["attempts"] == 0
+
+    resp = await client.get("/api/webhooks/dead-letters", headers=auth_headers)
+    assert resp.json() == []
+    resp = await client.post(f"/api/webhooks/dead-letters/{delivery.id}/retry", headers=auth_headers)
+    assert resp.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_dead_letters_require_auth(client: AsyncClient):
+    resp = await client.get("/api/webhooks/dead-letters")
+    assert resp.status_code in (401, 403)
+
+
+@pytest.mark.asyncio
+async def test_claim_takes_no_more_than_each_subscribers_slots(
+    file_db, receiver: StubReceiver, subscriber: WebhookSubscriber, monkeypatch
+):
+    crm = subscriber.model_copy(update={"max_concurrency": 1})
+    erp = WebhookSubscriber(name="erp", url=receiver.url, secret="s3cret", max_concurrency=1)
+    # The oldest due rows all belong to crm.
+    monkeypatch.setattr(settings, "WEBHOOK_SUBSCRIBERS", [crm])
+    await _queue_events(file_db, 2)
+    monkeypatch.setattr(settings, "WEBHOOK_SUBSCRIBERS", [crm, erp])
+    await _queue_events(file_db, 1)
+
+    async with WebhookDispatcher([crm, erp], session_factory=file_db, batch_size=1) as dispatcher:
+        # One batch per subscriber, rather than two crm batches of which one
+        # would wait for the only slot.
+        assert await dispatcher.run_once() == 2
+        async with file_db() as session:
+            pending = (
+                await session.execute(
+                    select(WebhookDelivery.subscriber).where(WebhookDelivery.status == WebhookDeliveryStatus.PENDING)
+                )
+            ).scalars()
+            assert sorted(pending) == ["crm", "crm"]
+
+
+@pytest.mark.asyncio
+async def test_prune_deletes_only_old_delivered_rows(file_db, subscriber: WebhookSubscriber):
+    now = datetime(2026, 6, 1)
+    async with file_db() as session:
+        for days, status in [(30, "DELIVERED"), (1, "DELIVERED"), (30, "DEAD")]:
+            when = now - timedelta(days=days)
+            session.add(
+                WebhookDelivery(
+                    subscriber="crm",
+                    event_type=LEAD_CREATED,
+                    payload="{}",
+                    status=WebhookDeliveryStatus(status),
+                    next_attempt_at=when,
+                    delivered_at=when if status == "DELIVERED" else None,
+                )
+            )
+        await session.commit()
+
+    dispatcher = WebhookDispatcher([subscriber], session_factory=file_db, retention=timedelta(days=7))
+    assert await dispatcher.prune(now) == 1
+    assert sorted(await _statuses(file_db)) == ["DEAD", "DELIVERED"]
+    assert await WebhookDispatcher([subscriber], session_factory=file_db, retention=timedelta(0)).prune(now) == 0